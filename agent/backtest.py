@@ -0,0 +1,182 @@
+# agent/backtest.py
+"""
+Historical backtest for the verdict engine: get_weights() and the BUY/SELL
+thresholds in final_verdict.py.
+
+Every ticker and trading day gets the three numbers calculate_verdict() weighs
+(tech confidence, fund confidence, risk danger). They come from the stored
+council debates (debate_store.history) where one exists and from indicator
+proxies otherwise (nexus/indicators/backtest.py). Scores, signals and forward
+returns are then whole-matrix NumPy operations, so every profile plus a full
+threshold grid runs in well under a second for hundreds of tickers over years.
+
+    python -m agent.backtest AAPL MSFT NVDA --period 5y --horizon 20
+    python -m agent.backtest --file sp500.txt --mode council   # only days the council actually debated
+    python -m agent.backtest --file sp500.txt --tune           # search the weight simplex too
+"""
+import argparse
+import json
+import os
+import time
+from itertools import product
+
+import numpy as np
+
+from agent.debate import RISKS, STYLES, debate_store
+from agent.final_verdict import BUY_THRESHOLD, SELL_THRESHOLD, get_weights
+from agent.screener import clean_tickers, load_price_frame, read_universe
+from nexus.indicators.backtest import (best_thresholds, evaluate, forward_returns, overlay,
+                                       proxy_confidences, threshold_grid, verdict_scores, weight_grid)
+
+BACKTEST_PERIOD = os.environ.get("BACKTEST_PERIOD", "5y")
+BACKTEST_HORIZON = int(os.environ.get("BACKTEST_HORIZON", "20"))  # Trading days held after a signal
+MODES = ("blend", "proxy", "council")
+
+# Threshold grid searched for every profile (the production pair is always reported on its own)
+GRID_BUYS = np.arange(50, 91, 2.5)
+GRID_SELLS = np.arange(20, 56, 2.5)
+
+# The debate fields calculate_verdict() reads
+COUNCIL_FIELDS = {"tech": "tech_confidence_final", "fund": "fund_confidence_final", "danger": "risk_danger_score"}
+
+
+def _clean_score(value) -> float:
+    # Mirrors calculate_verdict's clean_score: a missing or garbled number counts as a neutral 50
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 50.0
+    return value if np.isfinite(value) else 50.0
+
+
+def council_matrices(tickers: list, dates) -> dict:
+    """(tickers, bars) arrays of stored council numbers, NaN only on days without a debate."""
+    column = {d: j for j, d in enumerate(dates)}
+    out = {k: np.full((len(tickers), len(dates)), np.nan) for k in COUNCIL_FIELDS}
+    for i, ticker in enumerate(tickers):
+        for date, debate in debate_store.history(ticker).items():
+            j = column.get(date)
+            if j is None:
+                continue  # Outside the price window (or not a bar in it)
+            for k, field in COUNCIL_FIELDS.items():
+                out[k][i, j] = _clean_score(debate.get(field))
+    return out
+
+
+def _profile_report(score, fwd, mask, weights: dict) -> dict:
+    report = {"weights": weights, **evaluate(score, fwd, BUY_THRESHOLD, SELL_THRESHOLD, mask)}
+    report["best_thresholds"] = best_thresholds(threshold_grid(score, fwd, GRID_BUYS, GRID_SELLS, mask))
+    return report
+
+
+def tune_weights(components: dict, fwd, mask=None, step: float = 0.1, top: int = 10) -> list:
+    """Best (weights, thresholds) over the weight simplex, ranked by BUY-minus-SELL spread."""
+    results = []
+    for tech, fund, risk in weight_grid(step):
+        weights = {"tech": round(tech, 4), "fund": round(fund, 4), "risk": round(risk, 4)}
+        grid = threshold_grid(verdict_scores(weights=weights, **components), fwd, GRID_BUYS, GRID_SELLS, mask)
+        results.append({"weights": weights, **best_thresholds(grid)})
+    results.sort(key=lambda r: -np.inf if r["spread"] is None else r["spread"], reverse=True)
+    return results[:top]
+
+
+def run_backtest(tickers, period: str = BACKTEST_PERIOD, horizon: int = BACKTEST_HORIZON,
+                 mode: str = "blend", tune: bool = False, tune_step: float = 0.1) -> dict:
+    """
+    mode: blend = council numbers where stored, proxies elsewhere; proxy = indicators only;
+    council = only the days with a stored debate.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown backtest mode '{mode}' (use {', '.join(MODES)}).")
+    frame = load_price_frame(clean_tickers(tickers), period)
+    if frame.empty:
+        raise ValueError("No price history for any ticker")
+
+    start = time.perf_counter()
+    names = list(frame.columns)
+    prices = frame.to_numpy(dtype="float64").T
+    fwd = forward_returns(prices, horizon)
+    proxy = proxy_confidences(prices)
+    council = council_matrices(names, frame.index.strftime("%Y-%m-%d"))
+    debated = ~np.isnan(council["tech"])
+
+    components = proxy if mode == "proxy" else overlay(proxy, council)
+    mask = debated if mode == "council" else None
+
+    profiles = {}
+    for style, risk in product(STYLES, RISKS):
+        weights = get_weights(style, risk)
+        profiles[f"{style}/{risk}"] = _profile_report(verdict_scores(weights=weights, **components), fwd, mask, weights)
+
+    result = {
+        "tickers": len(names),
+        "bars": int(prices.shape[1]),
+        "start": str(frame.index[0].date()),
+        "end": str(frame.index[-1].date()),
+        "horizon": horizon,
+        "mode": mode,
+        "thresholds": {"buy": BUY_THRESHOLD, "sell": SELL_THRESHOLD},
+        "council_days": int(debated.sum()),
+        "profiles": profiles,
+    }
+    if tune:
+        result["tuning"] = tune_weights(components, fwd, mask, tune_step)
+    result["compute_s"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+# --- CLI ---
+def _pct(value) -> str:
+    return "    -" if value is None else f"{value * 100:+5.2f}%"
+
+
+def print_report(result: dict):
+    print(f"\n== {result['tickers']} tickers, {result['start']} → {result['end']} ({result['bars']} bars), "
+          f"{result['horizon']}-day forward returns, mode {result['mode']}, "
+          f"{result['council_days']} council days, {result['compute_s']:.2f}s ==")
+    market = next(iter(result["profiles"].values()), {}).get("market_return")
+    print(f"Mean forward return over all samples: {_pct(market)}")
+    print(f"{'profile':<24}{'BUY n':>8}{'BUY ret':>9}{'hit':>6}{'SELL n':>8}{'SELL ret':>9}{'hit':>6}"
+          f"{'spread':>9}{'IC':>7}   best buy/sell")
+    for name, p in result["profiles"].items():
+        b, s, best = p["buy"], p["sell"], p["best_thresholds"]
+        hit = lambda x: "    -" if x is None else f"{x * 100:5.1f}"
+        ic = "    -" if p["ic"] is None else f"{p['ic']:+.3f}"
+        where = "-" if best["buy"] is None else f"{best['buy']:g}/{best['sell']:g}"
+        print(f"{name:<24}{b['count']:>8}{_pct(b['mean_return']):>9}{hit(b['hit_rate']):>6}"
+              f"{s['count']:>8}{_pct(s['mean_return']):>9}{hit(s['hit_rate']):>6}"
+              f"{_pct(p['spread']):>9}{ic:>7}   {where}")
+    for n, t in enumerate(result.get("tuning", []), 1):
+        w = t["weights"]
+        where = "-" if t["buy"] is None else f"{t['buy']:g}/{t['sell']:g}"
+        print(f"🎛️ {n:>2}. tech {w['tech']:.1f} fund {w['fund']:.1f} risk {w['risk']:.1f}  "
+              f"thresholds {where}  spread {_pct(t['spread'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest the Alpha Council verdict engine")
+    parser.add_argument("tickers", nargs="*")
+    parser.add_argument("--file", help="Universe file: tickers separated by newlines or commas")
+    parser.add_argument("--period", default=BACKTEST_PERIOD, help="History to replay (yfinance period, e.g. 5y)")
+    parser.add_argument("--horizon", type=int, default=BACKTEST_HORIZON, help="Forward return horizon in bars")
+    parser.add_argument("--mode", choices=MODES, default="blend")
+    parser.add_argument("--tune", action="store_true", help="Also search the weight simplex")
+    parser.add_argument("--tune-step", type=float, default=0.1)
+    parser.add_argument("--json", dest="json_path", help="Also write the result to this file")
+    args = parser.parse_args(argv)
+
+    tickers = read_universe(args)
+    if not tickers:
+        parser.error("give tickers or --file")
+
+    result = run_backtest(tickers, args.period, args.horizon, args.mode, args.tune, args.tune_step)
+    print_report(result)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, default=str)
+        print(f"\n💾 Backtest written to {args.json_path}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
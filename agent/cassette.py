@@ -0,0 +1,187 @@
+# agent/cassette.py
+"""
+Record/replay cassettes for the council's external I/O.
+
+CASSETTE_MODE=record writes every MCP tool response, news search and LLM
+completion of a real run into a gzip'd JSON file, keyed by call signature.
+CASSETTE_MODE=replay serves those calls from the file and never touches the
+network; a call that was not recorded raises CassetteMiss instead of going out.
+
+The file is gzip'd JSON lines, one record appended per recorded call, so a long
+recording session never rewrites what it already wrote. Error strings (tool
+failures, timeouts, throttles) are not recorded: a replay should not reproduce
+a transient failure.
+
+Signatures ignore calendar dates (prompts and news queries embed today's date),
+so a cassette recorded on Monday still replays on Friday. Each entry also keeps
+how long the real call took; CASSETTE_LATENCY_SCALE=1 replays with those
+latencies, 0 (default) replays instantly.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from langchain_core.messages import AIMessage
+
+from nexus.cache import CACHE_DIR
+
+CASSETTE_MODE = os.environ.get("CASSETTE_MODE", "off").lower()  # off | record | replay
+CASSETTE_PATH = os.environ.get("CASSETTE_PATH", os.path.join(CACHE_DIR, "cassette.json.gz"))
+CASSETTE_LATENCY_SCALE = float(os.environ.get("CASSETTE_LATENCY_SCALE", "0"))
+
+_ISO_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+# The exact prefixes the tools and nodes report failures with (nexus/servers, agent/mcp_pool.py,
+# agent/nodes.py). Anchored so data that merely mentions an error ("No error in filings...") is kept
+_ERROR_TEXT = re.compile(
+    r"^\s*(?:error(?::| in technical analysis:| fetching fundamentals:| searching news:)"
+    r"|(?:batch )?(?:tech|fund|news|mcp) tool error:"
+    r"|execution failed:|data fetch failed\.)",
+    re.IGNORECASE,
+)
+
+
+class CassetteMiss(KeyError):
+    """Replay asked for a call the cassette never recorded."""
+
+
+def normalize_signature(kind: str, signature) -> str:
+    text = json.dumps(signature, sort_keys=True, default=str)
+    text = _ISO_DATE.sub("<date>", text)
+    if kind == "news":
+        # Only news queries carry a bare year; prompts may contain prices like 2015.40
+        text = _YEAR.sub("<year>", text)
+    return text
+
+
+def is_error_response(value) -> bool:
+    return isinstance(value, str) and bool(_ERROR_TEXT.match(value))
+
+
+def encode_message(response) -> dict:
+    return {"content": response.content, "usage": getattr(response, "usage_metadata", None)}
+
+
+def decode_message(value: dict) -> AIMessage:
+    return AIMessage(content=value["content"], usage_metadata=value.get("usage"))
+
+
+class Cassette:
+    def __init__(self, path: str = CASSETTE_PATH, mode: str = CASSETTE_MODE,
+                 latency_scale: float = CASSETTE_LATENCY_SCALE):
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown CASSETTE_MODE '{mode}' (use off, record or replay).")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._entries = self._load() if mode != "off" else {}
+        self.hits = 0
+        self.recorded = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def key(self, kind: str, signature) -> str:
+        digest = hashlib.sha256(normalize_signature(kind, signature).encode("utf-8")).hexdigest()
+        return f"{kind}:{digest[:32]}"
+
+    # --- CALL WRAPPERS ---
+    def call(self, kind: str, signature, fn, encode=None, decode=None):
+        if self.mode == "off":
+            return fn()
+        key = self.key(kind, signature)
+        if self.mode == "replay":
+            entry = self._replay(key, kind, signature)
+            if self.latency_scale:
+                time.sleep(entry["ms"] / 1000 * self.latency_scale)
+            return decode(entry["value"]) if decode else entry["value"]
+
+        start = time.perf_counter()
+        value = fn()
+        self._record(key, kind, signature, value, start, encode)
+        return value
+
+    async def acall(self, kind: str, signature, afn, encode=None, decode=None):
+        if self.mode == "off":
+            return await afn()
+        key = self.key(kind, signature)
+        if self.mode == "replay":
+            entry = self._replay(key, kind, signature)
+            if self.latency_scale:
+                await asyncio.sleep(entry["ms"] / 1000 * self.latency_scale)
+            return decode(entry["value"]) if decode else entry["value"]
+
+        start = time.perf_counter()
+        value = await afn()
+        await asyncio.to_thread(self._record, key, kind, signature, value, start, encode)  # File I/O off the loop
+        return value
+
+    def _replay(self, key, kind, signature) -> dict:
+        entry = self._entries.get(key)
+        if entry is None:
+            raise CassetteMiss(f"No recorded {kind} call in {self.path} for {str(signature)[:120]}")
+        self.hits += 1
+        return entry
+
+    def _record(self, key, kind, signature, value, start, encode):
+        if is_error_response(value):
+            return
+        entry = {
+            "kind": kind,
+            "ms": round((time.perf_counter() - start) * 1000, 2),
+            "value": encode(value) if encode else value,
+        }
+        # Keep the readable signature for tools and news (small); LLM prompts are large, so only the key
+        if kind != "llm":
+            entry["signature"] = signature
+        with self._lock:
+            self._entries[key] = entry
+            self.recorded += 1
+            self._append(key, entry)
+
+    # --- PERSISTENCE ---
+    def _load(self) -> dict:
+        entries = {}
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if "entries" in record:
+                        entries.update(record["entries"])  # Version 1: one document holding every entry
+                    else:
+                        entries[record.pop("key")] = record  # A later recording of the same call wins
+        except FileNotFoundError:
+            if self.mode == "replay":
+                print(f"⚠️ [CASSETTE] {self.path} not found. Every replayed call will miss.")
+        return entries
+
+    def _append(self, key, entry):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Each append is its own gzip member; readers see one concatenated stream.
+        # The leading newline keeps a record off the end of a version 1 document.
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write("\n" + json.dumps({"key": key, **entry}, separators=(",", ":")))
+
+    def tickers(self) -> list:
+        """Tickers with recorded MCP tool calls (what a replay run can analyze)."""
+        found = {
+            e["signature"][1]["ticker"] for e in self._entries.values()
+            if e["kind"] == "mcp" and isinstance(e.get("signature"), list) and "ticker" in e["signature"][1]
+        }
+        return sorted(found)
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "entries": len(self._entries), "hits": self.hits, "recorded": self.recorded}
+
+
+# Process-wide instance used by agent/nodes.py
+cassette = Cassette()
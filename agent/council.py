@@ -0,0 +1,126 @@
+# agent/council.py
+"""
+Runs the council for one ticker: the entry point main.py's endpoints and the
+screener CLI (agent/screener.py --council) share.
+
+The debate is profile-independent (agent/debate.py), so run_debate() runs the
+graph at most once per ticker per trading day: it reuses today's stored debate
+and joins an identical run already in flight (agent/verdict_cache.py).
+run_council() re-weights that debate for one user_style/risk_profile.
+"""
+import asyncio
+
+from agent.debate import debate_key, debate_store, extract_debate, score_profile
+from agent.graph import app as graph
+from agent.verdict_cache import cached_run
+
+# What each graph node contributes, used to replay a stored debate as node events
+NODE_OUTPUTS = {
+    "technical_analyst": ["tech_thesis_initial", "tech_confidence_initial"],
+    "fundamental_analyst": ["fund_thesis_initial", "fund_confidence_initial"],
+    "risk_manager": ["risk_critique_tech", "risk_critique_fund", "risk_danger_score", "risk_news_summary"],
+    "technical_rebuttal": ["tech_thesis_final", "tech_confidence_final"],
+    "fundamental_rebuttal": ["fund_thesis_final", "fund_confidence_final"],
+}
+
+
+def build_initial_state(ticker: str, user_style: str = "investor", risk_profile: str = "moderate") -> dict:
+    # Initialize the state EXACTLY how the agents expect it
+    return {
+        "ticker": ticker,
+        "messages": [],
+        "user_style": user_style,
+        "risk_profile": risk_profile
+    }
+
+
+def format_result(ticker: str, result: dict) -> dict:
+    # The JSON shape Lovable renders
+    return {
+        "ticker": ticker,
+        "final_verdict": {
+            "signal": result.get("final_signal", "HOLD"),
+            "confidence": result.get("final_confidence", 0),
+            "explanation": result.get("final_explanation", "")
+        },
+        "technical_analysis": {
+            "thesis": result.get("tech_thesis_final", ""),
+            "confidence": result.get("tech_confidence_final", 0)
+        },
+        "fundamental_analysis": {
+            "thesis": result.get("fund_thesis_final", ""),
+            "confidence": result.get("fund_confidence_final", 0)
+        },
+        "risk_analysis": {
+            "score": result.get("risk_danger_score", 0),
+            "critique": result.get("risk_critique_tech", "")
+        }
+    }
+
+
+async def run_debate(ticker: str) -> dict:
+    """Today's profile-independent debate for the ticker, running the council at most once."""
+    key = debate_key(ticker)
+
+    async def convene():
+        debate = debate_store.load(key)
+        if debate is None:
+            debate = extract_debate(await graph.ainvoke(build_initial_state(ticker)))
+            debate_store.save(key, debate)
+        return debate
+
+    return await cached_run(key, convene)
+
+
+async def run_council(ticker: str, user_style: str = "investor", risk_profile: str = "moderate") -> dict:
+    """Graph-shaped result for the requested profile, re-weighted from the shared debate."""
+    debate = await run_debate(ticker)
+    return score_profile(debate, user_style, risk_profile)
+
+
+async def analyze(ticker: str, user_style: str = "investor", risk_profile: str = "moderate") -> dict:
+    """run_council() in the /analyze response shape (what /screen and the screener CLI escalate to)."""
+    return format_result(ticker, await run_council(ticker, user_style, risk_profile))
+
+
+async def stream_council(ticker: str, user_style: str = "investor", risk_profile: str = "moderate"):
+    """
+    Yields (node, update) as each node finishes. The run goes through cached_run like run_debate(),
+    so a stream and an /analyze call for the same ticker share one council. A stored, cached
+    or joined debate (one this stream did not run) is replayed as node events instead.
+    """
+    key = debate_key(ticker)
+    events = asyncio.Queue()
+    live = False
+
+    async def convene():
+        nonlocal live
+        debate = debate_store.load(key)
+        if debate is None:
+            live = True
+            state = build_initial_state(ticker, user_style, risk_profile)
+            async for chunk in graph.astream(state, stream_mode="updates"):
+                for node, update in chunk.items():
+                    state.update(update or {})
+                    events.put_nowait((node, update or {}))
+            debate = extract_debate(state)
+            debate_store.save(key, debate)
+        return debate
+
+    def finished(task):
+        if not task.cancelled():
+            task.exception()  # Retrieved here too: a client that disconnected never reads it
+        events.put_nowait(None)
+
+    # Not cancelled when the client disconnects: other callers may have joined this run
+    run = asyncio.ensure_future(cached_run(key, convene))
+    run.add_done_callback(finished)
+    while (event := await events.get()) is not None:
+        yield event
+    debate = run.result()
+
+    if not live:
+        for node, keys in NODE_OUTPUTS.items():
+            yield node, {k: debate[k] for k in keys if k in debate}
+        result = score_profile(debate, user_style, risk_profile)
+        yield "final_node", {k: v for k, v in result.items() if k.startswith("final_")}
@@ -0,0 +1,109 @@
+# agent/debate.py
+"""
+Profile-independent debate artifacts.
+
+None of the council prompts see user_style or risk_profile; those only enter
+through get_weights() in final_verdict.py. So one debate per ticker per trading
+day (theses, confidences, risk score) can answer every profile by re-weighting.
+Artifacts are kept as small JSON files, one per ticker per day, so they survive
+restarts and form a history of council confidences.
+"""
+import json
+import os
+import time
+from itertools import product
+
+from agent.final_verdict import calculate_verdict
+from nexus.cache import CACHE_DIR
+from nexus.cache.market import trading_date
+
+# Everything the council produces before the math engine runs
+DEBATE_KEYS = [
+    "tech_thesis_initial", "tech_confidence_initial",
+    "fund_thesis_initial", "fund_confidence_initial",
+    "risk_critique_tech", "risk_critique_fund", "risk_danger_score", "risk_news_summary",
+    "tech_thesis_final", "tech_confidence_final",
+    "fund_thesis_final", "fund_confidence_final",
+]
+
+# The profile grid get_weights() distinguishes
+STYLES = ("trader", "investor")
+RISKS = ("aggressive", "moderate", "conservative")
+
+# How long a same-day debate is reused before the council reconvenes (fresh news)
+DEBATE_TTL = float(os.environ.get("DEBATE_TTL", os.environ.get("VERDICT_TTL", "900")))
+
+
+def debate_key(ticker: str, date: str = None) -> tuple:
+    return (ticker.upper().strip(), date or trading_date())
+
+
+def extract_debate(state: dict) -> dict:
+    return {k: state[k] for k in DEBATE_KEYS if k in state}
+
+
+def score_profile(debate: dict, user_style: str, risk_profile: str) -> dict:
+    """The full graph-shaped result for one profile, without re-running the council."""
+    state = {**debate, "user_style": user_style, "risk_profile": risk_profile}
+    return {**state, **calculate_verdict(state)}
+
+
+def score_all_profiles(debate: dict) -> dict:
+    """{"trader/aggressive": {signal, confidence, explanation}, ...} for the whole grid."""
+    out = {}
+    for style, risk in product(STYLES, RISKS):
+        verdict = calculate_verdict({**debate, "user_style": style, "risk_profile": risk})
+        out[f"{style}/{risk}"] = {
+            "signal": verdict["final_signal"],
+            "confidence": verdict["final_confidence"],
+            "explanation": verdict["final_explanation"]
+        }
+    return out
+
+
+class DebateStore:
+    """One JSON artifact per (ticker, trading date) under NEXUS_CACHE_DIR/debates."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: float = DEBATE_TTL):
+        self.root = os.path.join(cache_dir, "debates")
+        self.ttl = ttl
+
+    def _path(self, key: tuple) -> str:
+        ticker, date = key
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in ticker)
+        return os.path.join(self.root, date, f"{safe}.json")
+
+    def load(self, key: tuple, max_age: float = None):
+        """The stored debate, or None when missing or older than max_age (default: ttl)."""
+        max_age = self.ttl if max_age is None else max_age
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                artifact = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - artifact.get("created_at", 0) > max_age:
+            return None
+        return artifact["debate"]
+
+    def save(self, key: tuple, debate: dict):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + f".{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"ticker": key[0], "date": key[1], "created_at": time.time(), "debate": debate}, f)
+        os.replace(tmp, path)
+
+    def history(self, ticker: str) -> dict:
+        """{date: debate} for every stored day of a ticker, regardless of age."""
+        out = {}
+        if not os.path.isdir(self.root):
+            return out
+        for date in sorted(os.listdir(self.root)):
+            debate = self.load((ticker.upper().strip(), date), max_age=float("inf"))
+            if debate is not None:
+                out[date] = debate
+        return out
+
+
+# Process-wide instance used by agent/council.py
+debate_store = DebateStore()
@@ -1,6 +1,10 @@
 # agent/final_verdict.py
 from agent.state import AgentState
 
+# Signal cut-offs on the 0-100 weighted score (agent/backtest.py evaluates them over history)
+BUY_THRESHOLD = 70
+SELL_THRESHOLD = 40
+
 def get_weights(style: str, risk: str):
     """
     Returns weight dictionary based on User Style and Risk Tolerance.
@@ -58,9 +62,9 @@ def calculate_verdict(state: AgentState) -> dict:
     
     # ✅ 4. NORMALIZED THRESHOLDS
     # Now that the max score is 100, we can use standard percentages:
-    if weighted_score >= 70: 
+    if weighted_score >= BUY_THRESHOLD:
         signal = "BUY"
-    elif weighted_score <= 40:
+    elif weighted_score <= SELL_THRESHOLD:
         signal = "SELL"
     else:
         signal = "HOLD"
@@ -1,17 +1,19 @@
 # agents/graph.py
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from agent.state import AgentState
+from agent.tracing import traced_node
 
 # Import the nodes (The brains Teammate B built/stubbed)
 # If this line errors, it means Teammate B hasn't named their functions exactly like this!
+# The async twins keep every tool and LLM wait on the event loop (graph.ainvoke in main.py)
 from agent.nodes import (
-    technical_analyst, 
-    fundamental_analyst, 
-    risk_manager, 
-    technical_rebuttal, 
-    fundamental_rebuttal, 
-    final_node
+    atechnical_analyst as technical_analyst,
+    afundamental_analyst as fundamental_analyst,
+    arisk_manager as risk_manager,
+    atechnical_rebuttal as technical_rebuttal,
+    afundamental_rebuttal as fundamental_rebuttal,
+    afinal_node as final_node
 )
 
 # 1. Initialize the Graph (The Board)
@@ -19,23 +21,29 @@ workflow = StateGraph(AgentState)
 
 # 2. Add the Nodes (The Workers)
 # We give each node a name (e.g., "technical_analyst") and connect it to a function
-workflow.add_node("technical_analyst", technical_analyst)
-workflow.add_node("fundamental_analyst", fundamental_analyst)
-workflow.add_node("risk_manager", risk_manager)
-workflow.add_node("technical_rebuttal", technical_rebuttal)
-workflow.add_node("fundamental_rebuttal", fundamental_rebuttal)
-workflow.add_node("final_node", final_node)
+# traced_node times every node for /metrics and the per-request timings (agent/tracing.py)
+workflow.add_node("technical_analyst", traced_node("technical_analyst", technical_analyst))
+workflow.add_node("fundamental_analyst", traced_node("fundamental_analyst", fundamental_analyst))
+workflow.add_node("risk_manager", traced_node("risk_manager", risk_manager))
+workflow.add_node("technical_rebuttal", traced_node("technical_rebuttal", technical_rebuttal))
+workflow.add_node("fundamental_rebuttal", traced_node("fundamental_rebuttal", fundamental_rebuttal))
+workflow.add_node("final_node", traced_node("final_node", final_node))
 
 # 3. Define the Edges (The Assembly Line)
-# Start here:
-workflow.set_entry_point("technical_analyst")
+# Both rounds fan out: the paired analysts write disjoint AgentState keys, so they run
+# concurrently and the list-form edges join them before the next stage starts.
 
-# The path:
-workflow.add_edge("technical_analyst", "fundamental_analyst")
-workflow.add_edge("fundamental_analyst", "risk_manager")
+# ROUND 1 (Blind Divergence): both analysts start together
+workflow.add_edge(START, "technical_analyst")
+workflow.add_edge(START, "fundamental_analyst")
+
+# ROUND 2 (The Attack): waits for BOTH theses
+workflow.add_edge(["technical_analyst", "fundamental_analyst"], "risk_manager")
+
+# ROUND 3 (The Rebuttal): both rebuttals run together off the risk audit
 workflow.add_edge("risk_manager", "technical_rebuttal")
-workflow.add_edge("technical_rebuttal", "fundamental_rebuttal")
-workflow.add_edge("fundamental_rebuttal", "final_node")
+workflow.add_edge("risk_manager", "fundamental_rebuttal")
+workflow.add_edge(["technical_rebuttal", "fundamental_rebuttal"], "final_node")
 
 # End here:
 workflow.add_edge("final_node", END)
@@ -0,0 +1,239 @@
+# agent/llm_cache.py
+"""
+Content-addressed LLM response cache.
+
+Every node calls ChatGroq at temperature=0.0 with a prompt fully determined by
+the template and the tool data, so identical (model, messages, params) can reuse
+the earlier completion. TieredLLMCache plugs into LangChain's cache hook
+(ChatGroq(cache=...)): LangChain hands us the serialized messages plus an
+llm_string describing model and params, and we key on the SHA-256 of both.
+
+Tier 1 is an in-memory LRU; tier 2 is a local SQLite file. Both evict by size.
+The async hooks answer memory hits on the loop and send SQLite work to a thread.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+from nexus.cache import CACHE_DIR
+
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE", "1") != "0"
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_cache.sqlite"))
+LLM_CACHE_MEMORY_BYTES = int(os.environ.get("LLM_CACHE_MEMORY_BYTES", str(16 * 1024 * 1024)))
+LLM_CACHE_DISK_BYTES = int(os.environ.get("LLM_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+def serialize_generations(generations) -> str:
+    # Plain JSON of what the nodes read, not a LangChain manifest (safe to load back)
+    return json.dumps([
+        {
+            "chat": isinstance(g, ChatGeneration),
+            "text": g.message.content if isinstance(g, ChatGeneration) else g.text,
+            "info": g.generation_info,
+        }
+        for g in generations
+    ])
+
+
+def deserialize_generations(payload: str) -> list:
+    out = []
+    for g in json.loads(payload):
+        if g["chat"]:
+            out.append(ChatGeneration(message=AIMessage(content=g["text"]), generation_info=g["info"]))
+        else:
+            out.append(Generation(text=g["text"], generation_info=g["info"]))
+    return out
+
+
+class MemoryTier:
+    """LRU bounded by the total size of the stored payloads."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._items = OrderedDict()
+
+    def get(self, key):
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key, value: str):
+        if key in self._items:
+            self.bytes -= len(self._items.pop(key))
+        if len(value) > self.max_bytes:
+            return
+        self._items[key] = value
+        self.bytes += len(value)
+        while self.bytes > self.max_bytes:
+            _, old = self._items.popitem(last=False)
+            self.bytes -= len(old)
+
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+
+
+class SQLiteTier:
+    """On-disk tier; evicts least recently used rows once the payloads exceed max_bytes."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache (last_access)")
+        self._conn.commit()
+        self._lock = threading.Lock()  # One connection, used from worker threads
+        # Running payload total, so a put never scans the table (one SUM on open)
+        self.bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key, value: str):
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time())
+            )
+            self.bytes += len(value) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Drop the oldest rows until we are back under budget, a few at a time off the LRU index
+        while self.bytes > self.max_bytes:
+            oldest = self._conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access LIMIT 16").fetchall()
+            if not oldest:
+                self.bytes = 0
+                return
+            for key, size in oldest:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.bytes -= size
+                if self.bytes <= self.max_bytes:
+                    return
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self.bytes = 0
+
+
+class TieredLLMCache(BaseCache):
+    def __init__(self, path: str = LLM_CACHE_PATH, memory_bytes: int = LLM_CACHE_MEMORY_BYTES,
+                 disk_bytes: int = LLM_CACHE_DISK_BYTES):
+        self.memory = MemoryTier(memory_bytes)
+        self.disk = SQLiteTier(path, disk_bytes) if path else None
+        self._lock = threading.Lock()  # Memory tier and counters only; never held across SQLite I/O
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _from_memory(self, key):
+        with self._lock:
+            payload = self.memory.get(key)
+            if payload is not None:
+                self.memory_hits += 1
+            return payload
+
+    def _from_disk(self, key):
+        payload = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                self.memory.put(key, payload)  # Promote
+        return payload
+
+    def _remember(self, key, payload: str):
+        with self._lock:
+            self.memory.put(key, payload)
+
+    def lookup(self, prompt: str, llm_string: str):
+        key = cache_key(prompt, llm_string)
+        payload = self._from_memory(key)
+        if payload is None:
+            payload = self._from_disk(key)
+        return None if payload is None else deserialize_generations(payload)
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        key = cache_key(prompt, llm_string)
+        payload = serialize_generations(return_val)
+        self._remember(key, payload)
+        if self.disk is not None:
+            self.disk.put(key, payload)
+
+    # Memory hits skip LangChain's executor hop; SQLite reads and commits run in a worker thread
+    async def alookup(self, prompt: str, llm_string: str):
+        key = cache_key(prompt, llm_string)
+        payload = self._from_memory(key)
+        if payload is None:
+            payload = await asyncio.to_thread(self._from_disk, key) if self.disk is not None else self._from_disk(key)
+        return None if payload is None else deserialize_generations(payload)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val) -> None:
+        key = cache_key(prompt, llm_string)
+        payload = serialize_generations(return_val)
+        self._remember(key, payload)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.put, key, payload)
+
+    def clear(self, **kwargs) -> None:
+        with self._lock:
+            self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "memory_bytes": self.memory.bytes,
+            "disk_bytes": self.disk.bytes if self.disk is not None else 0,
+        }
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Process-wide cache, or None when disabled with LLM_CACHE=0."""
+    global _llm_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = TieredLLMCache()
+        return _llm_cache
@@ -0,0 +1,102 @@
+# agent/llm_client.py
+"""
+Process-wide LLM client manager.
+
+Building a ChatGroq per node call means a fresh Groq SDK client, a fresh httpx
+pool and a fresh TLS handshake on the hottest path of every request. Instead we
+keep one pooled httpx transport (sync + async) and one ChatGroq per model, and
+hand the same instance to every node.
+"""
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+from groq import DefaultAsyncHttpxClient, DefaultHttpxClient
+from langchain_groq import ChatGroq
+
+from agent.llm_cache import get_llm_cache
+from agent.llm_scheduler import llm_scheduler
+
+DEFAULT_MODEL = os.environ.get("LLM_MODEL", "llama-3.1-8b-instant")
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "32"))
+LLM_MAX_KEEPALIVE = int(os.environ.get("LLM_MAX_KEEPALIVE", str(LLM_MAX_CONNECTIONS)))
+LLM_KEEPALIVE_EXPIRY = float(os.environ.get("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", "60"))
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+    )
+
+
+class LLMClientManager:
+    """Caches ChatGroq instances per (model, temperature) on shared pooled transports.
+
+    httpx async pools belong to the event loop that opened them, so async-capable
+    models are kept per running loop (uvicorn has one; scripts calling asyncio.run
+    repeatedly get a fresh pool per loop instead of a dead one).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._http_client = None
+        self._models = {}
+        self._loop_models = weakref.WeakKeyDictionary()
+
+    @property
+    def http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = DefaultHttpxClient(limits=_limits(), timeout=LLM_TIMEOUT)
+            return self._http_client
+
+    def get(self, model: str = DEFAULT_MODEL, temperature: float = 0.0) -> ChatGroq:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        key = (model, temperature)
+        with self._lock:
+            models = self._models if loop is None else self._loop_models.setdefault(loop, {})
+            llm = models.get(key)
+        if llm is not None:
+            return llm
+
+        # Sync callers never touch the async pool; only a running loop gets one (it is bound to that loop)
+        async_client = DefaultAsyncHttpxClient(limits=_limits(), timeout=LLM_TIMEOUT) if loop else None
+        llm = ChatGroq(
+            model_name=model,
+            temperature=temperature,
+            cache=get_llm_cache(),
+            rate_limiter=llm_scheduler,  # Consulted only on cache misses
+            http_client=self.http_client,
+            http_async_client=async_client
+        )
+        with self._lock:
+            models = self._models if loop is None else self._loop_models.setdefault(loop, {})
+            winner = models.setdefault(key, llm)
+        if winner is not llm and async_client is not None:
+            loop.create_task(async_client.aclose())  # Lost the race: this pool never opened a connection
+        return winner
+
+    def close(self):
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            self._models.clear()
+            self._loop_models.clear()
+
+
+# Process-wide instance
+llm_clients = LLMClientManager()
+
+
+def get_chat_model(model: str = DEFAULT_MODEL, temperature: float = 0.0) -> ChatGroq:
+    return llm_clients.get(model, temperature)
@@ -0,0 +1,259 @@
+# agent/llm_scheduler.py
+"""
+Provider-rate-limit-aware LLM scheduler.
+
+Groq enforces requests-per-minute and tokens-per-minute. Under load, five
+ChatGroq calls per request blow through both, and the 429s surface as 500s from
+main.py. LLMScheduler is a LangChain rate limiter: it runs *after* the response
+cache lookup, so cache hits are never throttled. It admits calls through two
+token buckets (RPM and TPM) in priority order, so a council already in its
+rebuttal round finishes before new councils start.
+
+The node tells the scheduler what a call will cost and how urgent it is through a
+context variable set by LLMScheduler.ainvoke()/invoke(). The cost is estimated from
+the formatted prompt-template text plus an expected completion budget, then
+corrected with the real usage once the provider answers.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from agent.tracing import llm_calls, llm_tokens, span
+
+LLM_RPM = float(os.environ.get("LLM_RPM", "30"))        # 0 = unlimited
+LLM_TPM = float(os.environ.get("LLM_TPM", "6000"))      # 0 = unlimited
+COMPLETION_TOKENS = int(os.environ.get("LLM_COMPLETION_TOKENS", "350"))
+RATE_LIMIT_RETRIES = int(os.environ.get("LLM_RATE_LIMIT_RETRIES", "2"))
+RATE_LIMIT_PAUSE = float(os.environ.get("LLM_RATE_LIMIT_PAUSE", "10"))
+CHARS_PER_TOKEN = 4
+
+# Lower runs first: finish councils that are nearly done before starting new ones
+PRIORITY_REBUTTAL = 0
+PRIORITY_RISK = 1
+PRIORITY_INITIAL = 2
+
+_call = contextvars.ContextVar("llm_call", default=None)
+
+
+def estimate_tokens(messages, completion_tokens: int = COMPLETION_TOKENS) -> int:
+    """Rough prompt + completion cost: ~4 chars per token plus a small per-message overhead."""
+    prompt_chars = sum(len(str(m.content)) for m in messages)
+    return prompt_chars // CHARS_PER_TOKEN + 4 * len(messages) + completion_tokens
+
+
+class TokenBucket:
+    """Refills continuously at `per_minute` / 60 per second, holding at most one minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.rate = per_minute / 60.0
+        self.last = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def wait_time(self, n: float, now: float) -> float:
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        n = min(n, self.capacity)  # An oversized call waits for a full bucket, not forever
+        return 0.0 if self.tokens >= n else (n - self.tokens) / self.rate
+
+    def consume(self, n: float):
+        if not self.unlimited:
+            self.tokens -= min(n, self.capacity)
+
+    def adjust(self, delta: float):
+        """Settles an estimate against real usage (may leave the bucket in debt)."""
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+    def drain(self):
+        if not self.unlimited:
+            self.tokens = 0.0
+
+
+class LLMScheduler(BaseRateLimiter):
+    def __init__(self, rpm: float = LLM_RPM, tpm: float = LLM_TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._queue = []
+        self._seq = itertools.count()
+        self._loop = None
+        self._timer = None
+        self.admitted = 0
+        self.rate_limited = 0
+
+    # --- ADMISSION ---
+    def _wait_time(self, tokens: float, now: float) -> float:
+        return max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now), self._paused_until - now)
+
+    def _try_consume(self, tokens: float) -> bool:
+        with self._lock:
+            if self._wait_time(tokens, time.monotonic()) > 0:
+                return False
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+            self.admitted += 1
+            return True
+
+    @staticmethod
+    def _current():
+        ctx = _call.get()
+        if ctx is None:
+            return {"tokens": COMPLETION_TOKENS, "priority": PRIORITY_INITIAL}
+        return ctx
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """Sync path (sync nodes): shares the buckets, waits FIFO without priorities."""
+        ctx = self._current()
+        start = time.monotonic()
+        while True:
+            if self._try_consume(ctx["tokens"]):
+                ctx["admitted"] = True
+                ctx["waited"] = time.monotonic() - start
+                return True
+            if not blocking:
+                return False
+            with self._lock:
+                wait = self._wait_time(ctx["tokens"], time.monotonic())
+            time.sleep(min(max(wait, 0.01), 1.0))
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        ctx = self._current()
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new event loop (e.g. a script calling asyncio.run twice): old waiters are gone
+            self._loop, self._queue, self._timer = loop, [], None
+
+        if not self._queue and self._try_consume(ctx["tokens"]):
+            ctx["admitted"] = True
+            ctx["waited"] = 0.0
+            return True
+        if not blocking:
+            return False
+
+        start = time.monotonic()
+        fut = loop.create_future()
+        heapq.heappush(self._queue, (ctx["priority"], next(self._seq), ctx["tokens"], fut))
+        self._dispatch()
+        await fut
+        ctx["admitted"] = True
+        ctx["waited"] = time.monotonic() - start
+        return True
+
+    def _dispatch(self):
+        """Grants queued calls in priority order; re-arms itself for when the head fits."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            priority, seq, tokens, fut = self._queue[0]
+            if fut.done():  # Caller went away
+                heapq.heappop(self._queue)
+                continue
+            if not self._try_consume(tokens):
+                with self._lock:
+                    wait = self._wait_time(tokens, time.monotonic())
+                self._timer = self._loop.call_later(max(wait, 0.01), self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            fut.set_result(True)
+
+    # --- FEEDBACK ---
+    def settle(self, estimated: int, actual: int):
+        with self._lock:
+            self.tokens.adjust(actual - estimated)
+
+    def pause(self, seconds: float):
+        """Provider said 429: stop admitting anything for a while and empty the buckets."""
+        with self._lock:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.requests.drain()
+            self.tokens.drain()
+
+    # --- CALL HELPERS (used by agent/nodes.py) ---
+    def _begin(self, messages, priority, completion_tokens):
+        ctx = {"tokens": estimate_tokens(messages, completion_tokens), "priority": priority, "admitted": False}
+        return ctx, _call.set(ctx)
+
+    def _finish(self, ctx, response, attrs: dict, model: str):
+        usage = getattr(response, "usage_metadata", None)
+        if ctx["admitted"] and usage and usage.get("total_tokens"):
+            self.settle(ctx["tokens"], usage["total_tokens"])
+
+        # The limiter only runs on a cache miss, so "never admitted" means a cache hit
+        attrs["cache_hit"] = not ctx["admitted"]
+        attrs["queued_ms"] = round(ctx.get("waited", 0.0) * 1000, 2)
+        llm_calls.inc((model, "hit" if attrs["cache_hit"] else "miss"))
+        if usage:
+            attrs["input_tokens"] = usage.get("input_tokens", 0)
+            attrs["output_tokens"] = usage.get("output_tokens", 0)
+            llm_tokens.inc((model, "input"), attrs["input_tokens"])
+            llm_tokens.inc((model, "output"), attrs["output_tokens"])
+
+    async def ainvoke(self, llm, messages, priority: int = PRIORITY_INITIAL,
+                      completion_tokens: int = COMPLETION_TOKENS):
+        model = _model_name(llm)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            ctx, token = self._begin(messages, priority, completion_tokens)
+            try:
+                with span("llm", model) as attrs:
+                    response = await llm.ainvoke(messages)
+                    self._finish(ctx, response, attrs, model)
+                return response
+            except Exception as e:
+                if not _is_rate_limit(e) or attempt == RATE_LIMIT_RETRIES:
+                    raise
+                print(f"⏳ [LLM SCHEDULER] Provider rate limit hit. Pausing {RATE_LIMIT_PAUSE}s...")
+                self.pause(RATE_LIMIT_PAUSE)
+            finally:
+                _call.reset(token)
+
+    def invoke(self, llm, messages, priority: int = PRIORITY_INITIAL,
+               completion_tokens: int = COMPLETION_TOKENS):
+        model = _model_name(llm)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            ctx, token = self._begin(messages, priority, completion_tokens)
+            try:
+                with span("llm", model) as attrs:
+                    response = llm.invoke(messages)
+                    self._finish(ctx, response, attrs, model)
+                return response
+            except Exception as e:
+                if not _is_rate_limit(e) or attempt == RATE_LIMIT_RETRIES:
+                    raise
+                print(f"⏳ [LLM SCHEDULER] Provider rate limit hit. Pausing {RATE_LIMIT_PAUSE}s...")
+                self.pause(RATE_LIMIT_PAUSE)
+            finally:
+                _call.reset(token)
+
+    def stats(self) -> dict:
+        return {"admitted": self.admitted, "queued": len(self._queue), "rate_limited": self.rate_limited}
+
+
+def _model_name(llm) -> str:
+    return getattr(llm, "model_name", None) or type(llm).__name__
+
+
+def _is_rate_limit(e: Exception) -> bool:
+    return getattr(e, "status_code", None) == 429 or "rate limit" in str(e).lower()
+
+
+# Process-wide instance, attached to every ChatGroq by agent/llm_client.py
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,322 @@
+# agent/mcp_pool.py
+"""
+Persistent pool of finance_server.py stdio sessions.
+
+Each session spawns the MCP server once, does the initialize handshake once and
+then multiplexes any number of tool calls over the same pipes, matching
+responses to callers by JSON-RPC id. Dead sessions are respawned on checkout.
+"""
+import asyncio
+import atexit
+import collections
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from agent.tracing import span
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_PATH = os.path.join(ROOT_DIR, "nexus", "servers", "finance_server.py")
+
+# --- CONFIG (env overridable) ---
+POOL_SIZE = int(os.environ.get("MCP_POOL_SIZE", "2"))            # 0 = spawn per call (legacy)
+CALL_TIMEOUT = float(os.environ.get("MCP_CALL_TIMEOUT", "15"))
+HEALTH_INTERVAL = float(os.environ.get("MCP_HEALTH_INTERVAL", "30"))  # Idle seconds before a ping
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "alpha", "version": "1.0"}
+
+
+def server_env() -> dict:
+    """Environment for the finance server subprocess."""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join([ROOT_DIR, os.path.join(ROOT_DIR, "nexus")])
+    env["PYTHONIOENCODING"] = "utf-8"
+    return env
+
+
+def extract_tool_text(resp: dict) -> str:
+    """Turns a tools/call JSON-RPC response into the plain text the agents expect."""
+    if "result" in resp:
+        return resp["result"]["content"][0]["text"]
+    if "error" in resp:
+        return f"MCP Tool Error: {resp['error']}"
+    return f"Data Fetch Failed. Raw: {str(resp)[:50]}"
+
+
+class MCPSession:
+    """One long-lived finance_server.py process speaking JSON-RPC over stdio."""
+
+    def __init__(self):
+        self.process = None
+        self.last_used = 0.0
+        self.ready = False                 # Handshake done; only then does the pool route calls here
+        self.started = threading.Event()   # Set once start() finished, successfully or not
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stderr_tail = collections.deque(maxlen=20)
+
+    # --- LIFECYCLE ---
+    def start(self, timeout: float = CALL_TIMEOUT):
+        try:
+            self._start(timeout)
+            self.ready = True
+        except BaseException:
+            self.close()  # Never leak a half-started child (or its reader threads)
+            raise
+        finally:
+            self.started.set()
+
+    def _start(self, timeout: float):
+        self.process = subprocess.Popen(
+            [sys.executable, SERVER_PATH],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=server_env(),
+            encoding='utf-8',
+            bufsize=1
+        )
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+        # Handshake exactly once per process
+        init = self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": CLIENT_INFO
+        })
+        resp = init.result(timeout=timeout)
+        if "error" in resp:
+            raise RuntimeError(f"MCP handshake failed: {resp['error']}")
+        self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        self.last_used = time.monotonic()
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            try:
+                self.process.wait(timeout=5)  # Reap it; the reader threads exit on EOF
+            except subprocess.TimeoutExpired:
+                pass
+        self._fail_pending(ConnectionError("MCP session closed."))
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    @property
+    def stderr_tail(self) -> str:
+        return "".join(self._stderr_tail)
+
+    # --- JSON-RPC ---
+    def request(self, method: str, params: dict = None) -> Future:
+        """Sends a request and returns a Future resolved by the reader thread."""
+        req_id = next(self._ids)
+        msg = {"jsonrpc": "2.0", "id": req_id, "method": method}
+        if params is not None:
+            msg["params"] = params
+
+        fut = Future()
+        with self._lock:
+            self._pending[req_id] = fut
+        fut.add_done_callback(lambda _: self._pending.pop(req_id, None))
+        try:
+            self._send(msg)
+        except (OSError, ValueError) as e:
+            fut.set_exception(ConnectionError(f"MCP pipe broken: {e}"))
+        self.last_used = time.monotonic()
+        return fut
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        try:
+            self.request("ping").result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def _send(self, msg: dict):
+        with self._lock:
+            self.process.stdin.write(json.dumps(msg) + "\n")
+            self.process.stdin.flush()
+
+    def _read_stdout(self):
+        for line in self.process.stdout:
+            clean_line = line.strip()
+            if not clean_line.startswith("{"):
+                continue  # Ignore stray prints from yfinance & co.
+            try:
+                resp = json.loads(clean_line)
+            except json.JSONDecodeError:
+                continue
+            fut = self._pending.get(resp.get("id"))
+            if fut is not None and not fut.done():
+                fut.set_result(resp)
+        self._fail_pending(ConnectionError(f"MCP server exited. Stderr: {self.stderr_tail[-200:]}"))
+
+    def _read_stderr(self):
+        # Keep draining so a chatty server never blocks on a full pipe
+        for line in self.process.stderr:
+            self._stderr_tail.append(line)
+
+    def _fail_pending(self, exc: Exception):
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for fut in pending:
+            if not fut.done():
+                fut.set_exception(exc)
+
+
+class MCPSessionPool:
+    """Fixed-size set of MCPSessions; calls go to the least busy healthy session."""
+
+    def __init__(self, size: int = POOL_SIZE, call_timeout: float = CALL_TIMEOUT,
+                 health_interval: float = HEALTH_INTERVAL):
+        self.size = max(1, size)
+        self.call_timeout = call_timeout
+        self.health_interval = health_interval
+        self._sessions = [None] * self.size
+        self._lock = threading.Lock()
+
+    def _checkout(self, block: bool = True) -> MCPSession:
+        """Picks a session. With block=False, returns None instead of spawning, waiting or pinging."""
+        spawn = starting = None
+        # block=False is the event loop's path: never wait on a thread that holds the lock
+        if not self._lock.acquire(blocking=block):
+            return None
+        try:
+            for i, session in enumerate(self._sessions):
+                if session is not None and session.ready and not session.is_alive():
+                    print(f"♻️ [MCP POOL] Session {i} died. Respawning...")
+                    session.close()
+                    self._sessions[i] = None
+            # Prefer an idle live session, else spawn into an empty slot, else least busy
+            live = [s for s in self._sessions if s is not None and s.ready]
+            idle = [s for s in live if s.in_flight == 0]
+            if idle:
+                session = idle[0]
+            elif None in self._sessions:
+                if not block:
+                    return None
+                # Reserve the slot now; the spawn and handshake happen outside the lock
+                session = spawn = MCPSession()
+                self._sessions[self._sessions.index(None)] = spawn
+            elif live:
+                session = min(live, key=lambda s: s.in_flight)
+            else:
+                if not block:
+                    return None
+                starting = self._sessions[0]  # Every slot is still spawning
+        finally:
+            self._lock.release()
+
+        if starting is not None:
+            starting.started.wait(self.call_timeout)
+            return self._checkout()
+        if spawn is not None:
+            try:
+                with span("mcp", "spawn"):
+                    spawn.start(timeout=self.call_timeout)
+            except Exception:
+                self._replace(spawn)  # Free the reserved slot
+                raise
+            return spawn
+
+        # Lazy health check: a session idle for a while gets pinged before reuse
+        if time.monotonic() - session.last_used > self.health_interval:
+            if not block:
+                return None
+            if not session.ping():
+                self._replace(session)
+                return self._checkout()
+        return session
+
+    def _replace(self, session: MCPSession):
+        session.close()
+        with self._lock:
+            if session in self._sessions:
+                self._sessions[self._sessions.index(session)] = None
+
+    def submit(self, tool_name: str, arguments: dict):
+        """Dispatches a tools/call and returns (session, Future) without waiting."""
+        session = self._checkout()
+        fut = session.request("tools/call", {"name": tool_name, "arguments": arguments})
+        return session, fut
+
+    def call_tool(self, tool_name: str, arguments: dict) -> str:
+        try:
+            session, fut = self.submit(tool_name, arguments)
+        except Exception as e:
+            return f"Execution Failed: {str(e)}"
+        try:
+            return extract_tool_text(fut.result(timeout=self.call_timeout))
+        except FutureTimeout:
+            # A hung tool would stall every call multiplexed behind it
+            self._replace(session)
+            return "Error: MCP Server timed out."
+        except Exception as e:
+            return f"Execution Failed: {str(e)}"
+
+    async def acall_tool(self, tool_name: str, arguments: dict) -> str:
+        """Async call_tool: awaits the reader thread's Future without tying up a worker thread."""
+        try:
+            # Spawning, pinging or a busy pool lock would block the loop, so those paths hop to a thread
+            session = self._checkout(block=False) or await asyncio.to_thread(self._checkout)
+            fut = session.request("tools/call", {"name": tool_name, "arguments": arguments})
+        except Exception as e:
+            return f"Execution Failed: {str(e)}"
+        try:
+            resp = await asyncio.wait_for(asyncio.wrap_future(fut), self.call_timeout)
+            return extract_tool_text(resp)
+        except asyncio.TimeoutError:
+            await asyncio.to_thread(self._replace, session)  # Takes the pool lock and reaps the child
+            return "Error: MCP Server timed out."
+        except Exception as e:
+            return f"Execution Failed: {str(e)}"
+
+    def health_check(self) -> list:
+        """Pings every live session, respawning the ones that fail. Returns per-slot status."""
+        status = []
+        for session in list(self._sessions):
+            if session is None:
+                status.append("empty")
+            elif not session.ready:
+                status.append("starting")
+            elif session.is_alive() and session.ping():
+                status.append("ok")
+            else:
+                self._replace(session)
+                status.append("respawn")
+        return status
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions:
+                if session is not None:
+                    session.close()
+            self._sessions = [None] * self.size
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> MCPSessionPool:
+    """Process-wide pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = MCPSessionPool()
+            atexit.register(_pool.close)
+        return _pool
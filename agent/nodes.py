@@ -1,4 +1,5 @@
 # agent/nodes.py
+import asyncio
 import json
 import os
 import sys
@@ -6,11 +7,16 @@ root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if root_path not in sys.path:
     sys.path.append(root_path)
 import subprocess
-from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage
 from agent.state import AgentState
 from agent.utils import get_current_date, get_news_cutoff_date
-from nexus.servers.tools import get_technical_summary, get_market_news
+from agent.llm_client import DEFAULT_MODEL, get_chat_model
+from agent.llm_scheduler import llm_scheduler, PRIORITY_INITIAL, PRIORITY_RISK, PRIORITY_REBUTTAL
+from agent.tracing import span
+from agent.cassette import cassette, encode_message, decode_message
+from agent.tool_transport import TOOL_TRANSPORT, call_local_tool, acall_local_tool
+from agent.mcp_pool import POOL_SIZE as MCP_POOL_SIZE, SERVER_PATH, get_pool, server_env, extract_tool_text
+from nexus.servers.tools import get_technical_summary, get_market_news, aget_market_news
 from agent.prompts import (
     TECHNICAL_INITIAL_PROMPT, TECHNICAL_REBUTTAL_PROMPT,
     FUNDAMENTAL_INITIAL_PROMPT, FUNDAMENTAL_REBUTTAL_PROMPT,
@@ -19,57 +25,61 @@ from agent.prompts import (
 
 # --- 1. SETUP LLM ---
 def get_llm():
-    return ChatGroq(model_name="llama-3.1-8b-instant", temperature=0.0)
+    # Shared per-model client on a pooled keep-alive transport (see agent/llm_client.py).
+    # Identical prompts at temperature 0 are served from the response cache (LLM_CACHE=0 disables).
+    # The model comes from LLM_MODEL (default llama-3.1-8b-instant)
+    return get_chat_model(DEFAULT_MODEL, temperature=0.0)
+
+def _llm_signature(llm, messages):
+    return [getattr(llm, "model_name", type(llm).__name__), [[m.type, m.content] for m in messages]]
+
+def ask_llm(messages, priority):
+    """One scheduled LLM call (rate-limited, cached, and recorded/replayed by the cassette)."""
+    llm = get_llm()
+    return cassette.call(
+        "llm", _llm_signature(llm, messages), lambda: llm_scheduler.invoke(llm, messages, priority),
+        encode=encode_message, decode=decode_message
+    )
+
+async def aask_llm(messages, priority):
+    llm = get_llm()
+    return await cassette.acall(
+        "llm", _llm_signature(llm, messages), lambda: llm_scheduler.ainvoke(llm, messages, priority),
+        encode=encode_message, decode=decode_message
+    )
 
 def call_mcp_tool(tool_name, arguments):
-    # 1. Handshake Definitions
-    init_req = {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"protocolVersion": "2024-11-05", "capabilities": {}, "clientInfo": {"name": "alpha", "version": "1.0"}}}
-    init_not = {"jsonrpc": "2.0", "method": "notifications/initialized"}
-    tool_req = {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": tool_name, "arguments": arguments}}
-    
-    payload = json.dumps(init_req) + "\n" + json.dumps(init_not) + "\n" + json.dumps(tool_req) + "\n"
-
-    # 2. Path Resolution
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    root_dir = os.path.dirname(current_dir)
-    server_path = os.path.join(root_dir, "nexus", "servers", "finance_server.py")
-    
-    # 3. Environment Setup
-    env = os.environ.copy()
-    env["PYTHONPATH"] = os.pathsep.join([root_dir, os.path.join(root_dir, "nexus")])
-    env["PYTHONIOENCODING"] = "utf-8"
+    with span("mcp", tool_name):
+        # CASSETTE_MODE=record/replay captures or serves the response (see agent/cassette.py)
+        return cassette.call("mcp", [tool_name, arguments], lambda: _call_mcp_tool(tool_name, arguments))
+
+def _call_mcp_tool(tool_name, arguments):
+    # Co-located tools: a plain function call through the ToolRegistry
+    if TOOL_TRANSPORT == "inprocess":
+        return call_local_tool(tool_name, arguments)
+    # Fast path: reuse a long-lived, already-handshaken server session
+    if MCP_POOL_SIZE > 0:
+        return get_pool().call_tool(tool_name, arguments)
+    return call_mcp_tool_oneshot(tool_name, arguments)
+
+def call_mcp_tool_oneshot(tool_name, arguments):
+    """Legacy path: spawns a fresh finance server for a single call (MCP_POOL_SIZE=0)."""
+    payload = _oneshot_payload(tool_name, arguments)
 
     try:
         process = subprocess.Popen(
-            [sys.executable, server_path],
+            [sys.executable, SERVER_PATH],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
-            env=env,
+            env=server_env(),
             encoding='utf-8',
             bufsize=1
         )
         
         stdout, stderr = process.communicate(input=payload, timeout=15)
-        
-        if stdout:
-            for line in stdout.strip().split("\n"):
-                clean_line = line.strip()
-                if clean_line.startswith('{"jsonrpc":"2.0"') or clean_line.startswith('{"id":2'):
-                    try:
-                        resp = json.loads(clean_line)
-                        if resp.get("id") == 2:
-                            if "result" in resp:
-                                return resp["result"]["content"][0]["text"]
-                            if "error" in resp:
-                                return f"MCP Tool Error: {resp['error']}"
-                    except json.JSONDecodeError: 
-                        continue
-
-        error_msg = f"Data Fetch Failed. Raw: {stdout[:50]} | Stderr: {stderr[:50]}"
-        print(f"❌ [MCP ERROR] {error_msg}")
-        return error_msg
+        return _parse_oneshot_output(stdout, stderr)
 
     except subprocess.TimeoutExpired:
         process.kill()
@@ -77,6 +87,58 @@ def call_mcp_tool(tool_name, arguments):
     except Exception as e:
         return f"Execution Failed: {str(e)}"
 
+def _oneshot_payload(tool_name, arguments):
+    # Handshake Definitions
+    init_req = {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"protocolVersion": "2024-11-05", "capabilities": {}, "clientInfo": {"name": "alpha", "version": "1.0"}}}
+    init_not = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+    tool_req = {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": tool_name, "arguments": arguments}}
+    return json.dumps(init_req) + "\n" + json.dumps(init_not) + "\n" + json.dumps(tool_req) + "\n"
+
+def _parse_oneshot_output(stdout, stderr):
+    if stdout:
+        for line in stdout.strip().split("\n"):
+            clean_line = line.strip()
+            if clean_line.startswith('{"jsonrpc":"2.0"') or clean_line.startswith('{"id":2'):
+                try:
+                    resp = json.loads(clean_line)
+                    if resp.get("id") == 2:
+                        return extract_tool_text(resp)
+                except json.JSONDecodeError: 
+                    continue
+
+    error_msg = f"Data Fetch Failed. Raw: {stdout[:50]} | Stderr: {stderr[:50]}"
+    print(f"❌ [MCP ERROR] {error_msg}")
+    return error_msg
+
+async def acall_mcp_tool(tool_name, arguments):
+    """Async call_mcp_tool: never blocks the event loop on pipes or process startup."""
+    with span("mcp", tool_name):
+        return await cassette.acall("mcp", [tool_name, arguments], lambda: _acall_mcp_tool(tool_name, arguments))
+
+async def _acall_mcp_tool(tool_name, arguments):
+    if TOOL_TRANSPORT == "inprocess":
+        return await acall_local_tool(tool_name, arguments)
+    if MCP_POOL_SIZE > 0:
+        return await get_pool().acall_tool(tool_name, arguments)
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, SERVER_PATH,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=server_env()
+        )
+        payload = _oneshot_payload(tool_name, arguments).encode("utf-8")
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(input=payload), timeout=15)
+        except asyncio.TimeoutError:
+            process.kill()
+            return "Error: MCP Server timed out."
+        return _parse_oneshot_output(stdout.decode("utf-8", errors="replace"), stderr.decode("utf-8", errors="replace"))
+    except Exception as e:
+        return f"Execution Failed: {str(e)}"
+
 # --- HELPER: SCORE NORMALIZER ---
 def normalize_score(val):
     try:
@@ -105,23 +167,18 @@ def parse_json_safely(text):
         return None
 
 # --- 3. AGENT NODES ---
+# Each node is split into prompt building and response handling so the sync
+# node and its async twin (a<name>) share every guardrail.
 
-def technical_analyst(state: AgentState):
-    ticker = state["ticker"]
-    print(f"\n📈 [Technical] Analyzing {ticker}...")
-    
-    data = call_mcp_tool("analyze_stock", {"ticker": ticker})
-    print(f"👀 [DEBUG] Tech Data: {str(data)[:60]}...") 
-
-    llm = get_llm()
+# --- TECHNICAL ANALYST ---
+def _technical_messages(ticker, data):
     prompt = TECHNICAL_INITIAL_PROMPT.format(ticker=ticker, data=data)
-    
-    messages = [
+    return [
         SystemMessage(content=prompt),
         HumanMessage(content=f"Analyze {ticker} now.")
     ]
-    response = llm.invoke(messages)
-    
+
+def _technical_result(response):
     data_json = parse_json_safely(response.content)
     if data_json:
         conf = normalize_score(data_json.get("confidence", 50))
@@ -133,21 +190,35 @@ def technical_analyst(state: AgentState):
 
     return {"tech_thesis_initial": thesis, "tech_confidence_initial": conf}
 
-def fundamental_analyst(state: AgentState):
+def technical_analyst(state: AgentState):
     ticker = state["ticker"]
-    print(f"💰 [Fundamental] Analyzing {ticker}...")
-    
-    data = call_mcp_tool("get_fundamentals", {"ticker": ticker})
-    
-    llm = get_llm()
+    print(f"\n📈 [Technical] Analyzing {ticker}...")
+
+    data = call_mcp_tool("analyze_stock", {"ticker": ticker})
+    print(f"👀 [DEBUG] Tech Data: {str(data)[:60]}...")
+
+    response = ask_llm(_technical_messages(ticker, data), PRIORITY_INITIAL)
+    return _technical_result(response)
+
+async def atechnical_analyst(state: AgentState):
+    ticker = state["ticker"]
+    print(f"\n📈 [Technical] Analyzing {ticker}...")
+
+    data = await acall_mcp_tool("analyze_stock", {"ticker": ticker})
+    print(f"👀 [DEBUG] Tech Data: {str(data)[:60]}...")
+
+    response = await aask_llm(_technical_messages(ticker, data), PRIORITY_INITIAL)
+    return _technical_result(response)
+
+# --- FUNDAMENTAL ANALYST ---
+def _fundamental_messages(ticker, data):
     prompt = FUNDAMENTAL_INITIAL_PROMPT.format(ticker=ticker, data=data)
-    
-    messages = [
+    return [
         SystemMessage(content=prompt),
         HumanMessage(content=f"Analyze {ticker} now.")
     ]
-    response = llm.invoke(messages)
-    
+
+def _fundamental_result(response):
     data_json = parse_json_safely(response.content)
     if data_json:
         conf = normalize_score(data_json.get("confidence", 50))
@@ -159,58 +230,71 @@ def fundamental_analyst(state: AgentState):
 
     return {"fund_thesis_initial": thesis, "fund_confidence_initial": conf}
 
+def fundamental_analyst(state: AgentState):
+    ticker = state["ticker"]
+    print(f"💰 [Fundamental] Analyzing {ticker}...")
+
+    data = call_mcp_tool("get_fundamentals", {"ticker": ticker})
+    response = ask_llm(_fundamental_messages(ticker, data), PRIORITY_INITIAL)
+    return _fundamental_result(response)
+
+async def afundamental_analyst(state: AgentState):
+    ticker = state["ticker"]
+    print(f"💰 [Fundamental] Analyzing {ticker}...")
+
+    data = await acall_mcp_tool("get_fundamentals", {"ticker": ticker})
+    response = await aask_llm(_fundamental_messages(ticker, data), PRIORITY_INITIAL)
+    return _fundamental_result(response)
+
 
 from datetime import datetime, timedelta
 from langchain_core.messages import SystemMessage, HumanMessage
 
-def risk_manager(state: AgentState):
-    ticker = state["ticker"]
-    now = datetime.now()
-    current_dt = get_current_date()
-    cutoff_dt = get_news_cutoff_date()
-    
-    # PASS 1: High-Precision Adversarial (SEC/Legal)
-    # We keep -GOP and -Somali to avoid the Minnesota noise, but REMOVE -politics
-    query_p1 = f"{ticker} stock risk lawsuit investigation fraud SEC DOJ -GOP -Somali"
-    news_data = get_market_news(query_p1)
-
-    # PASS 2: SUCCESSIVE RELAXATION (If PASS 1 is empty or weak)
-    if not news_data or len(str(news_data)) < 150:
-        print(f"⚠️ Precise search empty. Fetching Geopolitical/Trade catalysts...")
+# --- RISK MANAGER ---
+def _risk_queries(ticker, now):
+    return [
+        # PASS 1: High-Precision Adversarial (SEC/Legal)
+        # We keep -GOP and -Somali to avoid the Minnesota noise, but REMOVE -politics
+        f"{ticker} stock risk lawsuit investigation fraud SEC DOJ -GOP -Somali",
+        # PASS 2: SUCCESSIVE RELAXATION (If PASS 1 is empty or weak)
         # This will catch the China H200 'export fee' and ByteDance news
-        query_p2 = f"{ticker} stock China H200 'export fee' ByteDance order {now.year}"
-        news_data = get_market_news(query_p2)
+        f"{ticker} stock China H200 'export fee' ByteDance order {now.year}",
+        # PASS 3: Broad Corporate Context (Final Safety Net)
+        f"{ticker} stock corporate news risk catalyst {now.strftime('%Y-%m-%d')}",
+    ]
 
-    # PASS 3: Broad Corporate Context (Final Safety Net)
-    if not news_data or len(str(news_data)) < 150:
-        query_p3 = f"{ticker} stock corporate news risk catalyst {now.strftime('%Y-%m-%d')}"
-        news_data = get_market_news(query_p3)
+# sequential: run the next relaxation pass only when the previous one was too thin.
+# speculative: launch every pass at once and keep the highest-priority good one (async nodes only).
+RISK_NEWS_MODE = os.environ.get("RISK_NEWS_MODE", "sequential").lower()
 
-    # ✅ 2. Execute LLM Audit
-    llm = get_llm()
+def _is_weak_news(news_data):
+    return not news_data or len(str(news_data)) < 150
+
+def _risk_messages(state, news_data):
     prompt = RISK_CRITIQUE_PROMPT.format(
-        ticker=ticker,
-        current_date=current_dt,
-        news_cutoff_date=cutoff_dt,
+        ticker=state["ticker"],
+        current_date=get_current_date(),
+        news_cutoff_date=get_news_cutoff_date(),
         tech_thesis=state.get("tech_thesis_initial", ""),
         fund_thesis=state.get("fund_thesis_initial", ""),
         news=news_data
     )
-    
-    response = llm.invoke([SystemMessage(content=prompt)])
+    return [SystemMessage(content=prompt)]
+
+def _risk_result(response, news_data):
     data_json = parse_json_safely(response.content)
 
     # ✅ 3. Persistence Guardrail: Prevent "No News Panic"
-    # If the news confirms the H200 export surge, the risk_score should be MODERATE (~40), 
+    # If the news confirms the H200 export surge, the risk_score should be MODERATE (~40),
     # and the Tech Confidence should NOT drop to 30.
     risk_score = 0
     if data_json:
         risk_score = normalize_score(data_json.get("risk_score", 0))
-        # Logic: If news is actually bullish (like the $14B ByteDance order), 
+        # Logic: If news is actually bullish (like the $14B ByteDance order),
         # tell the state to maintain technical confidence.
         if "H200" in str(news_data) and "ByteDance" in str(news_data):
             print("💡 News indicates strong China demand. Softening risk impact.")
-            risk_score = min(risk_score, 35) 
+            risk_score = min(risk_score, 35)
 
     return {
         "risk_critique_tech": data_json.get("risk_critique_tech", "None"),
@@ -219,26 +303,96 @@ def risk_manager(state: AgentState):
         "risk_news_summary": str(news_data)[:500]
     }
 
+def risk_manager(state: AgentState):
+    queries = _risk_queries(state["ticker"], datetime.now())
+
+    # ✅ 1. Successive relaxation: stop at the first pass with enough news
+    news_data = None
+    for i, query in enumerate(queries):
+        if i == 1:
+            print(f"⚠️ Precise search empty. Fetching Geopolitical/Trade catalysts...")
+        with span("news", f"pass_{i + 1}") as attrs:
+            news_data = cassette.call("news", [query], lambda: get_market_news(query))
+            attrs["chars"] = len(str(news_data))
+        if not _is_weak_news(news_data):
+            break
 
-def technical_rebuttal(state: AgentState):
+    # ✅ 2. Execute LLM Audit
+    response = ask_llm(_risk_messages(state, news_data), PRIORITY_RISK)
+    return _risk_result(response, news_data)
+
+async def _anews_pass(i, query):
+    with span("news", f"pass_{i + 1}") as attrs:
+        try:
+            # Cancelling a losing pass while it queues for a DuckDuckGo token skips its search;
+            # a search already running finishes in aget_market_news and still fills the news cache
+            news_data = await cassette.acall("news", [query], lambda: aget_market_news(query))
+        except asyncio.CancelledError:
+            attrs["cancelled"] = True  # A higher-priority pass already had enough news
+            raise
+        attrs["chars"] = len(str(news_data))
+        return news_data
+
+async def _asequential_news(queries):
+    news_data = None
+    for i, query in enumerate(queries):
+        if i == 1:
+            print(f"⚠️ Precise search empty. Fetching Geopolitical/Trade catalysts...")
+        news_data = await _anews_pass(i, query)
+        if not _is_weak_news(news_data):
+            break
+    return news_data
+
+async def _aspeculative_news(queries):
+    """All relaxation passes at once; the first pass (in priority order) with enough news wins."""
+    tasks = [asyncio.create_task(_anews_pass(i, q)) for i, q in enumerate(queries)]
+    try:
+        news_data = None
+        for i, task in enumerate(tasks):
+            news_data = await task
+            if not _is_weak_news(news_data):
+                break
+            if i + 1 < len(tasks):
+                print(f"⚠️ Pass {i + 1} too thin. Using the relaxed pass already in flight...")
+        return news_data  # Same fallback as sequential: the broadest pass, even if weak
+    finally:
+        for task in tasks:
+            task.cancel()  # Lower-priority passes still running are no longer needed
+        # Retrieve every outcome so a pass that failed (e.g. CassetteMiss) is never logged as unretrieved
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+async def arisk_manager(state: AgentState):
+    queries = _risk_queries(state["ticker"], datetime.now())
+
+    # RISK_NEWS_MODE=speculative trades a few extra searches for one search of latency
+    if RISK_NEWS_MODE == "speculative":
+        news_data = await _aspeculative_news(queries)
+    else:
+        news_data = await _asequential_news(queries)
+
+    response = await aask_llm(_risk_messages(state, news_data), PRIORITY_RISK)
+    return _risk_result(response, news_data)
+
+
+# --- TECHNICAL REBUTTAL ---
+def _technical_rebuttal_messages(state):
+    prompt = TECHNICAL_REBUTTAL_PROMPT.format(
+        original_thesis=state.get("tech_thesis_initial", ""),
+        risk_score=int(state.get("risk_danger_score", 0)),
+        risk_critique=state.get("risk_critique_tech", "")
+    )
+    return [SystemMessage(content=prompt)]
+
+def _technical_rebuttal_result(state, response):
     ticker = state["ticker"]
-    print(f"📈 [Technical] Rebutting {ticker}...")
-    
+
     # 1. Capture local state variables for the guardrail
     risk_score = int(state.get("risk_danger_score", 0))
     initial_conf = state.get("tech_confidence_initial", 70)
     initial_signal = state.get("tech_signal_initial", "BUY")
 
-    llm = get_llm()
-    prompt = TECHNICAL_REBUTTAL_PROMPT.format(
-        original_thesis=state.get("tech_thesis_initial", ""),
-        risk_score=risk_score,
-        risk_critique=state.get("risk_critique_tech", "")
-    )
-    
-    response = llm.invoke([SystemMessage(content=prompt)])
     data_json = parse_json_safely(response.content)
-    
+
     # ✅ PERSISTENCE GUARDRAIL: Prevent "Zero-Confidence Hallucination"
     # If the risk is low (< 30) but the analyst panicked (conf < 20), we force a reset.
     if data_json and data_json.get("final_confidence", 100) < 20 and risk_score < 30:
@@ -249,34 +403,43 @@ def technical_rebuttal(state: AgentState):
 
     if data_json:
         return {
-            "tech_thesis_final": data_json.get("final_thesis"), 
+            "tech_thesis_final": data_json.get("final_thesis"),
             "tech_confidence_final": normalize_score(data_json.get("final_confidence", 50))
         }
-        
+
     return {
-        "tech_thesis_final": response.content, 
+        "tech_thesis_final": response.content,
         "tech_confidence_final": initial_conf
     }
 
-def fundamental_rebuttal(state: AgentState):
+def technical_rebuttal(state: AgentState):
+    print(f"📈 [Technical] Rebutting {state['ticker']}...")
+    response = ask_llm(_technical_rebuttal_messages(state), PRIORITY_REBUTTAL)
+    return _technical_rebuttal_result(state, response)
+
+async def atechnical_rebuttal(state: AgentState):
+    print(f"📈 [Technical] Rebutting {state['ticker']}...")
+    response = await aask_llm(_technical_rebuttal_messages(state), PRIORITY_REBUTTAL)
+    return _technical_rebuttal_result(state, response)
+
+# --- FUNDAMENTAL REBUTTAL ---
+def _fundamental_rebuttal_messages(state):
+    prompt = FUNDAMENTAL_REBUTTAL_PROMPT.format(
+        original_thesis=state.get("fund_thesis_initial", ""),
+        risk_score=int(state.get("risk_danger_score", 0)),
+        risk_critique=state.get("risk_critique_fund", "")
+    )
+    return [SystemMessage(content=prompt)]
+
+def _fundamental_rebuttal_result(state, response):
     ticker = state["ticker"]
-    print(f"💰 [Fundamental] Rebutting {ticker}...")
-    
+
     # 1. Capture baseline state for the guardrail
     risk_score = int(state.get("risk_danger_score", 0))
     initial_conf = state.get("fund_confidence_initial", 60)
-    initial_thesis = state.get("fund_thesis_initial", "")
 
-    llm = get_llm()
-    prompt = FUNDAMENTAL_REBUTTAL_PROMPT.format(
-        original_thesis=initial_thesis,
-        risk_score=risk_score,
-        risk_critique=state.get("risk_critique_fund", "")
-    )
-    
-    response = llm.invoke([SystemMessage(content=prompt)])
     data_json = parse_json_safely(response.content)
-    
+
     # ✅ PERSISTENCE GUARDRAIL: Prevent Fundamental Panic
     # If risk is baseline (< 30) but the analyst dropped confidence significantly, reset it.
     if data_json and risk_score < 30 and data_json.get("final_confidence", 100) < 40:
@@ -286,16 +449,30 @@ def fundamental_rebuttal(state: AgentState):
 
     if data_json:
         return {
-            "fund_thesis_final": data_json.get("final_thesis"), 
+            "fund_thesis_final": data_json.get("final_thesis"),
             "fund_confidence_final": normalize_score(data_json.get("final_confidence", 50))
         }
-        
+
     return {
-        "fund_thesis_final": response.content, 
+        "fund_thesis_final": response.content,
         "fund_confidence_final": initial_conf
     }
 
+def fundamental_rebuttal(state: AgentState):
+    print(f"💰 [Fundamental] Rebutting {state['ticker']}...")
+    response = ask_llm(_fundamental_rebuttal_messages(state), PRIORITY_REBUTTAL)
+    return _fundamental_rebuttal_result(state, response)
+
+async def afundamental_rebuttal(state: AgentState):
+    print(f"💰 [Fundamental] Rebutting {state['ticker']}...")
+    response = await aask_llm(_fundamental_rebuttal_messages(state), PRIORITY_REBUTTAL)
+    return _fundamental_rebuttal_result(state, response)
+
 def final_node(state: AgentState):
     print("🏁 [Final Verdict] Math Engine Calculating...")
     from agent.final_verdict import calculate_verdict
-    return calculate_verdict(state)
\ No newline at end of file
+    return calculate_verdict(state)
+
+async def afinal_node(state: AgentState):
+    # Pure math, but async so LangGraph runs it on the loop instead of a worker thread
+    return final_node(state)
@@ -0,0 +1,231 @@
+# agent/screener.py
+"""
+Numeric pre-screen in front of the council.
+
+A full debate costs five LLM calls per ticker, so covering an index with it
+scales LLM spend with the index. The screener scores the whole universe with
+vectorized indicator math (nexus/indicators/screen.py) and only the top N go to
+agent.graph for a debate:
+
+1. Prices: one bulk download per SCREEN_CHUNK tickers into the history cache,
+   then trend / momentum / RSI scores and filters for every ticker at once.
+2. Fundamentals: only the best SCREEN_FUNDAMENTALS_POOL technical survivors get
+   a snapshot lookup (Yahoo has no bulk info endpoint), then the final ranking.
+
+Repeat screens read prices from the on-disk history cache; raise
+HISTORY_CACHE_SIZE above the universe size to keep them in memory instead.
+
+    python -m agent.screener AAPL MSFT NVDA AMD INTC --top 2
+    python -m agent.screener --file sp500.txt --top 10 --rules rules.json --council
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from agent.tracing import span
+from nexus.cache.fundamentals import get_fundamentals_snapshot
+from nexus.cache.history import get_history, prefetch_history
+from nexus.indicators.screen import fundamentals_arrays, load_rules, rank, score_universe
+
+SCREEN_TOP_N = int(os.environ.get("SCREEN_TOP_N", "10"))
+SCREEN_CHUNK = int(os.environ.get("SCREEN_CHUNK", "200"))  # Tickers per bulk yf.download
+SCREEN_FUNDAMENTALS_POOL = int(os.environ.get("SCREEN_FUNDAMENTALS_POOL", "200"))  # 0 = every survivor
+SCREEN_WORKERS = int(os.environ.get("SCREEN_WORKERS", "8"))
+SCREEN_CONCURRENCY = int(os.environ.get("SCREEN_CONCURRENCY", "4"))  # Councils at once
+SCREEN_PERIOD = "1y"  # Enough bars for SMA 50 and RSI 14
+
+# FundamentalsCache keeps Yahoo's field names; the screen uses get_company_info's
+YAHOO_FIELDS = {
+    "market_cap": "marketCap",
+    "pe_ratio": "trailingPE",
+    "margins": "profitMargins",
+    "debt_equity": "debtToEquity",
+    "sector": "sector",
+}
+
+
+def clean_tickers(tickers) -> list:
+    return list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+
+
+# --- DATA ---
+def load_price_frame(tickers: list, period: str = SCREEN_PERIOD) -> pd.DataFrame:
+    """Bars x tickers close frame (tickers without data are left out). Bulk downloads fill the history cache first."""
+    closes = {}
+    for i in range(0, len(tickers), SCREEN_CHUNK):
+        chunk = tickers[i:i + SCREEN_CHUNK]
+        try:
+            prefetch_history(chunk, period=period)
+        except Exception as e:
+            print(f"⚠️ Bulk prefetch failed for {len(chunk)} tickers, fetching one by one: {e}")
+        # Read the chunk back while it is still in the in-memory LRU (HISTORY_CACHE_SIZE)
+        for ticker in chunk:
+            try:
+                hist = get_history(ticker, period=period)
+            except Exception as e:
+                print(f"⚠️ No history for {ticker}: {e}")
+                continue
+            if not hist.empty:
+                closes[ticker] = hist["Close"]
+    if not closes:
+        return pd.DataFrame()
+    # Align on one calendar; carry prices over gaps so windows stay complete
+    return pd.DataFrame(closes).sort_index().ffill()
+
+
+def load_prices(tickers: list, period: str = SCREEN_PERIOD):
+    """(tickers with data, (tickers, bars) close matrix)."""
+    frame = load_price_frame(tickers, period)
+    if frame.empty:
+        return [], np.empty((0, 0))
+    return list(frame.columns), frame.to_numpy(dtype="float64").T
+
+
+def load_fundamentals(tickers: list) -> list:
+    """Per-ticker dicts with get_company_info's fields; a failed lookup is an empty dict."""
+    def snapshot(ticker):
+        try:
+            info = get_fundamentals_snapshot(ticker)
+        except Exception as e:
+            print(f"⚠️ No fundamentals for {ticker}: {e}")
+            return {}
+        return {field: info.get(key) for field, key in YAHOO_FIELDS.items()}
+
+    if not tickers:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(SCREEN_WORKERS, len(tickers)))) as pool:
+        return list(pool.map(snapshot, tickers))
+
+
+# --- SCREEN ---
+def _row(ticker: str, scored: dict, i: int, fund_row: dict) -> dict:
+    def num(key, digits=2):
+        value = scored[key][i]
+        return None if np.isnan(value) else round(float(value), digits)
+
+    return {
+        "ticker": ticker, "score": num("score", 1), "price": num("price"), "rsi": num("rsi"),
+        "is_uptrend": bool(scored["is_uptrend"][i]),
+        "factors": {k[:-len("_score")]: num(k, 1) for k in scored if k.endswith("_score")},
+        **fund_row,
+    }
+
+
+def screen(tickers, rules: dict = None, top_n: int = SCREEN_TOP_N, period: str = SCREEN_PERIOD) -> dict:
+    """Ranks the universe. "top" holds the tickers worth a council, "ranking" every passing ticker."""
+    rules = rules or load_rules()
+    tickers = clean_tickers(tickers)
+
+    with span("screen", "technical") as attrs:
+        names, prices = load_prices(tickers, period)
+        survivors = np.empty(0, dtype=int)
+        if names:
+            tech = score_universe(prices, rules=rules)
+            survivors = rank(tech["score"], tech["passed"], SCREEN_FUNDAMENTALS_POOL)
+        attrs.update(priced=len(names), survivors=len(survivors))
+    print(f"📊 Screen: {len(names)}/{len(tickers)} priced, {len(survivors)} pass the technical filters")
+
+    ranking, pool = [], [names[i] for i in survivors]
+    if pool:
+        with span("screen", "fundamental"):
+            fund_rows = load_fundamentals(pool)
+            scored = score_universe(prices[survivors], fundamentals_arrays(fund_rows), rules)
+            order = rank(scored["score"], scored["passed"])
+        ranking = [_row(pool[i], scored, i, fund_rows[i]) for i in order]
+    return {
+        "universe": len(tickers),
+        "priced": len(names),
+        "survivors": len(pool),
+        "passed": len(ranking),
+        "top": [row["ticker"] for row in ranking[:top_n]],
+        "ranking": ranking,
+    }
+
+
+async def ascreen(tickers, rules: dict = None, top_n: int = SCREEN_TOP_N) -> dict:
+    # Downloads and cache reads block; keep them off the event loop
+    return await asyncio.to_thread(screen, tickers, rules, top_n)
+
+
+# --- ESCALATION ---
+async def escalate(tickers: list, council, concurrency: int = SCREEN_CONCURRENCY) -> list:
+    """Runs `await council(ticker)` for the screened tickers, a few at a time; results keep rank order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(ticker):
+        async with semaphore:
+            try:
+                return await council(ticker)
+            except Exception as e:
+                print(f"❌ Council failed ({ticker}): {str(e)}")
+                return {"ticker": ticker, "error": str(e)}
+
+    return await asyncio.gather(*(run_one(t) for t in tickers))
+
+
+# --- CLI ---
+def read_universe(args) -> list:
+    tickers = list(args.tickers)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            # One ticker per line or comma separated; '#' starts a comment
+            for line in f:
+                tickers += line.split("#", 1)[0].replace(",", " ").split()
+    return clean_tickers(tickers)
+
+
+async def run_cli(args) -> dict:
+    result = await ascreen(read_universe(args), load_rules(args.rules), args.top)
+    if args.council and result["top"]:
+        # Same path as /analyze: today's stored debate is reused, new ones are saved for backtests.
+        # Imported here so a plain screen never builds the graph
+        from agent.council import analyze
+
+        async def council(ticker):
+            return await analyze(ticker, args.style, args.risk)
+
+        print(f"🏛️ Escalating {len(result['top'])} tickers to the council...")
+        result["council"] = await escalate(result["top"], council, args.concurrency)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Numeric pre-screen for the Alpha Council")
+    parser.add_argument("tickers", nargs="*")
+    parser.add_argument("--file", help="Universe file: tickers separated by newlines or commas")
+    parser.add_argument("--top", type=int, default=SCREEN_TOP_N, help="How many tickers to escalate")
+    parser.add_argument("--rules", help="Rules JSON file or inline JSON (default: SCREEN_RULES)")
+    parser.add_argument("--council", action="store_true", help="Run the full debate for the top tickers")
+    parser.add_argument("--style", default="investor")
+    parser.add_argument("--risk", default="moderate")
+    parser.add_argument("--concurrency", type=int, default=SCREEN_CONCURRENCY)
+    parser.add_argument("--json", dest="json_path", help="Also write the result to this file")
+    args = parser.parse_args(argv)
+    if not args.tickers and not args.file:
+        parser.error("give tickers or --file")
+
+    result = asyncio.run(run_cli(args))
+
+    print(f"\n{'#':>3}  {'ticker':<8}{'score':>7}{'price':>10}{'rsi':>7}  sector")
+    for n, row in enumerate(result["ranking"][:max(args.top, 20)], 1):
+        mark = "→" if row["ticker"] in result["top"] else " "
+        print(f"{n:>3}{mark} {row['ticker']:<8}{row['score']:>7.1f}{row['price'] or 0:>10.2f}"
+              f"{row['rsi'] or 0:>7.1f}  {row.get('sector') or '-'}")
+    for item in result.get("council", []):
+        verdict = item.get("final_verdict", {})
+        print(f"🏛️ {item['ticker']}: {verdict.get('signal', 'ERROR')} {verdict.get('confidence', item.get('error', ''))}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, default=str)
+        print(f"\n💾 Screen written to {args.json_path}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# agent/tool_transport.py
+"""
+In-process transport for the finance tools.
+
+TOOL_TRANSPORT=mcp (default) sends every tool call over JSON-RPC to a
+finance_server.py subprocess (agent/mcp_pool.py). TOOL_TRANSPORT=inprocess calls
+the same functions through nexus' ToolRegistry instead: no serialization, no
+process boundary. Use it when the agent and the tools are deployed together;
+keep mcp when a misbehaving data source must not take the API process down.
+"""
+import os
+
+TOOL_TRANSPORT = os.environ.get("TOOL_TRANSPORT", "mcp").lower()  # mcp | inprocess
+
+
+def get_registry():
+    """The shared ToolRegistry, with the finance tools registered (on first import of the server)."""
+    import nexus.servers.finance_server  # noqa: F401  (registers the tools)
+    from nexus.servers.registry import registry
+    return registry
+
+
+def _as_text(result) -> str:
+    # Same text contract as extract_tool_text(): agents only ever see strings
+    if isinstance(result, dict) and result.get("status") == "failed":
+        return f"MCP Tool Error: {result.get('error')}"
+    return result if isinstance(result, str) else str(result)
+
+
+def call_local_tool(tool_name: str, arguments: dict) -> str:
+    try:
+        return _as_text(get_registry().call(tool_name, **arguments))
+    except Exception as e:
+        return f"Execution Failed: {str(e)}"
+
+
+async def acall_local_tool(tool_name: str, arguments: dict) -> str:
+    # The registry runs blocking tools off the event loop, under each tool's timeout and concurrency cap
+    try:
+        return _as_text(await get_registry().acall(tool_name, **arguments))
+    except Exception as e:
+        return f"Execution Failed: {str(e)}"
@@ -0,0 +1,135 @@
+# agent/tracing.py
+"""
+Lightweight timing spans and Prometheus metrics for the council.
+
+span(kind, name) times a block (graph node, MCP call, news pass, LLM call) and
+records it in two places:
+  - a process-wide histogram, exported as Prometheus text on GET /metrics
+  - the current request's trace, if the caller opened one with start_trace()
+    (main.py does this for /analyze when the request asks for timings)
+
+The trace lives in a context variable holding a mutable list, so spans recorded
+in LangGraph node tasks and asyncio.to_thread workers land in the same trace.
+No prometheus_client dependency: the exposition format is a few lines of text.
+"""
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds. Cache hits land in the first buckets, cold Groq/yfinance calls in the last
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_trace = contextvars.ContextVar("council_trace", default=None)
+_parent = contextvars.ContextVar("council_span", default=None)
+
+
+def _label_str(labels: tuple, names: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{str(v)}"' for n, v in zip(names, labels)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple, buckets: tuple = BUCKETS):
+        self.name, self.help, self.labelnames, self.buckets = name, help, labelnames, buckets
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        with self._lock:
+            series = self._series.setdefault(labels, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                for bound, n in zip(self.buckets, series):
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_label_str(labels, self.labelnames, le)} {n}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_label_str(labels, self.labelnames, le)} {series[-1]}")
+                lines.append(f"{self.name}_sum{_label_str(labels, self.labelnames)} {series[-2]}")
+                lines.append(f"{self.name}_count{_label_str(labels, self.labelnames)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(labels, self.labelnames)} {value}")
+        return lines
+
+
+# --- PROCESS-WIDE METRICS ---
+span_seconds = Histogram("council_span_seconds", "Duration of traced council spans", ("kind", "name"))
+llm_calls = Counter("council_llm_calls_total", "LLM calls by model and cache outcome", ("model", "cache"))
+llm_tokens = Counter("council_llm_tokens_total", "Provider-reported LLM tokens", ("model", "type"))
+METRICS = [span_seconds, llm_calls, llm_tokens]
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- SPANS ---
+def start_trace() -> list:
+    """Opens a per-request trace in the current context; spans recorded below it append to the list."""
+    trace = []
+    _trace.set(trace)
+    return trace
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs):
+    """Times the block. Yields a dict the block can add attributes to (tokens, cache_hit, ...)."""
+    parent = _parent.get()
+    token = _parent.set(name)
+    start = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        elapsed = time.perf_counter() - start
+        _parent.reset(token)
+        span_seconds.observe((kind, name), elapsed)
+        trace = _trace.get()
+        if trace is not None:
+            trace.append({"kind": kind, "name": name, "parent": parent, "ms": round(elapsed * 1000, 2), **attrs})
+
+
+def traced_node(name: str, fn):
+    """Wraps an async graph node in a "node" span named after it."""
+    @functools.wraps(fn)
+    async def node(state):
+        with span("node", name):
+            return await fn(state)
+    return node
+
+
+def summarize(trace: list) -> dict:
+    """Per-request breakdown: summed ms per span kind (parallel spans overlap) plus the raw spans."""
+    by_kind = {}
+    for s in trace:
+        by_kind[s["kind"]] = round(by_kind.get(s["kind"], 0) + s["ms"], 2)
+    return {"by_kind_ms": by_kind, "spans": trace}
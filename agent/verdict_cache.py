@@ -0,0 +1,82 @@
+# agent/verdict_cache.py
+"""
+Request coalescing and result caching for the council.
+
+SingleFlight attaches concurrent identical requests to one running graph
+execution; VerdictCache keeps finished results for VERDICT_TTL seconds. agent/council.py
+keys both by debate_key() (ticker + trading date, see agent/debate.py), so every
+profile for a ticker shares one run and yesterday's result is never served today.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+VERDICT_TTL = float(os.environ.get("VERDICT_TTL", "900"))
+VERDICT_CACHE_SIZE = int(os.environ.get("VERDICT_CACHE_SIZE", "1024"))
+
+
+class SingleFlight:
+    """At most one in-flight coroutine per key; late callers await the same result."""
+
+    def __init__(self):
+        self._inflight = {}
+
+    async def do(self, key, fn):
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(fn())
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield: one caller disconnecting must not cancel the run the others share
+        return await asyncio.shield(fut)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+
+class VerdictCache:
+    """TTL + LRU map of finished graph results."""
+
+    def __init__(self, ttl: float = VERDICT_TTL, max_entries: int = VERDICT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or time.time() > entry[1]:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, result):
+        self._entries[key] = (result, time.time() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Process-wide instances used by agent/council.py
+singleflight = SingleFlight()
+verdict_cache = VerdictCache()
+
+
+async def cached_run(key, fn):
+    """Memory hit, else join (or start) the single in-flight run and cache its result."""
+    result = verdict_cache.get(key)
+    if result is not None:
+        return result
+
+    async def run_and_store():
+        result = await fn()
+        verdict_cache.put(key, result)
+        return result
+
+    return await singleflight.do(key, run_and_store)
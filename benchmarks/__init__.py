@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Offline benchmark suite: run with `python -m benchmarks.run --help`
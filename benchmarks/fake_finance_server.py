@@ -0,0 +1,21 @@
+# benchmarks/fake_finance_server.py
+"""
+finance_server.py with the market-data fakes installed.
+
+benchmarks/run.py points agent.mcp_pool at this script, so the benchmark still
+goes through real MCP sessions (spawn, handshake, JSON-RPC) but never touches
+Yahoo or DuckDuckGo.
+"""
+import os
+
+from benchmarks.fakes import install_data_fakes
+
+install_data_fakes(
+    latency=float(os.environ.get("BENCH_DATA_LATENCY", "0")),
+    news_latency=float(os.environ.get("BENCH_NEWS_LATENCY", "0"))
+)
+
+from nexus.servers.finance_server import mcp
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,193 @@
+# benchmarks/fakes.py
+"""
+Deterministic local stand-ins for yfinance, DuckDuckGo and Groq.
+
+Each fake plugs in at the same seam the real source uses (the history and
+fundamentals cache fetchers, the DDGS class, the chat model), so everything
+between the agents and the network still runs for real: MCP pool, caches,
+indicators, prompts, scheduler, parsing and the math engine.
+Output depends only on the ticker/query, so two runs see identical data.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+MARKET_TZ = "America/New_York"
+ORIGIN = "2015-01-02"
+SECTORS = ["Technology", "Healthcare", "Financial Services", "Energy", "Consumer Cyclical"]
+
+
+def seed_for(*parts) -> int:
+    return int.from_bytes(hashlib.sha256("|".join(map(str, parts)).encode()).digest()[:4], "big")
+
+
+# --- MARKET DATA (yfinance) ---
+def _market_ts(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_convert(MARKET_TZ) if ts.tzinfo else ts.tz_localize(MARKET_TZ)
+
+
+def synthetic_ohlcv(ticker: str, start: datetime, end: datetime = None) -> pd.DataFrame:
+    """Daily bars from a seeded random walk; the same ticker always walks the same path."""
+    # The walk is anchored at a fixed origin so a later start returns a suffix of the same series
+    index = pd.bdate_range(_market_ts(ORIGIN), _market_ts(end or datetime.now()).normalize())
+    rng = np.random.default_rng(seed_for("ohlcv", ticker))
+    close = (20 + rng.random() * 480) * np.exp(np.cumsum(rng.normal(0.0004, 0.02, len(index))))
+    spread = np.abs(rng.normal(0, 0.01, len(index))) * close
+    frame = pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.005, len(index))),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(200_000, 50_000_000, len(index)),
+    }, index=index)
+    frame.index.name = "Date"
+    return frame[frame.index >= _market_ts(start)]
+
+
+class FakeMarketData:
+    """Fetchers for HistoryCache and FundamentalsCache with a fixed per-call latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def _wait(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def history(self, ticker: str, interval: str, period: str = None, start: datetime = None) -> pd.DataFrame:
+        from nexus.cache.history import period_start
+        self._wait()
+        start = start or period_start(period or "1y") or ORIGIN
+        return synthetic_ohlcv(ticker, start)
+
+    def bulk_history(self, tickers: list, interval: str, period: str) -> dict:
+        self._wait()
+        from nexus.cache.history import period_start
+        start = period_start(period) or ORIGIN
+        return {t: synthetic_ohlcv(t, start) for t in tickers}
+
+    def info(self, ticker: str) -> dict:
+        self._wait()
+        rng = random.Random(seed_for("info", ticker))
+        return {
+            "marketCap": rng.randint(1, 3000) * 10**9,
+            "trailingPE": round(rng.uniform(5, 120), 2),
+            "profitMargins": round(rng.uniform(-0.1, 0.45), 4),
+            "debtToEquity": round(rng.uniform(0, 250), 2),
+            "sector": rng.choice(SECTORS),
+        }
+
+
+# --- NEWS (DuckDuckGo) ---
+class FakeDDGS:
+    """Drop-in for ddgs.DDGS / duckduckgo_search.DDGS: canned headlines derived from the query."""
+    latency = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def text(self, query: str, max_results: int = 5, **kwargs) -> list:
+        if self.latency:
+            time.sleep(self.latency)
+        rng = random.Random(seed_for("news", query))
+        topic = query.split()[0] if query.split() else "Market"
+        return [
+            {
+                "title": f"{topic} {rng.choice(['beats', 'misses', 'guides up', 'faces probe', 'expands'])} "
+                         f"amid {rng.choice(['tariff talk', 'rate cut bets', 'supply checks', 'sector rotation'])}",
+                "href": f"https://news.example.com/{seed_for(query, i)}",
+                "body": "Synthetic article body for offline benchmarking.",
+            }
+            for i in range(max_results)
+        ]
+
+
+# --- LLM (Groq) ---
+def canned_completion(prompt: str) -> str:
+    """Valid JSON in the shape each council prompt asks for, varied by prompt content."""
+    rng = random.Random(seed_for("llm", prompt))
+    if "final_confidence" in prompt:
+        return json.dumps({"final_thesis": "Thesis holds after the risk audit.",
+                           "final_confidence": rng.randint(40, 90)})
+    if "risk_score" in prompt:
+        return json.dumps({"risk_score": rng.randint(5, 70),
+                           "risk_critique_tech": "Momentum is stretched versus the 20-day average.",
+                           "risk_critique_fund": "Valuation leaves little room for a miss."})
+    return json.dumps({"thesis": "Trend and valuation are constructive.",
+                       "confidence": rng.randint(45, 90), "signal": "BUY"})
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model with configurable latency; goes through LangChain's cache and rate limiter hooks."""
+    model_name: str = "fake-council-llm"
+    latency: float = 0.05
+    jitter: float = 0.5  # Each call takes latency * uniform(1 - jitter, 1 + jitter)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-council"
+
+    def _delay(self, prompt: str) -> float:
+        rng = random.Random(seed_for("latency", prompt, time.perf_counter_ns()))
+        return max(0.0, self.latency * rng.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def _result(self, messages) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        content = canned_completion(prompt)
+        usage = {"input_tokens": len(prompt) // 4, "output_tokens": len(content) // 4,
+                 "total_tokens": len(prompt) // 4 + len(content) // 4}
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content, usage_metadata=usage))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        time.sleep(self._delay(str(messages[0].content)))
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self._delay(str(messages[0].content)))
+        return self._result(messages)
+
+
+# --- WIRING ---
+def install_data_fakes(latency: float = 0.0, news_latency: float = 0.0) -> FakeMarketData:
+    """Points the nexus caches and news tools at the fakes (used in-process and by the fake MCP server)."""
+    from nexus.cache import fundamentals, history
+    import nexus.servers.tools as tools
+
+    market = FakeMarketData(latency)
+    history.history_cache.fetcher = market.history
+    history.history_cache.bulk_fetcher = market.bulk_history
+    fundamentals.fundamentals_cache.fetcher = market.info
+    FakeDDGS.latency = news_latency
+    tools.DDGS = FakeDDGS
+    try:
+        import nexus.servers.finance_server as finance_server
+        finance_server.DDGS = FakeDDGS
+    except ImportError:
+        pass
+    return market
+
+
+def install_llm_fake(latency: float = 0.05, jitter: float = 0.5) -> FakeChatModel:
+    """Replaces the Groq model the nodes use with FakeChatModel on the shared cache and scheduler."""
+    import agent.nodes as nodes
+    from agent.llm_cache import get_llm_cache
+    from agent.llm_scheduler import llm_scheduler
+
+    llm = FakeChatModel(latency=latency, jitter=jitter, cache=get_llm_cache(), rate_limiter=llm_scheduler)
+    nodes.get_llm = lambda: llm
+    return llm
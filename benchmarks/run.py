@@ -0,0 +1,231 @@
+# benchmarks/run.py
+"""
+Offline benchmark for the council: no Yahoo, no DuckDuckGo, no Groq.
+
+Runs the real agent.graph app and the real FastAPI /analyze endpoint against
+the deterministic fakes in benchmarks/fakes.py and reports throughput plus
+p50/p95/p99 latency per stage. Stages come from the spans in agent/tracing.py
+(graph nodes, MCP calls, news passes, LLM calls).
+
+    python -m benchmarks.run                                  # both targets, 20 runs each
+    python -m benchmarks.run --target graph --runs 100 --concurrency 8
+    python -m benchmarks.run --llm-latency 0.4 --rpm 30      # see the scheduler throttle
+    python -m benchmarks.run --json bench.json                # machine-readable, for CI
+    python -m benchmarks.run --cassette prod.json.gz          # replay real-shaped data (agent/cassette.py)
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+FAKE_SERVER_PATH = os.path.join(ROOT_DIR, "benchmarks", "fake_finance_server.py")
+STAGE_ORDER = ["request", "node", "mcp", "news", "llm"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline Alpha Council benchmark")
+    parser.add_argument("--target", choices=["graph", "api", "all"], default="all")
+    parser.add_argument("--runs", type=int, default=20, help="Measured runs per target")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured runs first (spawns MCP sessions)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--tickers", type=int, default=0,
+                        help="Size of the ticker universe (0 = a fresh ticker per run, so every run is cold)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Mean fake LLM latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.5, help="LLM latency spread, as a fraction of the mean")
+    parser.add_argument("--data-latency", type=float, default=0.0, help="Fake yfinance latency per fetch (s)")
+    parser.add_argument("--news-latency", type=float, default=0.0, help="Fake DuckDuckGo latency per search (s)")
+    parser.add_argument("--transport", choices=["mcp", "inprocess"], default="mcp",
+                        help="Tool transport (TOOL_TRANSPORT): stdio MCP sessions or direct registry calls")
+    parser.add_argument("--news-rate", type=float, default=1000.0,
+                        help="Shared DuckDuckGo limiter rate, calls/s (NEWS_RATE; production default is 1)")
+    parser.add_argument("--yahoo-rate", type=float, default=1000.0,
+                        help="Shared Yahoo limiter rate, calls/s (YAHOO_RATE; production default is 4)")
+    parser.add_argument("--risk-news", choices=["sequential", "speculative"], default="sequential",
+                        help="How the risk manager runs its news relaxation passes (RISK_NEWS_MODE)")
+    parser.add_argument("--rpm", type=float, default=0, help="LLM scheduler requests/min (0 = unlimited)")
+    parser.add_argument("--tpm", type=float, default=0, help="LLM scheduler tokens/min (0 = unlimited)")
+    parser.add_argument("--llm-cache", action="store_true", help="Keep the LLM response cache on")
+    parser.add_argument("--cassette", help="Replay this recorded cassette instead of the synthetic data "
+                                           "(tickers come from the cassette)")
+    parser.add_argument("--cassette-latency", type=float, default=0.0,
+                        help="Replay at this fraction of the recorded latencies (0 = instant)")
+    parser.add_argument("--cache-dir", help="NEXUS_CACHE_DIR to use (default: a fresh temp dir)")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the agents' progress prints")
+    return parser.parse_args(argv)
+
+
+def configure_env(args):
+    # Must run before agent/* and nexus/* are imported: they read their config at import time
+    os.environ["NEXUS_CACHE_DIR"] = args.cache_dir or tempfile.mkdtemp(prefix="council-bench-")
+    os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+    os.environ["TOOL_TRANSPORT"] = args.transport
+    os.environ["NEWS_RATE"] = os.environ["NEWS_BURST"] = str(args.news_rate)
+    os.environ["YAHOO_RATE"] = os.environ["YAHOO_BURST"] = str(args.yahoo_rate)
+    os.environ["RISK_NEWS_MODE"] = args.risk_news
+    os.environ["LLM_RPM"] = str(args.rpm)
+    os.environ["LLM_TPM"] = str(args.tpm)
+    os.environ["LLM_CACHE"] = "1" if args.llm_cache else "0"
+    os.environ["BENCH_DATA_LATENCY"] = str(args.data_latency)  # Read by the fake MCP server
+    os.environ["BENCH_NEWS_LATENCY"] = str(args.news_latency)
+    if args.cassette:
+        os.environ["CASSETTE_MODE"] = "replay"
+        os.environ["CASSETTE_PATH"] = os.path.abspath(args.cassette)
+        os.environ["CASSETTE_LATENCY_SCALE"] = str(args.cassette_latency)
+
+
+def install_fakes(args):
+    import agent.mcp_pool as mcp_pool
+    import agent.nodes as nodes
+    from benchmarks.fakes import install_data_fakes, install_llm_fake
+
+    install_data_fakes(args.data_latency, args.news_latency)
+    install_llm_fake(args.llm_latency, args.jitter)
+    # Real MCP sessions, fake data behind them
+    mcp_pool.SERVER_PATH = FAKE_SERVER_PATH
+    nodes.SERVER_PATH = FAKE_SERVER_PATH
+
+
+def ticker_list(prefix: str, count: int, universe: int) -> list:
+    from agent.cassette import cassette
+    if cassette.mode == "replay":
+        # Only recorded tickers can be replayed; the API target serves repeats from the debate cache
+        recorded = cassette.tickers()
+        if not recorded:
+            raise SystemExit(f"❌ No recorded tool calls in {cassette.path}")
+        return [recorded[i % len(recorded)] for i in range(count)]
+    if universe <= 0:
+        return [f"{prefix}{i:04d}" for i in range(count)]
+    return [f"{prefix}{i % universe:04d}" for i in range(count)]
+
+
+# --- TARGETS ---
+async def bench_graph(args, tickers: list):
+    from agent.graph import app as graph
+    from agent.tracing import span, start_trace
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(ticker):
+        async with semaphore:
+            trace = start_trace()  # gather() runs each in its own task, so traces don't mix
+            with span("request", "graph"):
+                await graph.ainvoke({"ticker": ticker, "messages": [],
+                                     "user_style": "investor", "risk_profile": "moderate"})
+            return trace
+
+    start = time.perf_counter()
+    traces = await asyncio.gather(*(one(t) for t in tickers))
+    return time.perf_counter() - start, traces
+
+
+async def bench_api(args, tickers: list):
+    import httpx
+    import main
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def one(ticker):
+            async with semaphore:
+                start = time.perf_counter()
+                resp = await client.post("/analyze", json={"ticker": ticker, "timings": True})
+                resp.raise_for_status()
+                elapsed = (time.perf_counter() - start) * 1000
+                spans = resp.json()["timings"]["spans"]
+                # Client-side latency includes routing, validation and JSON encoding
+                return spans + [{"kind": "request", "name": "http", "ms": round(elapsed, 2)}]
+
+        start = time.perf_counter()
+        traces = await asyncio.gather(*(one(t) for t in tickers))
+        return time.perf_counter() - start, traces
+
+
+TARGETS = {"graph": ("G", bench_graph), "api": ("A", bench_api)}
+
+
+# --- REPORTING ---
+def stage_stats(traces: list) -> dict:
+    samples = {}
+    for trace in traces:
+        for s in trace:
+            samples.setdefault(f"{s['kind']}:{s['name']}", []).append(s["ms"])
+
+    def order(stage):
+        kind = stage.split(":", 1)[0]
+        return (STAGE_ORDER.index(kind) if kind in STAGE_ORDER else len(STAGE_ORDER), stage)
+
+    out = {}
+    for stage in sorted(samples, key=order):
+        values = np.asarray(samples[stage])
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        out[stage] = {"count": int(values.size), "mean": round(float(values.mean()), 2),
+                      "p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2)}
+    return out
+
+
+def print_report(name: str, result: dict):
+    print(f"\n== {name}: {result['runs']} runs, concurrency {result['concurrency']}, "
+          f"{result['wall_s']:.2f}s wall, {result['throughput_rps']:.2f} runs/s ==")
+    print(f"{'stage':<36}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, s in result["stages"].items():
+        print(f"{stage:<36}{s['count']:>7}{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}")
+
+
+async def run_benchmarks(args) -> dict:
+    results = {}
+    targets = ["graph", "api"] if args.target == "all" else [args.target]
+    for name in targets:
+        prefix, bench = TARGETS[name]
+        if args.warmup:
+            await bench(args, ticker_list(f"W{prefix}", args.warmup, 0))
+        wall, traces = await bench(args, ticker_list(prefix, args.runs, args.tickers))
+        results[name] = {
+            "runs": args.runs,
+            "concurrency": args.concurrency,
+            "wall_s": round(wall, 3),
+            "throughput_rps": round(args.runs / wall, 3) if wall else 0.0,
+            "stages": stage_stats(traces),
+        }
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_env(args)
+    install_fakes(args)
+
+    print(f"🏎️ Offline benchmark (cache dir {os.environ['NEXUS_CACHE_DIR']})")
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    if not args.verbose:
+        logging.getLogger("httpx").setLevel(logging.WARNING)  # One line per /analyze call otherwise
+    with quiet:
+        results = asyncio.run(run_benchmarks(args))
+
+    for name, result in results.items():
+        print_report(name, result)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+        print(f"\n💾 Results written to {args.json_path}")
+
+    from agent.mcp_pool import get_pool
+    get_pool().close()
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
+import asyncio
+import json
 import os
+from typing import List, Optional
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 # Import your graph logic
-from agent.graph import app as graph
+from agent.council import analyze, format_result, run_council, stream_council
+from agent.tracing import render_metrics, span, start_trace, summarize
+from agent.debate import score_all_profiles
+from agent.screener import SCREEN_TOP_N, ascreen, escalate
+from nexus.cache.history import prefetch_history
+from nexus.indicators.screen import load_rules, merge_rules
 
 load_dotenv()
 
@@ -26,6 +35,8 @@ class AnalysisRequest(BaseModel):
     ticker: str
     user_style: str = "investor"
     risk_profile: str = "moderate"
+    all_profiles: bool = False  # Also return the verdict for every style/risk combination
+    timings: bool = False  # Also return where this request spent its time (see agent/tracing.py)
 
 @app.get("/")
 def read_root():
@@ -39,44 +50,163 @@ async def run_analysis(request: AnalysisRequest):
 
     print(f"🔥 Incoming Request: {request.ticker} ({request.user_style}/{request.risk_profile})")
 
-    # Initialize the state EXACTLY how your agents expect it
-    initial_state = {
-        "ticker": request.ticker,
-        "messages": [],
-        "user_style": request.user_style,
-        "risk_profile": request.risk_profile
-    }
-
+    trace = start_trace() if request.timings else None
     try:
-        # Run the Agents
-        result = await graph.ainvoke(initial_state)
+        # Run the Agents (or join an identical run already in flight)
+        with span("request", "analyze"):
+            result = await run_council(request.ticker, request.user_style, request.risk_profile)
 
         # Send the JSON back to Lovable
-        return {
-            "ticker": request.ticker,
-            "final_verdict": {
-                "signal": result.get("final_signal", "HOLD"),
-                "confidence": result.get("final_confidence", 0),
-                "explanation": result.get("final_explanation", "")
-            },
-            "technical_analysis": {
-                "thesis": result.get("tech_thesis_final", ""),
-                "confidence": result.get("tech_confidence_final", 0)
-            },
-            "fundamental_analysis": {
-                "thesis": result.get("fund_thesis_final", ""),
-                "confidence": result.get("fund_confidence_final", 0)
-            },
-            "risk_analysis": {
-                "score": result.get("risk_danger_score", 0),
-                "critique": result.get("risk_critique_tech", "")
-            }
-        }
+        response = format_result(request.ticker, result)
+        if request.all_profiles:
+            response["profiles"] = score_all_profiles(result)
+        if trace is not None:
+            # A cached or joined debate has no council spans of its own, only the request span
+            response["timings"] = summarize(trace)
+        return response
     
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text format: span histograms plus LLM call/token counters
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# --- BATCH ---
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "50"))
+
+class BatchAnalysisRequest(BaseModel):
+    analyses: List[AnalysisRequest]
+    max_concurrency: Optional[int] = None  # Defaults to BATCH_CONCURRENCY
+
+@app.post("/analyze/batch")
+async def run_batch_analysis(request: BatchAnalysisRequest):
+    """Runs many councils, streaming one NDJSON line per ticker as soon as it finishes."""
+    if not os.getenv("GROQ_API_KEY"):
+        raise HTTPException(status_code=500, detail="GROQ_API_KEY missing")
+    if not request.analyses:
+        raise HTTPException(status_code=400, detail="analyses is empty")
+    if len(request.analyses) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_ITEMS} analyses per batch")
+
+    limit = max(1, min(request.max_concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY))
+    tickers = [a.ticker for a in request.analyses]
+    print(f"🔥 Incoming Batch: {len(tickers)} analyses (concurrency {limit})")
+
+    # One bulk download seeds the shared history cache the tech tools read from
+    try:
+        await asyncio.to_thread(prefetch_history, tickers)
+    except Exception as e:
+        print(f"⚠️ Bulk prefetch failed, tools will fetch per ticker: {e}")
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run_one(item: AnalysisRequest) -> dict:
+        async with semaphore:
+            try:
+                result = await run_council(item.ticker, item.user_style, item.risk_profile)
+                response = format_result(item.ticker, result)
+                if item.all_profiles:
+                    response["profiles"] = score_all_profiles(result)
+                return response
+            except Exception as e:
+                print(f"❌ Error ({item.ticker}): {str(e)}")
+                return {"ticker": item.ticker, "error": str(e)}
+
+    async def stream():
+        tasks = [asyncio.create_task(run_one(item)) for item in request.analyses]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()  # Client went away: stop the remaining councils
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+# --- SCREENER ---
+SCREEN_MAX_TICKERS = int(os.environ.get("SCREEN_MAX_TICKERS", "5000"))
+
+class ScreenRequest(BaseModel):
+    tickers: List[str]
+    top_n: int = SCREEN_TOP_N
+    rules: Optional[dict] = None  # Overrides on top of SCREEN_RULES (default: screen.py DEFAULT_RULES)
+    escalate: bool = True  # Run the full council for the top_n tickers
+    user_style: str = "investor"
+    risk_profile: str = "moderate"
+
+@app.post("/screen")
+async def run_screen(request: ScreenRequest):
+    """Ranks a whole universe with cheap vectorized math; only the top_n reach the LLM council."""
+    if not request.tickers:
+        raise HTTPException(status_code=400, detail="tickers is empty")
+    if len(request.tickers) > SCREEN_MAX_TICKERS:
+        raise HTTPException(status_code=400, detail=f"At most {SCREEN_MAX_TICKERS} tickers per screen")
+    if request.escalate and not os.getenv("GROQ_API_KEY"):
+        raise HTTPException(status_code=500, detail="GROQ_API_KEY missing")
+    if request.top_n < 1:
+        raise HTTPException(status_code=400, detail="top_n must be at least 1")
+    try:
+        # Same configured rules as the CLI; the request only overrides what it names
+        rules = merge_rules(request.rules, base=load_rules())
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid screen rules: {e}")
+
+    print(f"🔎 Incoming Screen: {len(request.tickers)} tickers, top {request.top_n}")
+    result = await ascreen(request.tickers, rules, request.top_n)
+
+    if request.escalate and result["top"]:
+        async def council(ticker):
+            return await analyze(ticker, request.user_style, request.risk_profile)
+        result["council"] = await escalate(result["top"], council, BATCH_CONCURRENCY)
+    return result
+
+# --- STREAMING (SSE) ---
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def analysis_events(request: AnalysisRequest):
+    state = {}
+    try:
+        async for node, update in stream_council(request.ticker, request.user_style, request.risk_profile):
+            state.update(update)
+            yield sse(node, update)
+
+        result = {**state, "user_style": request.user_style, "risk_profile": request.risk_profile}
+        response = format_result(request.ticker, result)
+        if request.all_profiles:
+            response["profiles"] = score_all_profiles(result)
+        yield sse("result", response)
+    except Exception as e:
+        print(f"❌ Stream Error ({request.ticker}): {str(e)}")
+        yield sse("error", {"ticker": request.ticker, "detail": str(e)})
+
+def stream_response(request: AnalysisRequest) -> StreamingResponse:
+    if not os.getenv("GROQ_API_KEY"):
+        raise HTTPException(status_code=500, detail="GROQ_API_KEY missing")
+    print(f"🔥 Incoming Stream: {request.ticker} ({request.user_style}/{request.risk_profile})")
+    return StreamingResponse(
+        analysis_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # Don't let proxies buffer events
+    )
+
+@app.post("/analyze/stream")
+async def run_analysis_stream(request: AnalysisRequest):
+    """Same council as /analyze, but each node's output is sent as an SSE event the moment it finishes."""
+    return stream_response(request)
+
+@app.get("/analyze/stream")
+async def run_analysis_stream_get(ticker: str, user_style: str = "investor",
+                                  risk_profile: str = "moderate", all_profiles: bool = False):
+    # EventSource in the browser can only GET
+    return stream_response(AnalysisRequest(
+        ticker=ticker, user_style=user_style, risk_profile=risk_profile, all_profiles=all_profiles
+    ))
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 10000))
     uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+Local caches that sit between the Nexus tools and their remote data sources
+(Yahoo Finance, DuckDuckGo), so repeated analyses skip the network.
+"""
+import os
+
+# Every cache persists under one directory (override with NEXUS_CACHE_DIR)
+CACHE_DIR = os.environ.get(
+    "NEXUS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+)
@@ -0,0 +1,153 @@
+"""
+Fundamentals snapshot cache for yfinance `Ticker.info`.
+
+`info` is slow (several Yahoo endpoints) and the handful of fields we use change
+at most daily, so each ticker gets a compact snapshot of just those fields, stored
+in memory and as one small JSON file per ticker. Reads are stale-while-revalidate:
+a snapshot with stale fields is returned immediately while a background thread
+refreshes it. Only a cold or expired ticker waits on Yahoo.
+"""
+import json
+import os
+import threading
+import time
+
+from . import CACHE_DIR
+from .ratelimit import yahoo_limiter
+
+# Per-field staleness (seconds): price-driven ratios drift intraday, the rest move
+# with quarterly filings, and the sector practically never changes.
+FIELD_TTL = {
+    "marketCap": 15 * 60,
+    "trailingPE": 15 * 60,
+    "profitMargins": 24 * 3600,
+    "debtToEquity": 24 * 3600,
+    "sector": 30 * 24 * 3600,
+}
+FIELDS = list(FIELD_TTL)
+
+# Beyond this age a snapshot is not served at all and the caller waits for a fetch
+MAX_AGE = float(os.environ.get("FUNDAMENTALS_MAX_AGE", str(3 * 24 * 3600)))
+
+
+def yahoo_info(ticker: str) -> dict:
+    """Default remote source: the full yfinance info dict (under the shared Yahoo budget)."""
+    import yfinance as yf
+    return yahoo_limiter.call(lambda: yf.Ticker(ticker).info)
+
+
+class FundamentalsCache:
+    def __init__(self, cache_dir: str = CACHE_DIR, field_ttl: dict = None,
+                 max_age: float = MAX_AGE, fetcher=yahoo_info):
+        self.cache_dir = os.path.join(cache_dir, "fundamentals")
+        self.field_ttl = field_ttl or FIELD_TTL
+        self.max_age = max_age
+        self.fetcher = fetcher
+        self._snapshots = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # --- PUBLIC API ---
+    def get(self, ticker: str) -> dict:
+        """Returns {field: value} for FIELDS (missing fields are omitted)."""
+        ticker = ticker.upper().strip()
+        with self._lock:
+            snap = self._snapshots.get(ticker) or self._load(ticker)
+
+        now = time.time()
+        if snap is None or now - max(snap["fetched_at"].values(), default=0) > self.max_age:
+            self.misses += 1
+            snap = self._fetch(ticker, snap)
+        else:
+            self.hits += 1
+            if self._stale_fields(snap, now):
+                self.refresh_async(ticker)
+        return dict(snap["values"])
+
+    def refresh_async(self, ticker: str):
+        """Stale-while-revalidate: refresh in the background, at most once per ticker at a time."""
+        ticker = ticker.upper().strip()
+        with self._lock:
+            if ticker in self._refreshing:
+                return
+            self._refreshing.add(ticker)
+        threading.Thread(target=self._background_refresh, args=(ticker,), daemon=True).start()
+
+    # --- INTERNALS ---
+    def _expired(self, snap: dict, field: str, now: float) -> bool:
+        return now - snap["fetched_at"].get(field, 0) > self.field_ttl.get(field, 24 * 3600)
+
+    def _stale_fields(self, snap: dict, now: float) -> list:
+        return [f for f in FIELDS if self._expired(snap, f, now)]
+
+    def _background_refresh(self, ticker: str):
+        try:
+            with self._lock:
+                snap = self._snapshots.get(ticker)
+            self._fetch(ticker, snap)
+        except Exception:
+            pass  # Keep serving the old snapshot; the next read retries
+        finally:
+            with self._lock:
+                self._refreshing.discard(ticker)
+
+    def _fetch(self, ticker: str, previous: dict = None) -> dict:
+        info = self.fetcher(ticker) or {}
+        now = time.time()
+        snap = {
+            "values": dict(previous["values"]) if previous else {},
+            "fetched_at": dict(previous["fetched_at"]) if previous else {},
+            "missing": list(previous.get("missing", [])) if previous else [],
+        }
+        missing = set(snap["missing"])
+        if info:
+            for f in FIELDS:
+                if info.get(f) is not None:
+                    snap["values"][f] = info[f]
+                    missing.discard(f)
+                    snap["fetched_at"][f] = now
+                elif f in snap["values"] and not self._expired(snap, f, now):
+                    continue  # Omitted this time, but the old value is still within its TTL
+                else:
+                    # Gone for good as far as we know, e.g. no trailingPE once a company loses money,
+                    # no D/E for banks. Stamped anyway, so the gap itself is not refetched on every read.
+                    snap["values"].pop(f, None)
+                    missing.add(f)
+                    snap["fetched_at"][f] = now
+        if not snap["fetched_at"]:
+            snap["fetched_at"] = {f: now for f in FIELDS}  # Remember "nothing to know" too
+        snap["missing"] = sorted(missing)
+        with self._lock:
+            self._snapshots[ticker] = snap
+            self._save(ticker, snap)
+        return snap
+
+    def _path(self, ticker: str) -> str:
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in ticker)
+        return os.path.join(self.cache_dir, f"{safe}.json")
+
+    def _save(self, ticker: str, snap: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self._path(ticker) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snap, f, separators=(",", ":"))
+        os.replace(tmp, self._path(ticker))
+
+    def _load(self, ticker: str):
+        try:
+            with open(self._path(ticker), encoding="utf-8") as f:
+                snap = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._snapshots[ticker] = snap
+        return snap
+
+
+# Global instance shared by tools.py and finance_server.py
+fundamentals_cache = FundamentalsCache()
+
+
+def get_fundamentals_snapshot(ticker: str) -> dict:
+    return fundamentals_cache.get(ticker)
@@ -0,0 +1,302 @@
+"""
+Shared OHLCV price-history cache.
+
+Layers, fastest first:
+1. In-memory LRU of full frames per (ticker, interval), fresh per a market-hours-aware TTL.
+2. On-disk columnar store: one .npz per (ticker, interval) holding each column as a NumPy array.
+3. Yahoo Finance, asked only for bars newer than the last cached one (incremental top-up),
+   or for a full period when the cache does not reach back far enough. Bars are split and
+   dividend adjusted, so a top-up whose overlapping bar no longer matches the cached close
+   means Yahoo re-based the history: the whole period is fetched again instead.
+
+Concurrent callers for the same stale ticker share one refresh, and disk reads and
+writes happen outside the cache-wide lock.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from . import CACHE_DIR
+from .market import MARKET_TZ, is_market_open, last_close, market_now
+from .ratelimit import yahoo_limiter
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# TTL while the market is open; once closed, a frame fetched after the close stays fresh until the next open
+TTL_OPEN = float(os.environ.get("HISTORY_TTL_OPEN", "60"))
+ADJUST_RTOL = 1e-5  # Relative close difference on an overlapping bar that means the history was re-adjusted
+MAX_ENTRIES = int(os.environ.get("HISTORY_CACHE_SIZE", "256"))
+
+PERIODS = {
+    "1d": timedelta(days=1), "5d": timedelta(days=5),
+    "1mo": timedelta(days=31), "3mo": timedelta(days=92), "6mo": timedelta(days=183),
+    "1y": timedelta(days=366), "2y": timedelta(days=731), "5y": timedelta(days=1827),
+    "10y": timedelta(days=3653),
+}
+
+
+def period_start(period: str, now: datetime = None) -> datetime:
+    """Earliest timestamp a yfinance-style period string asks for (None for 'max')."""
+    now = now or market_now()
+    if period == "max":
+        return None
+    if period == "ytd":
+        return datetime(now.year, 1, 1, tzinfo=MARKET_TZ)
+    if period not in PERIODS:
+        raise ValueError(f"Unsupported period '{period}'.")
+    return now - PERIODS[period]
+
+
+def yahoo_fetcher(ticker: str, interval: str, period: str = None, start: datetime = None) -> pd.DataFrame:
+    """Default remote source: a single yfinance history call (under the shared Yahoo budget)."""
+    import yfinance as yf
+    stock = yf.Ticker(ticker)
+    if start is not None:
+        return yahoo_limiter.call(stock.history, start=start.strftime("%Y-%m-%d"), interval=interval)
+    return yahoo_limiter.call(stock.history, period=period, interval=interval)
+
+
+def yahoo_bulk_fetcher(tickers: list, interval: str, period: str) -> dict:
+    """Default bulk source: one yf.download for every ticker, split into per-ticker frames."""
+    import yfinance as yf
+    frame = yahoo_limiter.call(yf.download, tickers, period=period, interval=interval, group_by="ticker",
+                               progress=False, threads=True, ignore_tz=False, multi_level_index=True)
+    out = {}
+    if frame is None or frame.empty:
+        return out
+    for ticker in tickers:
+        if ticker in frame.columns.get_level_values(0):
+            out[ticker] = frame[ticker].dropna(how="all")
+    return out
+
+
+class _Entry:
+    __slots__ = ("frame", "fetched_at", "covered_from")
+
+    def __init__(self, frame, fetched_at, covered_from):
+        self.frame = frame
+        self.fetched_at = fetched_at          # epoch seconds of the last remote fetch
+        self.covered_from = covered_from      # earliest start requested (None = 'max')
+
+
+class HistoryCache:
+    def __init__(self, cache_dir: str = CACHE_DIR, max_entries: int = MAX_ENTRIES,
+                 ttl_open: float = TTL_OPEN, fetcher=yahoo_fetcher, bulk_fetcher=yahoo_bulk_fetcher):
+        self.cache_dir = os.path.join(cache_dir, "history")
+        self.max_entries = max_entries
+        self.ttl_open = ttl_open
+        self.fetcher = fetcher
+        self.bulk_fetcher = bulk_fetcher
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()  # Guards the LRU and counters; never held across I/O
+        self._key_locks = {}           # (ticker, interval) -> lock held by the one caller refreshing it
+        self.hits = 0
+        self.misses = 0
+
+    # --- PUBLIC API ---
+    def get(self, ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """Returns a copy of the OHLCV frame for `period`, hitting the network only when stale."""
+        ticker = ticker.upper().strip()
+        key = (ticker, interval)
+        now = market_now()
+        start = period_start(period, now)
+
+        entry = self._lookup(key, now)
+        if not self._answers(entry, start, now):
+            # Singleflight: one caller refreshes a stale key, the rest wait and reuse its result
+            with self._key_lock(key):
+                entry = self._lookup(key, now)
+                if not self._answers(entry, start, now):
+                    with self._lock:
+                        self.misses += 1
+                    entry = self._refresh(ticker, interval, period, start, entry)
+                    with self._lock:
+                        self._remember(key, entry)
+                    self._save(key, entry)
+                    return self._slice(entry.frame, start)
+        with self._lock:
+            self.hits += 1
+        return self._slice(entry.frame, start)
+
+    def is_cached(self, ticker: str, period: str = "1y", interval: str = "1d") -> bool:
+        """True when get() would be answered without touching the network."""
+        now = market_now()
+        return self._answers(self._lookup((ticker.upper().strip(), interval), now), period_start(period, now), now)
+
+    def prefetch(self, tickers: list, period: str = "1y", interval: str = "1d") -> list:
+        """Loads every stale ticker with ONE bulk download. Returns the tickers now cached."""
+        tickers = list(dict.fromkeys(t.upper().strip() for t in tickers))
+        missing = [t for t in tickers if not self.is_cached(t, period, interval)]
+        if missing:
+            start = period_start(period)
+            for ticker, frame in self.bulk_fetcher(missing, interval, period).items():
+                if frame is not None and not frame.empty:
+                    self.put(ticker, interval, frame, covered_from=start)
+        return [t for t in tickers if self.is_cached(t, period, interval)]
+
+    def put(self, ticker: str, interval: str, frame: pd.DataFrame, covered_from: datetime = None):
+        """Seeds the cache with an externally fetched frame (e.g. one bulk yf.download)."""
+        key = (ticker.upper().strip(), interval)
+        entry = _Entry(self._normalize(frame), time.time(), covered_from)
+        with self._lock:
+            self._remember(key, entry)
+        self._save(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+    # --- FRESHNESS ---
+    def _covers(self, entry: _Entry, start: datetime) -> bool:
+        if entry.covered_from is None:
+            return True
+        return start is not None and entry.covered_from <= start
+
+    def _is_fresh(self, entry: _Entry, now: datetime) -> bool:
+        if is_market_open(now):
+            return time.time() - entry.fetched_at < self.ttl_open
+        # Closed: nothing new can print until the next open
+        return entry.fetched_at >= last_close(now).timestamp()
+
+    def _answers(self, entry, start: datetime, now: datetime) -> bool:
+        """True when the entry serves `start` without a fetch."""
+        return entry is not None and self._covers(entry, start) and self._is_fresh(entry, now)
+
+    def _lookup(self, key, now: datetime):
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None and self._is_fresh(entry, now):
+                self._remember(key, entry)
+                return entry
+        # Another process (e.g. a batch prefetch) may have refreshed the disk store; read it unlocked
+        on_disk = self._load(key)
+        with self._lock:
+            entry = self._lru.get(key)  # May have been refreshed while we read
+            if on_disk is not None and (entry is None or on_disk.fetched_at > entry.fetched_at):
+                entry = on_disk
+            if entry is not None:
+                self._remember(key, entry)
+            return entry
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    # --- REMOTE ---
+    def _refresh(self, ticker, interval, period, start, entry):
+        if entry is not None and len(entry.frame) > 1 and self._covers(entry, start):
+            # Incremental top-up from the second-to-last cached bar: the last one may have been
+            # partial, the one before is complete and must come back unchanged
+            cached = entry.frame
+            fresh = self._normalize(self.fetcher(ticker, interval, start=cached.index[-2].to_pydatetime()))
+            if fresh.empty:
+                return _Entry(cached, time.time(), entry.covered_from)
+            if self._same_basis(cached.iloc[:-1], fresh):
+                merged = pd.concat([cached[cached.index < fresh.index[0]], fresh])
+                return _Entry(merged, time.time(), entry.covered_from)
+            # A split or dividend re-based every adjusted bar: old and new bars no longer mix
+
+        frame = self._normalize(self.fetcher(ticker, interval, period=period))
+        return _Entry(frame, time.time(), start)
+
+    @staticmethod
+    def _same_basis(cached: pd.DataFrame, fresh: pd.DataFrame) -> bool:
+        overlap = cached.index.intersection(fresh.index)
+        if overlap.empty:
+            return False  # Nothing to check against: refetch rather than guess
+        old = cached.loc[overlap, "Close"].to_numpy(dtype="float64")
+        new = fresh.loc[overlap, "Close"].to_numpy(dtype="float64")
+        return bool(np.allclose(old, new, rtol=ADJUST_RTOL, atol=0.0, equal_nan=True))
+
+    # --- LRU ---
+    def _remember(self, key, entry):
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    # --- DISK (columnar .npz) ---
+    def _path(self, key) -> str:
+        ticker, interval = key
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in ticker)
+        return os.path.join(self.cache_dir, f"{safe}_{interval}.npz")
+
+    def _save(self, key, entry: _Entry):
+        if entry.frame.empty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        frame = entry.frame
+        # Unique per writer: saves of one key may overlap now that they run outside the lock
+        tmp = self._path(key) + f".{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez(
+            tmp,
+            index=self._utc_index(frame.index).as_unit("ns").asi8,
+            tz=np.array(str(frame.index.tz or "")),
+            fetched_at=np.array(entry.fetched_at),
+            covered_from=np.array(entry.covered_from.timestamp() if entry.covered_from else np.nan),
+            **{col: self._column(frame[col]) for col in COLUMNS}
+        )
+        os.replace(tmp, self._path(key))
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                tz = str(data["tz"])
+                index = pd.to_datetime(data["index"], utc=bool(tz))
+                if tz:
+                    index = index.tz_convert(tz)
+                frame = pd.DataFrame({col: data[col] for col in COLUMNS}, index=index)
+                covered = float(data["covered_from"])
+                covered_from = None if np.isnan(covered) else datetime.fromtimestamp(covered, MARKET_TZ)
+                entry = _Entry(frame, float(data["fetched_at"]), covered_from)
+        except Exception:
+            return None  # A corrupt file is just a cache miss
+        return entry
+
+    # --- HELPERS ---
+    @staticmethod
+    def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+        if frame is None or frame.empty:
+            return pd.DataFrame(columns=COLUMNS)
+        frame = frame[[c for c in COLUMNS if c in frame.columns]].copy()
+        frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+        if isinstance(frame.index, pd.DatetimeIndex) and frame.index.tz is None:
+            frame.index = frame.index.tz_localize(MARKET_TZ)  # Bulk downloads may come back naive
+        return frame
+
+    @staticmethod
+    def _column(series: pd.Series) -> np.ndarray:
+        # Keep Volume integral; anything non-numeric is stored as float
+        return series.to_numpy(dtype=series.dtype if series.dtype.kind in "if" else "float64")
+
+    @staticmethod
+    def _utc_index(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        return index.tz_convert("UTC") if index.tz is not None else index
+
+    @staticmethod
+    def _slice(frame: pd.DataFrame, start: datetime) -> pd.DataFrame:
+        if start is None or frame.empty:
+            return frame.copy()
+        if frame.index.tz is None:
+            start = start.replace(tzinfo=None)
+        return frame[frame.index >= start].copy()
+
+
+# Global instance shared by tools.py and finance_server.py
+history_cache = HistoryCache()
+
+
+def get_history(ticker: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+    return history_cache.get(ticker, period=period, interval=interval)
+
+
+def prefetch_history(tickers: list, period: str = "1y", interval: str = "1d") -> list:
+    return history_cache.prefetch(tickers, period=period, interval=interval)
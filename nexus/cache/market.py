@@ -0,0 +1,40 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+# US equities session (exchange holidays are treated as normal weekdays)
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+
+def market_now() -> datetime:
+    return datetime.now(MARKET_TZ)
+
+
+def is_market_open(now: datetime = None) -> bool:
+    """True during the regular Mon-Fri 09:30-16:00 New York session."""
+    now = (now or market_now()).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def last_close(now: datetime = None) -> datetime:
+    """The most recent session close at or before `now`."""
+    now = (now or market_now()).astimezone(MARKET_TZ)
+    day = now.date()
+    if now.time() < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return datetime.combine(day, MARKET_CLOSE, tzinfo=MARKET_TZ)
+
+
+def trading_date(now: datetime = None) -> str:
+    """The session a quote taken at `now` belongs to (YYYY-MM-DD).
+
+    During and after a session that is today; before the open or on weekends it
+    is the last completed session, since no new bars exist yet.
+    """
+    now = (now or market_now()).astimezone(MARKET_TZ)
+    if now.weekday() < 5 and now.time() >= MARKET_OPEN:
+        return now.strftime("%Y-%m-%d")
+    return last_close(now).strftime("%Y-%m-%d")
@@ -0,0 +1,141 @@
+"""
+News search result cache.
+
+Entries are keyed by a normalized query (case, spacing, and term order do not
+matter) plus a date bucket, so a risk audit that repeats the same searches within
+NEWS_TTL skips both the anti-bot sleep and the DuckDuckGo call. Articles are
+stored once per URL, however many queries returned them, and the whole cache is
+persisted as one JSON file so it survives restarts. The API process and every
+finance_server process write that file: each save merges what the others wrote
+under an exclusive file lock, then atomically replaces the file.
+"""
+import json
+import os
+import threading
+import time
+
+from . import CACHE_DIR
+from .market import market_now
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock; the atomic replace still prevents torn files
+    fcntl = None
+
+NEWS_TTL = float(os.environ.get("NEWS_TTL", str(30 * 60)))
+
+
+def normalize_query(query: str) -> str:
+    """'NVDA  stock Risk' and 'risk nvda stock' map to the same key."""
+    terms = dict.fromkeys(query.lower().replace('"', "'").split())
+    return " ".join(sorted(terms))
+
+
+def date_bucket(now=None) -> str:
+    # News goes stale with the calendar: never reuse yesterday's search for today
+    return (now or market_now()).strftime("%Y-%m-%d")
+
+
+class NewsCache:
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl: float = NEWS_TTL):
+        self.path = os.path.join(cache_dir, "news.json")
+        self.ttl = ttl
+        self._queries = {}    # key -> {"urls": [...], "at": epoch}
+        self._articles = {}   # url -> {"title": ..., "href": ...}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str, max_results: int) -> str:
+        return f"{date_bucket()}|{max_results}|{normalize_query(query)}"
+
+    # --- PUBLIC API ---
+    def get(self, query: str, max_results: int):
+        """Cached results for the query, or None when missing or expired."""
+        key = self.key(query, max_results)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._queries.get(key)
+            if entry is None or time.time() - entry["at"] > self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return [dict(self._articles[u]) for u in entry["urls"] if u in self._articles]
+
+    def put(self, query: str, max_results: int, results: list) -> list:
+        """Stores results (deduplicated by URL) and returns the deduplicated list."""
+        urls = []
+        with self._lock:
+            self._ensure_loaded()
+            for r in results:
+                url = r.get("href")
+                if not url or url in urls:
+                    continue
+                urls.append(url)
+                self._articles[url] = {"title": r.get("title", ""), "href": url}
+            self._queries[self.key(query, max_results)] = {"urls": urls, "at": time.time()}
+            self._evict()
+            self._save()
+            return [dict(self._articles[u]) for u in urls]
+
+    def search(self, query: str, max_results: int, search_fn) -> list:
+        """Read-through helper: search_fn(query, max_results) only runs on a miss."""
+        cached = self.get(query, max_results)
+        if cached is not None:
+            return cached
+        return self.put(query, max_results, search_fn(query, max_results) or [])
+
+    # --- INTERNALS ---
+    def _evict(self):
+        now = time.time()
+        self._queries = {k: v for k, v in self._queries.items() if now - v["at"] <= self.ttl}
+        live = {u for v in self._queries.values() for u in v["urls"]}
+        self._articles = {u: a for u, a in self._articles.items() if u in live}
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._queries = data.get("queries", {})
+            self._articles = data.get("articles", {})
+            self._evict()
+        except (OSError, ValueError):
+            pass
+
+    def _merge_from_disk(self):
+        # Keep what other processes saved since we loaded; the newer entry wins per query
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, entry in data.get("queries", {}).items():
+            mine = self._queries.get(key)
+            if mine is None or entry.get("at", 0) > mine["at"]:
+                self._queries[key] = entry
+        for url, article in data.get("articles", {}).items():
+            self._articles.setdefault(url, article)
+        self._evict()
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path + ".lock", "a") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)  # Released when the lock file closes
+                self._merge_from_disk()
+                tmp = self.path + f".{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"queries": self._queries, "articles": self._articles}, f, separators=(",", ":"))
+                os.replace(tmp, self.path)
+        except OSError:
+            pass  # Persistence is best effort; the in-memory cache still works
+
+
+# Global instance shared by tools.py and finance_server.py
+news_cache = NewsCache()
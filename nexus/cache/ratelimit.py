@@ -0,0 +1,220 @@
+"""
+Shared rate limiters for the remote data sources (DuckDuckGo, Yahoo Finance).
+
+Each source gets one token bucket for the whole host, so every tool and cache
+fetcher draws from the same budget: the API process and every finance_server
+subprocess in the MCP pool share the bucket's state through a small JSON file
+under CACHE_DIR, updated under an exclusive file lock (RATE_LIMIT_SHARED=0, or a
+platform without fcntl, falls back to one bucket per process). A call only waits when the bucket is
+empty, instead of paying a fixed anti-bot sleep every time. When a source
+answers with a throttle ("Ratelimit", HTTP 202/429, "Too Many Requests"), the
+limiter backs off: the rate is halved and new calls pause for a cooldown that
+doubles on every consecutive throttle. Successful calls slowly restore the rate.
+
+Waiting works both ways: acquire() sleeps the calling thread, aacquire()
+awaits, so an async caller never blocks the event loop.
+"""
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from . import CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, each process keeps its own bucket
+    fcntl = None
+
+RATE_LIMIT_SHARED = os.environ.get("RATE_LIMIT_SHARED", "1") != "0"
+
+THROTTLE_MARKERS = ("ratelimit", "rate limit", "too many requests")
+THROTTLE_STATUSES = (202, 429)
+# A bare 202/429 only counts next to an HTTP context ("HTTP 429", "status: 202", "429 Client Error"),
+# so dates and prices in an error message ("1d 2024-10-17 -> 2025-10-17") never look like a throttle
+THROTTLE_STATUS_TEXT = re.compile(
+    r"\b(?:http|status|status code|code|response)\W{0,3}(?:202|429)\b"
+    r"|\b(?:202|429)\s+(?:client error|accepted|ratelimit|too many)",
+    re.IGNORECASE,
+)
+
+
+def _status(error):
+    """HTTP status carried by the exception itself (requests/httpx style), if any."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def is_throttled(error) -> bool:
+    """True for the throttle responses DuckDuckGo and Yahoo send back."""
+    if _status(error) in THROTTLE_STATUSES:
+        return True
+    text = str(error).lower()
+    return any(marker in text for marker in THROTTLE_MARKERS) or bool(THROTTLE_STATUS_TEXT.search(text))
+
+
+class AdaptiveRateLimiter:
+    # Bucket fields every process sharing state_path reads and writes together
+    SHARED = ("tokens", "rate", "backoff", "_last", "_cooldown_until", "_successes")
+
+    def __init__(self, name: str, rate: float, burst: float, min_rate: float = None,
+                 backoff: float = 2.0, max_backoff: float = 60.0, recover_after: int = 5,
+                 state_path: str = None):
+        self.name = name
+        self.base_rate = rate                 # Calls per second when healthy
+        self.rate = rate
+        self.min_rate = min_rate or rate / 8
+        self.burst = burst
+        self.tokens = burst
+        self.initial_backoff = backoff
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.recover_after = recover_after
+        self.state_path = state_path if fcntl is not None else None
+        self._cooldown_until = 0.0
+        self._successes = 0
+        self._last = time.time()  # Wall clock: the timestamps are compared across processes
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.throttles = 0
+
+    @contextmanager
+    def _state(self):
+        """Holds the bucket exclusively: the thread lock, plus the file lock when the state is shared."""
+        with self._lock:
+            if self.state_path is None:
+                yield
+                return
+            try:
+                os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+                f = open(self.state_path, "a+", encoding="utf-8")
+            except OSError:
+                yield  # Unwritable cache dir: carry on with this process's bucket
+                return
+            with f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        saved = json.loads(f.read() or "{}")
+                    except ValueError:
+                        saved = {}  # Torn or foreign file: start from this process's view
+                    for field in self.SHARED:
+                        if field in saved:
+                            setattr(self, field, saved[field])
+                    yield
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps({field: getattr(self, field) for field in self.SHARED}))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    # --- ADMISSION ---
+    def _reserve(self) -> float:
+        """Takes a token (possibly on credit) and returns how long the caller must wait for it."""
+        with self._state():
+            now = time.time()
+            self.tokens = min(self.burst, self.tokens + max(0.0, now - self._last) * self.rate)
+            self._last = now
+            self.tokens -= 1
+            wait = max(0.0, -self.tokens / self.rate, self._cooldown_until - now)
+            if wait > 0:
+                self.waits += 1
+            return wait
+
+    def acquire(self) -> float:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        # The shared bucket takes a file lock; another process may hold it, so not on the loop
+        wait = await asyncio.to_thread(self._reserve) if self.state_path else self._reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Cancelled before its turn: the call never happens, so neither should its charge
+                if self.state_path:
+                    asyncio.get_running_loop().run_in_executor(None, self._refund)
+                else:
+                    self._refund()
+                raise
+        return wait
+
+    def _refund(self):
+        with self._state():
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    # --- FEEDBACK ---
+    def throttled(self):
+        """The source pushed back: halve the rate and pause everyone for a growing cooldown."""
+        with self._state():
+            self.throttles += 1
+            self._successes = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            self._cooldown_until = max(self._cooldown_until, time.time() + self.backoff)
+            print(f"🐢 [RATE LIMIT] {self.name} throttled us. Rate {self.rate:.2f}/s, cooling down {self.backoff:.0f}s")
+            self.backoff = min(self.max_backoff, self.backoff * 2)
+
+    def succeeded(self):
+        with self._state():
+            self.backoff = self.initial_backoff
+            self._successes += 1
+            if self.rate < self.base_rate and self._successes >= self.recover_after:
+                self._successes = 0
+                self.rate = min(self.base_rate, self.rate * 1.5)
+
+    # --- CALL HELPERS ---
+    def call(self, fn, *args, **kwargs):
+        """acquire(), run fn, and feed the outcome back into the limiter."""
+        self.acquire()
+        return self.observe(fn, *args, **kwargs)
+
+    async def acall(self, fn, *args, **kwargs):
+        """Async call(): waits on the loop, then runs the blocking fn in a worker thread."""
+        await self.aacquire()
+        return await asyncio.to_thread(self.observe, fn, *args, **kwargs)
+
+    def observe(self, fn, *args, **kwargs):
+        """Runs fn for a token already acquired and feeds the outcome back into the limiter."""
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if is_throttled(e):
+                self.throttled()
+            raise
+        self.succeeded()
+        return result
+
+    def stats(self) -> dict:
+        return {"rate": round(self.rate, 3), "tokens": round(self.tokens, 2),
+                "waits": self.waits, "throttles": self.throttles}
+
+
+def _state_path(name: str):
+    return os.path.join(CACHE_DIR, "ratelimit", f"{name}.json") if RATE_LIMIT_SHARED else None
+
+
+# One budget per remote source for the whole host: tools.py, every finance_server.py
+# process and the caches all draw from it (NEWS_RATE / YAHOO_RATE are host-wide rates)
+news_limiter = AdaptiveRateLimiter(
+    "DuckDuckGo",
+    rate=float(os.environ.get("NEWS_RATE", "1.0")),
+    burst=float(os.environ.get("NEWS_BURST", "3")),
+    state_path=_state_path("duckduckgo"),
+)
+yahoo_limiter = AdaptiveRateLimiter(
+    "Yahoo Finance",
+    rate=float(os.environ.get("YAHOO_RATE", "4.0")),
+    burst=float(os.environ.get("YAHOO_BURST", "8")),
+    state_path=_state_path("yahoo"),
+)
@@ -0,0 +1,148 @@
+import numpy as np
+
+from .batch import _as_matrix, _rolling_mean
+from .screen import technical_factors
+
+# Vectorized backtest math for the verdict engine (agent/final_verdict.py).
+# Inputs are (tickers, bars) matrices, oldest bar first, NaN where a ticker has
+# no data. Scores, signals and forward returns for every ticker and day are
+# whole-array operations; Python only loops over profiles, never over days.
+
+SIGNALS = {1: "BUY", 0: "HOLD", -1: "SELL"}
+
+VOL_WINDOW = 20
+VOL_SCALE = 150.0  # Annualized volatility of 20% -> danger 30; 67% and up -> 100
+NEUTRAL = 50.0     # No point-in-time fundamentals history: the fund analyst abstains
+
+
+def forward_returns(prices, horizon: int) -> np.ndarray:
+    """Return from each bar's close to the close `horizon` bars later (NaN past the end)."""
+    x = _as_matrix(prices)
+    out = np.full_like(x, np.nan)
+    if 0 < horizon < x.shape[1]:
+        out[:, :-horizon] = x[:, horizon:] / x[:, :-horizon] - 1
+    return out
+
+
+def proxy_confidences(prices, rsi_target: float = 55.0) -> dict:
+    """
+    Indicator-derived stand-ins for the council's three numbers on every bar:
+    tech = mean of the screen's trend / momentum / RSI factors, fund = neutral,
+    danger = annualized 20-day volatility scaled to 0-100. NaN until SMA 50 exists.
+    """
+    x = _as_matrix(prices)
+    raw, factors = technical_factors(x, rsi_target, last=False)
+    ready = ~np.isnan(raw["sma_50"])
+    tech = np.where(ready, (factors["trend"] + factors["momentum"] + factors["rsi"]) / 3, np.nan)
+
+    returns = np.full_like(x, np.nan)
+    returns[:, 1:] = x[:, 1:] / x[:, :-1] - 1
+    mean = _rolling_mean(returns, VOL_WINDOW)
+    var = np.maximum(_rolling_mean(returns ** 2, VOL_WINDOW) - mean ** 2, 0.0)
+    danger = np.clip(np.sqrt(var * 252) * VOL_SCALE, 0.0, 100.0)
+    danger = np.where(ready, np.nan_to_num(danger, nan=NEUTRAL), np.nan)
+
+    return {"tech": tech, "fund": np.where(ready, NEUTRAL, np.nan), "danger": danger}
+
+
+def overlay(proxy: dict, council: dict) -> dict:
+    """Stored council numbers where a debate exists, the proxies everywhere else."""
+    return {k: np.where(np.isnan(council[k]), proxy[k], council[k]) for k in proxy}
+
+
+def verdict_scores(tech, fund, danger, weights: dict) -> np.ndarray:
+    """calculate_verdict's weighted score for every cell (danger is turned into safety)."""
+    return tech * weights["tech"] + fund * weights["fund"] + (100.0 - danger) * weights["risk"]
+
+
+def signals(score, buy: float, sell: float) -> np.ndarray:
+    """1 = BUY (score >= buy), -1 = SELL (score <= sell), 0 = HOLD."""
+    score = np.asarray(score)
+    return np.where(score >= buy, 1, np.where(score <= sell, -1, 0)).astype(np.int8)
+
+
+def _valid(score, fwd, mask=None):
+    keep = np.isfinite(score) & np.isfinite(fwd)
+    if mask is not None:
+        keep &= mask
+    return np.asarray(score)[keep], np.asarray(fwd)[keep]
+
+
+def _num(value, digits=4):
+    return None if value is None or not np.isfinite(value) else round(float(value), digits)
+
+
+def evaluate(score, fwd, buy: float, sell: float, mask=None) -> dict:
+    """
+    Forward-return stats per signal at one pair of thresholds. hit_rate is the
+    share of BUYs that rose (SELLs that fell); strategy_return is the mean of
+    signal * forward return over every sample (long BUY, short SELL, flat HOLD);
+    market_return is the mean over every sample, the bar a BUY has to clear.
+    """
+    s, r = _valid(score, fwd, mask)
+    sig = signals(s, buy, sell)
+    out = {"samples": int(s.size), "market_return": _num(r.mean()) if s.size else None}
+    for code, name in SIGNALS.items():
+        picked = r[sig == code]
+        right = picked > 0 if code >= 0 else picked < 0
+        out[name.lower()] = {
+            "count": int(picked.size),
+            "mean_return": _num(picked.mean()) if picked.size else None,
+            "hit_rate": _num(right.mean()) if picked.size and code else None,
+        }
+    buys, sells = out["buy"]["mean_return"], out["sell"]["mean_return"]
+    out["spread"] = _num(buys - sells) if buys is not None and sells is not None else None
+    out["strategy_return"] = _num((sig * r).mean()) if s.size else None
+    out["ic"] = _num(np.corrcoef(s, r)[0, 1]) if s.size > 1 and s.std() > 0 and r.std() > 0 else None
+    return out
+
+
+def threshold_grid(score, fwd, buys, sells, mask=None) -> dict:
+    """
+    evaluate()'s headline numbers for every (buy, sell) pair at once: one sort
+    plus cumulative sums, so a grid costs about as much as a single evaluation.
+    Pairs with sell >= buy are NaN.
+    """
+    s, r = _valid(score, fwd, mask)
+    order = np.argsort(s, kind="stable")
+    s, r = s[order], r[order]
+    csum = np.concatenate([[0.0], np.cumsum(r)])
+    buys, sells = np.asarray(buys, dtype="float64"), np.asarray(sells, dtype="float64")
+
+    lo = np.searchsorted(s, buys, side="left")    # BUY: s[lo:]
+    hi = np.searchsorted(s, sells, side="right")  # SELL: s[:hi]
+    buy_count, sell_count = s.size - lo, hi
+    buy_sum, sell_sum = csum[-1] - csum[lo], csum[hi]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        buy_mean = buy_sum / buy_count
+        sell_mean = sell_sum / sell_count
+        ordered = sells[np.newaxis, :] < buys[:, np.newaxis]
+        spread = np.where(ordered, buy_mean[:, np.newaxis] - sell_mean[np.newaxis, :], np.nan)
+        strategy = np.where(ordered, (buy_sum[:, np.newaxis] - sell_sum[np.newaxis, :]) / max(s.size, 1), np.nan)
+    return {"buys": buys, "sells": sells, "buy_count": buy_count, "sell_count": sell_count,
+            "buy_mean": buy_mean, "sell_mean": sell_mean, "spread": spread, "strategy": strategy}
+
+
+def best_thresholds(grid: dict, metric: str = "spread", min_count: int = 30) -> dict:
+    """
+    The (buy, sell) pair with the highest metric where both sides fired at least
+    min_count times. spread (BUY minus SELL return) is market-neutral; strategy
+    also rewards simply being long in a rising market.
+    """
+    enough = (grid["buy_count"][:, np.newaxis] >= min_count) & (grid["sell_count"][np.newaxis, :] >= min_count)
+    values = np.where(enough, grid[metric], np.nan)
+    if np.isnan(values).all():
+        return {"buy": None, "sell": None, metric: None}
+    i, j = np.unravel_index(np.nanargmax(values), values.shape)
+    return {"buy": float(grid["buys"][i]), "sell": float(grid["sells"][j]), metric: _num(values[i, j]),
+            "buy_count": int(grid["buy_count"][i]), "sell_count": int(grid["sell_count"][j])}
+
+
+def weight_grid(step: float = 0.1) -> np.ndarray:
+    """Every (tech, fund, risk) weight triple on a `step` lattice that sums to 1, shape (n, 3)."""
+    n = int(round(1 / step))
+    tech, fund = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing="ij")
+    tech, fund = tech.ravel(), fund.ravel()
+    keep = tech + fund <= n
+    tech, fund = tech[keep], fund[keep]
+    return np.stack([tech, fund, n - tech - fund], axis=1) / n
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# Batch versions of sma.py / rsi.py for screening a whole universe at once.
+# Prices are a 2-D float matrix shaped (tickers, bars), oldest bar first. Tickers
+# with a shorter history are left-padded with NaN. Every function does one
+# vectorized pass over the matrix, with no Python loop over tickers or bars.
+
+
+def price_matrix(frame: pd.DataFrame):
+    """(tickers, matrix) from a bars x tickers frame, e.g. yf.download(...)['Close']."""
+    return list(frame.columns), frame.to_numpy(dtype="float64").T
+
+
+def _as_matrix(prices) -> np.ndarray:
+    arr = np.asarray(prices, dtype="float64")
+    return arr[np.newaxis, :] if arr.ndim == 1 else arr
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Mean over the trailing `window` bars; NaN until the window holds no NaN."""
+    n, t = x.shape
+    out = np.full((n, t), np.nan)
+    if window > t:
+        return out
+    valid = ~np.isnan(x)
+    zeros = np.zeros((n, 1))
+    sums = np.concatenate([zeros, np.cumsum(np.where(valid, x, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([zeros, np.cumsum(valid, axis=1)], axis=1)
+    window_sum = sums[:, window:] - sums[:, :-window]
+    window_count = counts[:, window:] - counts[:, :-window]
+    out[:, window - 1:] = np.where(window_count == window, window_sum / window, np.nan)
+    return out
+
+
+def _last(x: np.ndarray) -> np.ndarray:
+    return x[:, -1]
+
+
+def batch_sma(prices, window: int, last: bool = False) -> np.ndarray:
+    """Simple Moving Average for every ticker (NaN where history is shorter than window)."""
+    sma = _rolling_mean(_as_matrix(prices), window)
+    return _last(sma) if last else sma
+
+
+def batch_rsi(prices, period: int = 14, last: bool = False) -> np.ndarray:
+    """Relative Strength Index for every ticker, same math as calculate_rsi."""
+    x = _as_matrix(prices)
+    delta = np.full_like(x, np.nan)
+    delta[:, 1:] = np.diff(x, axis=1)
+
+    # Like Series.where in calculate_rsi: the undefined first delta counts as 0
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    padding = np.isnan(x)
+    gain[padding] = np.nan
+    loss[padding] = np.nan
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = _rolling_mean(gain, period) / _rolling_mean(loss, period)
+        rsi = 100 - (100 / (1 + rs))
+    return _last(rsi) if last else rsi
+
+
+def batch_uptrend(prices, window: int = 50, last: bool = False) -> np.ndarray:
+    """Boolean Price > SMA(window) per ticker and bar (False while the SMA is undefined)."""
+    x = _as_matrix(prices)
+    with np.errstate(invalid="ignore"):
+        trend = x > _rolling_mean(x, window)
+    return _last(trend) if last else trend
+
+
+def batch_indicators(prices, sma_windows=(20, 50), rsi_period: int = 14,
+                     trend_window: int = 50, last: bool = True) -> dict:
+    """Every indicator the technical tool reports, for all tickers in one call."""
+    x = _as_matrix(prices)
+    pick = _last if last else (lambda a: a)
+    out = {"price": pick(x), "rsi": batch_rsi(x, rsi_period, last=last)}
+    smas = {w: _rolling_mean(x, w) for w in set(sma_windows) | {trend_window}}
+    for w in sma_windows:
+        out[f"sma_{w}"] = pick(smas[w])
+    with np.errstate(invalid="ignore"):
+        out["is_uptrend"] = pick(x > smas[trend_window])
+    return out
@@ -0,0 +1,136 @@
+import math
+
+# Streaming versions of sma.py / rsi.py: feed one bar at a time with update(price),
+# each update is O(1). State round-trips through to_dict()/from_dict() so an
+# indicator can be cached and resumed when the next bar arrives.
+
+
+class IncrementalSMA:
+    """Simple Moving Average over a fixed-size ring buffer."""
+    __slots__ = ("window", "_buf", "_pos", "_count", "_sum")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buf = [0.0] * window
+        self._pos = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, price: float):
+        """Adds a bar and returns the new SMA (None until the window is full)."""
+        self._sum += price - self._buf[self._pos]
+        self._buf[self._pos] = price
+        self._pos = (self._pos + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+        if self._pos == 0:
+            # Once per lap, rebuild the running sum so float drift never accumulates
+            self._sum = math.fsum(self._buf)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self._count == self.window
+
+    @property
+    def value(self):
+        return self._sum / self.window if self.ready else None
+
+    def to_dict(self) -> dict:
+        return {"window": self.window, "buf": list(self._buf), "pos": self._pos, "count": self._count}
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        obj = cls(state["window"])
+        obj._buf = list(state["buf"])
+        obj._pos = state["pos"]
+        obj._count = state["count"]
+        obj._sum = math.fsum(obj._buf)
+        return obj
+
+
+class IncrementalRSI:
+    """Relative Strength Index, one bar at a time.
+
+    smoothing="wilder" uses Wilder's smoothing: the first average is a plain mean
+    of `period` moves, then avg = (avg * (period - 1) + move) / period.
+    smoothing="simple" reproduces calculate_rsi (rolling means of gains and losses)
+    with two ring buffers.
+    """
+    __slots__ = ("period", "smoothing", "_prev", "_gains", "_losses", "_avg_gain", "_avg_loss", "_count")
+
+    def __init__(self, period: int = 14, smoothing: str = "wilder"):
+        if smoothing not in ("wilder", "simple"):
+            raise ValueError(f"Unknown smoothing '{smoothing}'.")
+        self.period = period
+        self.smoothing = smoothing
+        self._prev = None
+        self._gains = IncrementalSMA(period)
+        self._losses = IncrementalSMA(period)
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._count = 0
+
+    def update(self, price: float):
+        """Adds a bar and returns the new RSI (None during warm-up)."""
+        if self._prev is None:
+            self._prev = price
+            if self.smoothing == "simple":
+                # calculate_rsi counts the undefined first move as a 0 gain and 0 loss
+                self._gains.update(0.0)
+                self._losses.update(0.0)
+            return self.value
+
+        delta = price - self._prev
+        self._prev = price
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+
+        if self.smoothing == "simple":
+            self._gains.update(gain)
+            self._losses.update(loss)
+            return self.value
+
+        self._count += 1
+        if self._count <= self.period:
+            # Seed: plain mean of the first `period` moves
+            self._avg_gain += gain / self.period
+            self._avg_loss += loss / self.period
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        if self.smoothing == "simple":
+            return self._gains.ready
+        return self._count >= self.period
+
+    @property
+    def value(self):
+        if not self.ready:
+            return None
+        if self.smoothing == "simple":
+            avg_gain, avg_loss = self._gains.value, self._losses.value
+        else:
+            avg_gain, avg_loss = self._avg_gain, self._avg_loss
+        if avg_loss == 0:
+            return float("nan") if avg_gain == 0 else 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def to_dict(self) -> dict:
+        return {
+            "period": self.period, "smoothing": self.smoothing, "prev": self._prev,
+            "gains": self._gains.to_dict(), "losses": self._losses.to_dict(),
+            "avg_gain": self._avg_gain, "avg_loss": self._avg_loss, "count": self._count
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        obj = cls(state["period"], state["smoothing"])
+        obj._prev = state["prev"]
+        obj._gains = IncrementalSMA.from_dict(state["gains"])
+        obj._losses = IncrementalSMA.from_dict(state["losses"])
+        obj._avg_gain = state["avg_gain"]
+        obj._avg_loss = state["avg_loss"]
+        obj._count = state["count"]
+        return obj
@@ -2,6 +2,7 @@ import pandas as pd
 
 def calculate_rsi(series: pd.Series, period: int = 14) -> float:
     """Calculates the Relative Strength Index (RSI)."""
+    series = pd.Series(series, dtype="float64")  # Also accept plain lists/arrays
     delta = series.diff()
     gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
     loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
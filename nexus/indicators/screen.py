@@ -0,0 +1,198 @@
+import copy
+import json
+import os
+
+import numpy as np
+
+from .batch import batch_indicators
+
+# Cheap numeric pre-screen for a whole universe, before any LLM sees a ticker.
+# Every factor is scored 0-100 for all tickers in one vectorized pass over the
+# (tickers, bars) price matrix from batch.py. Hard filters are boolean masks.
+# Rules are plain dicts, so a screen can be tuned from a JSON file.
+
+DEFAULT_RULES = {
+    # A ticker failing any filter is never escalated (None switches a filter off)
+    "filters": {
+        "min_price": 5.0,
+        "rsi_min": 25.0,           # Skip falling knives...
+        "rsi_max": 75.0,           # ...and blow-off tops
+        "require_uptrend": False,  # Price > SMA 50
+        "min_market_cap": 2e9,
+        "max_pe": 80.0,
+        "sectors": None,           # e.g. ["Technology", "Healthcare"]
+    },
+    # Relative factor weights (normalized, so they need not sum to 1; 0 drops a factor)
+    "weights": {
+        "trend": 0.25,     # Price vs SMA 50
+        "momentum": 0.20,  # SMA 20 vs SMA 50
+        "rsi": 0.15,       # Distance from rsi_target
+        "value": 0.15,     # Low P/E
+        "margins": 0.15,
+        "leverage": 0.10,  # Low debt/equity
+    },
+    "rsi_target": 55.0,
+}
+
+# Same names get_company_info / get_fundamentals_batch report
+FUND_FIELDS = ("market_cap", "pe_ratio", "margins", "debt_equity")
+
+# Scales that map raw values onto 0-100
+TREND_SCALE = 1000.0  # 5% above the SMA = 100, 5% below = 0
+RSI_SCALE = 2.5       # 40 RSI points from the target = 0
+PE_CEILING = 60.0     # P/E at or above this scores 0
+MARGIN_SCALE = 250.0  # 40% net margin = 100
+DE_CEILING = 200.0    # Yahoo reports debt/equity in percent; 200% scores 0
+NEUTRAL = 50.0        # Missing fundamentals neither help nor hurt
+
+
+def merge_rules(overrides: dict = None, base: dict = None) -> dict:
+    """base (default: DEFAULT_RULES) with overrides applied one level deep. Bad keys or shapes raise ValueError."""
+    rules = copy.deepcopy(base or DEFAULT_RULES)
+    if not isinstance(overrides or {}, dict):
+        raise ValueError("Screen rules must be a JSON object")
+    for key, value in (overrides or {}).items():
+        if key not in rules:
+            raise ValueError(f"Unknown screen rule '{key}'")
+        if isinstance(rules[key], dict):
+            if not isinstance(value, dict):
+                raise ValueError(f"Screen rule '{key}' must be an object")
+            unknown = set(value) - set(rules[key])
+            if unknown:
+                raise ValueError(f"Unknown {key}: {', '.join(sorted(unknown))}")
+            rules[key].update(value)
+        else:
+            rules[key] = value
+    _check_types(rules)
+    return rules
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_types(rules: dict):
+    """Values reach NumPy comparisons as-is, so a "5" or a true must fail here, not mid-screen."""
+    for name, value in rules["filters"].items():
+        if name == "require_uptrend":
+            ok = isinstance(value, bool)
+        elif name == "sectors":
+            ok = value is None or (isinstance(value, list) and all(isinstance(v, str) for v in value))
+        else:
+            ok = value is None or _is_number(value)
+        if not ok:
+            raise ValueError(f"Invalid filters.{name}: {value!r}")
+    for name, value in rules["weights"].items():
+        if not _is_number(value) or value < 0:
+            raise ValueError(f"Invalid weights.{name}: {value!r} (use a number >= 0)")
+    if not _is_number(rules["rsi_target"]):
+        raise ValueError(f"Invalid rsi_target: {rules['rsi_target']!r}")
+
+
+def load_rules(source: str = None) -> dict:
+    """Rules from a JSON file path or an inline JSON string (default: the SCREEN_RULES env var)."""
+    source = source if source is not None else os.environ.get("SCREEN_RULES", "")
+    if not source.strip():
+        return merge_rules()
+    if source.lstrip().startswith("{"):
+        return merge_rules(json.loads(source))
+    with open(source, encoding="utf-8") as f:
+        return merge_rules(json.load(f))
+
+
+def fundamentals_arrays(rows: list) -> dict:
+    """Column arrays from per-ticker dicts (None/missing -> NaN); sector stays a string array."""
+    out = {}
+    for field in FUND_FIELDS:
+        out[field] = np.array([_float(row.get(field)) for row in rows], dtype="float64")
+    out["sector"] = np.array([row.get("sector") or "" for row in rows], dtype=object)
+    return out
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _clip(x) -> np.ndarray:
+    return np.clip(x, 0.0, 100.0)
+
+
+def technical_factors(prices, rsi_target: float = DEFAULT_RULES["rsi_target"], last: bool = True):
+    """(raw indicators, factor scores) for every ticker; no usable history scores 0.
+
+    last=False scores every bar instead of only the latest (used by backtest.py).
+    """
+    raw = batch_indicators(prices, last=last)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = {
+            "trend": _clip(50 + TREND_SCALE * (raw["price"] / raw["sma_50"] - 1)),
+            "momentum": _clip(50 + TREND_SCALE * (raw["sma_20"] / raw["sma_50"] - 1)),
+            "rsi": _clip(100 - RSI_SCALE * np.abs(raw["rsi"] - rsi_target)),
+        }
+    return raw, {k: np.nan_to_num(v, nan=0.0) for k, v in scores.items()}
+
+
+def fundamental_factors(fund: dict) -> dict:
+    pe, margins, de = fund["pe_ratio"], fund["margins"], fund["debt_equity"]
+    with np.errstate(invalid="ignore"):
+        # No trailing P/E (losses) earns no value support; other gaps are neutral
+        value = np.where(pe > 0, _clip(100 * (1 - pe / PE_CEILING)), 0.0)
+        margin = np.where(np.isnan(margins), NEUTRAL, _clip(margins * MARGIN_SCALE))
+        leverage = np.where(np.isnan(de), NEUTRAL, _clip(100 * (1 - de / DE_CEILING)))
+    return {"value": value, "margins": margin, "leverage": leverage}
+
+
+def filter_mask(raw: dict, fund: dict = None, filters: dict = None) -> np.ndarray:
+    """True where a ticker passes every active filter. Fundamental filters need fund."""
+    filters = {**DEFAULT_RULES["filters"], **(filters or {})}
+    price, rsi = raw["price"], raw["rsi"]
+    with np.errstate(invalid="ignore"):
+        mask = np.isfinite(price)
+        if filters["min_price"] is not None:
+            mask &= price >= filters["min_price"]
+        if filters["rsi_min"] is not None:
+            mask &= rsi >= filters["rsi_min"]
+        if filters["rsi_max"] is not None:
+            mask &= rsi <= filters["rsi_max"]
+        if filters["require_uptrend"]:
+            mask &= raw["is_uptrend"]
+        if fund is not None:
+            if filters["min_market_cap"] is not None:
+                mask &= fund["market_cap"] >= filters["min_market_cap"]
+            if filters["max_pe"] is not None:
+                mask &= ~(fund["pe_ratio"] > filters["max_pe"])  # Unknown P/E passes
+            if filters["sectors"]:
+                mask &= np.isin(fund["sector"], list(filters["sectors"]))
+    return mask
+
+
+def score_universe(prices, fund: dict = None, rules: dict = None) -> dict:
+    """
+    Scores every row of the price matrix. Without fund only the technical
+    factors and filters apply, with their weights renormalized, so a cheap first
+    pass can decide which tickers are worth a fundamentals lookup.
+    Returns arrays: score, passed, each factor score and the raw indicators.
+    """
+    rules = rules or merge_rules()
+    raw, factors = technical_factors(prices, rules["rsi_target"])
+    if fund is not None:
+        factors.update(fundamental_factors(fund))
+
+    weights = {k: float(w) for k, w in rules["weights"].items() if k in factors and w > 0}
+    total = sum(weights.values())
+    score = np.zeros(len(raw["price"]))
+    for name, weight in weights.items():
+        score += factors[name] * (weight / total)
+
+    return {"score": score, "passed": filter_mask(raw, fund, rules["filters"]),
+            **{f"{k}_score": v for k, v in factors.items()}, **raw}
+
+
+def rank(score, passed, top_n: int = None) -> np.ndarray:
+    """Indices of passing tickers, best score first (ties keep universe order)."""
+    order = np.argsort(-np.asarray(score), kind="stable")
+    order = order[np.asarray(passed)[order]]
+    return order if not top_n else order[:top_n]
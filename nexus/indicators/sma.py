@@ -2,6 +2,7 @@ import pandas as pd
 
 def calculate_sma(series: pd.Series, window: int) -> float:
     """Calculates the Simple Moving Average."""
+    series = pd.Series(series, dtype="float64")  # Also accept plain lists/arrays
     if len(series) < window:
         return 0.0
     return series.rolling(window=window).mean().iloc[-1]
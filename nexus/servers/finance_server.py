@@ -1,8 +1,17 @@
-import yfinance as yf
 from duckduckgo_search import DDGS
 from mcp.server.fastmcp import FastMCP
+from nexus.cache.history import get_history, prefetch_history
+from nexus.cache.fundamentals import get_fundamentals_snapshot
+from nexus.cache.news import news_cache
+from nexus.cache.ratelimit import is_throttled, news_limiter
+from nexus.servers.registry import registry
+from nexus.indicators.batch import batch_indicators
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+import json
 import logging
 import os
+import pandas as pd
 
 # 1. Silence all background noise
 logging.getLogger('yfinance').setLevel(logging.CRITICAL)
@@ -10,13 +19,31 @@ os.environ['YF_NO_PRINTOUT'] = '1'
 
 mcp = FastMCP("AlphaCouncil Finance")
 
+# Every tool is registered twice: with FastMCP for the stdio server, and in the
+# ToolRegistry so agents running in the same process can call it directly
+# (TOOL_TRANSPORT=inprocess, see agent/tool_transport.py). The registry policy
+# keeps concurrent councils from piling onto Yahoo/DDG and reuses fresh results.
+TOOL_TIMEOUT = float(os.environ.get("TOOL_TIMEOUT", "15"))
+TOOL_MAX_CONCURRENCY = int(os.environ.get("TOOL_MAX_CONCURRENCY", "4"))
+TOOL_TTL = float(os.environ.get("TOOL_TTL", "60"))
+
+# The tools report failures as text, never by raising. Prefixes are matched case-insensitively,
+# so the DuckDuckGo throttle reply ("ERROR: News search is currently rate-limited...") counts too.
+FAILURE_PREFIXES = ("error", "tech tool error", "fund tool error", "news tool error",
+                    "batch tech tool error", "batch fund tool error", "no ")
+
+def _succeeded(result) -> bool:
+    # Never memoize a failure: a transient throttle would be served for TOOL_TTL
+    return not str(result).lstrip().lower().startswith(FAILURE_PREFIXES)
+
 @mcp.tool()
+@registry.register("analyze_stock", timeout=TOOL_TIMEOUT, max_concurrency=TOOL_MAX_CONCURRENCY,
+                   ttl=TOOL_TTL, cache_if=_succeeded)
 def analyze_stock(ticker: str) -> str:
     """Fetches stock price and trend."""
     try:
-        stock = yf.Ticker(ticker)
-        # .history does NOT accept progress=False in current versions
-        hist = stock.history(period="1mo")
+        # Shared history cache: repeat calls within the TTL never leave the process
+        hist = get_history(ticker, period="1mo")
         
         if hist.empty:
             return f"Error: No data found for ticker {ticker}"
@@ -35,12 +62,13 @@ def analyze_stock(ticker: str) -> str:
         return f"Tech Tool Error: {str(e)}"
 
 @mcp.tool()
+@registry.register("get_fundamentals", timeout=TOOL_TIMEOUT, max_concurrency=TOOL_MAX_CONCURRENCY,
+                   ttl=TOOL_TTL, cache_if=_succeeded)
 def get_fundamentals(ticker: str) -> str:
     """Fetches valuation and margin data."""
     try:
-        stock = yf.Ticker(ticker)
-        # info can be slow or chatty; we use it carefully
-        info = stock.info
+        # info is slow, so we read a cached snapshot (refreshed in the background when stale)
+        info = get_fundamentals_snapshot(ticker)
         
         return (
             f"Market Cap: {info.get('marketCap', 'N/A')}\n"
@@ -51,21 +79,104 @@ def get_fundamentals(ticker: str) -> str:
     except Exception as e:
         return f"Fund Tool Error: {str(e)}"
 
-import time
-import random
+# --- BATCH TOOLS ---
+# One call for a whole watchlist: one bulk yf.download for every uncached ticker,
+# then the indicators for all of them in one vectorized pass.
+BATCH_MAX_TICKERS = int(os.environ.get("BATCH_MAX_TICKERS", "100"))
+BATCH_TOOL_TIMEOUT = float(os.environ.get("BATCH_TOOL_TIMEOUT", "60"))
+
+def _clean_tickers(tickers: List[str]) -> List[str]:
+    tickers = list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+    if len(tickers) > BATCH_MAX_TICKERS:
+        raise ValueError(f"At most {BATCH_MAX_TICKERS} tickers per call")
+    return tickers
+
+def _num(value, digits=2):
+    return None if pd.isna(value) else round(float(value), digits)
 
 @mcp.tool()
+@registry.register("analyze_stocks_batch", timeout=BATCH_TOOL_TIMEOUT, max_concurrency=2)
+def analyze_stocks_batch(tickers: List[str]) -> str:
+    """Price, trend, RSI and SMAs for many tickers at once. Returns a compact JSON map per ticker."""
+    try:
+        tickers = _clean_tickers(tickers)
+        prefetch_history(tickers, period="1y")  # Single bulk download for the cold ones
+
+        closes, volumes, out = {}, {}, {}
+        for ticker in tickers:
+            try:
+                hist = get_history(ticker, period="1y")  # Cache hit after the prefetch
+            except Exception as e:
+                hist, out[ticker] = None, {"error": str(e)}
+            if hist is None or hist.empty:
+                out.setdefault(ticker, {"error": "No data found"})
+                continue
+            closes[ticker] = hist["Close"]
+            volumes[ticker] = hist["Volume"].iloc[-1]
+
+        if closes:
+            # Align on one calendar; carry prices over gaps so windows stay complete
+            frame = pd.DataFrame(closes).sort_index().ffill()
+            ind = batch_indicators(frame.to_numpy(dtype="float64").T)
+            for i, ticker in enumerate(frame.columns):
+                price, sma_20 = ind["price"][i], ind["sma_20"][i]
+                out[ticker] = {
+                    "price": _num(price),
+                    "trend": "Bullish" if price > sma_20 else "Bearish",
+                    "rsi": _num(ind["rsi"][i]),
+                    "sma_20": _num(sma_20),
+                    "sma_50": _num(ind["sma_50"][i]),
+                    "is_uptrend": bool(ind["is_uptrend"][i]),
+                    "volume": None if pd.isna(volumes[ticker]) else int(volumes[ticker]),
+                }
+        return json.dumps({t: out[t] for t in tickers}, separators=(",", ":"))
+    except Exception as e:
+        return f"Batch Tech Tool Error: {str(e)}"
+
+@mcp.tool()
+@registry.register("get_fundamentals_batch", timeout=BATCH_TOOL_TIMEOUT, max_concurrency=2)
+def get_fundamentals_batch(tickers: List[str]) -> str:
+    """Valuation and margin snapshot for many tickers. Returns a compact JSON map per ticker."""
+    try:
+        tickers = _clean_tickers(tickers)
+
+        def snapshot(ticker):
+            try:
+                info = get_fundamentals_snapshot(ticker)
+            except Exception as e:
+                return {"error": str(e)}
+            return {
+                "market_cap": info.get("marketCap"),
+                "pe_ratio": info.get("trailingPE"),
+                "sector": info.get("sector"),
+                "margins": info.get("profitMargins"),
+                "debt_equity": info.get("debtToEquity"),
+            }
+
+        # Yahoo has no bulk info endpoint; cached snapshots return at once, cold ones fetch in parallel
+        with ThreadPoolExecutor(max_workers=max(1, min(TOOL_MAX_CONCURRENCY, len(tickers)))) as pool:
+            results = list(pool.map(snapshot, tickers))
+        return json.dumps(dict(zip(tickers, results)), separators=(",", ":"), default=str)
+    except Exception as e:
+        return f"Batch Fund Tool Error: {str(e)}"
+
+def _ddg_search(query: str, max_results: int) -> list:
+    # 1. Shared DuckDuckGo budget: only waits when we are close to being throttled,
+    #    and backs off on its own when DDG answers with a Ratelimit/202
+    with DDGS() as ddgs:
+        return news_limiter.call(lambda: list(ddgs.text(query, max_results=max_results)))
+
+@mcp.tool()
+@registry.register("search_news", timeout=TOOL_TIMEOUT, max_concurrency=TOOL_MAX_CONCURRENCY,
+                   ttl=TOOL_TTL, cache_if=_succeeded)
 def search_news(query: str) -> str:
     try:
-        # 1. Add a tiny random sleep to dodge bot detection (0.5 to 1.5 seconds)
-        time.sleep(random.uniform(0.5, 1.5))
-        
         # 2. Use a more specific query to force fresh results
         fresh_query = f"{query} stock news Jan 2026" 
         
-        with DDGS() as ddgs:
-            # max_results=5 gives the LLM more 'meat' to work with
-            results = list(ddgs.text(fresh_query, max_results=5))
+        # max_results=5 gives the LLM more 'meat' to work with.
+        # Cache hits skip both the rate limiter and the network call.
+        results = news_cache.search(fresh_query, 5, _ddg_search)
             
         if not results:
             return "No recent news found. Market may be quiet or search blocked."
@@ -73,7 +184,7 @@ def search_news(query: str) -> str:
         return "\n".join([f"- {r['title']} ({r['href']})" for r in results])
     except Exception as e:
         # If DDG blocks us, let's at least know why
-        if "202" in str(e) or "Ratelimit" in str(e):
+        if is_throttled(e):
             return "ERROR: News search is currently rate-limited by DuckDuckGo."
         return f"News Tool Error: {str(e)}"
 
@@ -1,32 +1,227 @@
-from typing import Callable, Dict, Any
+import asyncio
+import inspect
+import json
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+
+class ToolSpec:
+    """A registered tool plus its execution policy."""
+
+    def __init__(self, name: str, func: Callable, timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, ttl: Optional[float] = None,
+                 cache_if: Optional[Callable[[Any], bool]] = None):
+        self.name = name
+        self.func = func
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.ttl = ttl
+        self.cache_if = cache_if
+        # Sync tools are throttled in whichever thread runs them; async tools per event loop
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.loop_slots = weakref.WeakKeyDictionary()
+
 
 class ToolRegistry:
     """
     A framework-agnostic registry for tools.
     This allows us to test tools without running an MCP server.
+
+    Each registration can declare a timeout, a max number of concurrent runs and
+    a TTL for memoizing results, so one registry can serve many council runs at
+    once without a slow yfinance call holding up the rest. Tools may be async.
+    Failures never raise: they come back as {"error": ..., "status": "failed"}.
     """
-    def __init__(self):
-        self._tools: Dict[str, Callable] = {}
+    def __init__(self, max_workers: int = 32, max_memo_entries: int = 4096):
+        self._tools: Dict[str, ToolSpec] = {}
+        self._memo: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._max_memo_entries = max_memo_entries
+        self._executor = None
+        self.hits = 0
+        self.misses = 0
 
-    def register(self, name: str):
-        """Decorator to register a function as a tool."""
+    def register(self, name: str, timeout: float = None, max_concurrency: int = None,
+                 ttl: float = None, cache_if: Callable[[Any], bool] = None):
+        """Decorator to register a function (sync or async) as a tool.
+
+        timeout: seconds before the caller gets a failure instead of the result.
+        max_concurrency: at most this many runs of the tool at once; extra calls wait.
+        ttl: reuse a result for identical arguments for this many seconds.
+        cache_if: only memoize results this predicate accepts (e.g. not error strings).
+        """
         def decorator(func: Callable):
-            self._tools[name] = func
+            self._tools[name] = ToolSpec(name, func, timeout, max_concurrency, ttl, cache_if)
             return func
         return decorator
 
+    # --- SYNC API ---
     def call(self, name: str, **kwargs) -> Any:
         """Executes a tool by name with arguments."""
-        if name not in self._tools:
-            raise ValueError(f"Tool '{name}' not found.")
-        
+        spec = self._spec(name)
+        key = self._key(name, kwargs)
+        cached = self._memo_get(spec, key)
+        if cached is not None:
+            return cached
+
+        try:
+            if spec.is_async:
+                result = self._run_coroutine_sync(spec, kwargs)
+            elif spec.timeout:
+                # Run in the pool so we can stop waiting; the tool itself finishes in the background
+                result = self._pool().submit(self._run_sync, spec, kwargs).result(timeout=spec.timeout)
+            else:
+                result = self._run_sync(spec, kwargs)
+        except FutureTimeout:
+            return self._timeout_error(spec)
+        except Exception as e:
+            return {"error": str(e), "status": "failed"}
+
+        self._memo_put(spec, key, result)
+        return result
+
+    def call_many(self, calls: List[Tuple[str, dict]]) -> List[Any]:
+        """Runs (name, kwargs) calls concurrently; results come back in the same order."""
+        if not calls:
+            return []
+        # Own pool per batch: call() may itself wait on the shared pool (timeouts), so don't nest in it
+        with ThreadPoolExecutor(max_workers=min(len(calls), self._max_workers)) as pool:
+            futures = [pool.submit(self.call, name, **kwargs) for name, kwargs in calls]
+            return [f.result() for f in futures]
+
+    # --- ASYNC API ---
+    async def acall(self, name: str, **kwargs) -> Any:
+        """Async call: sync tools run in a worker thread, async tools on the loop.
+
+        Identical concurrent calls to a memoized tool share one execution.
+        """
+        spec = self._spec(name)
+        key = self._key(name, kwargs)
+        cached = self._memo_get(spec, key)
+        if cached is not None:
+            return cached
+        if not spec.ttl:
+            return await self._acall_uncached(spec, key, kwargs)
+
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._acall_uncached(spec, key, kwargs))
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(fut)
+
+    async def acall_many(self, calls: List[Tuple[str, dict]]) -> List[Any]:
+        """Async call_many: every call starts at once (within each tool's concurrency limit)."""
+        return await asyncio.gather(*(self.acall(name, **kwargs) for name, kwargs in calls))
+
+    async def _acall_uncached(self, spec: ToolSpec, key, kwargs) -> Any:
         try:
-            return self._tools[name](**kwargs)
+            if spec.is_async:
+                coro = self._run_async(spec, kwargs)
+            else:
+                coro = asyncio.to_thread(self._run_sync, spec, kwargs)
+            result = await asyncio.wait_for(coro, spec.timeout) if spec.timeout else await coro
+        except asyncio.TimeoutError:
+            return self._timeout_error(spec)
         except Exception as e:
             return {"error": str(e), "status": "failed"}
 
+        self._memo_put(spec, key, result)
+        return result
+
+    # --- EXECUTION ---
+    def _run_sync(self, spec: ToolSpec, kwargs: dict) -> Any:
+        if spec.slots is None:
+            return spec.func(**kwargs)
+        with spec.slots:
+            return spec.func(**kwargs)
+
+    async def _run_async(self, spec: ToolSpec, kwargs: dict) -> Any:
+        if not spec.max_concurrency:
+            return await spec.func(**kwargs)
+        loop = asyncio.get_running_loop()
+        slots = spec.loop_slots.get(loop)
+        if slots is None:
+            slots = spec.loop_slots[loop] = asyncio.Semaphore(spec.max_concurrency)
+        async with slots:
+            return await spec.func(**kwargs)
+
+    def _run_coroutine_sync(self, spec: ToolSpec, kwargs: dict) -> Any:
+        async def run():
+            coro = self._run_async(spec, kwargs)
+            return await asyncio.wait_for(coro, spec.timeout) if spec.timeout else await coro
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                return asyncio.run(run())
+            except asyncio.TimeoutError:
+                raise FutureTimeout()
+        raise RuntimeError(f"Async tool '{spec.name}' called synchronously from a running event loop; use acall().")
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="tool")
+            return self._executor
+
+    # --- MEMOIZATION ---
+    @staticmethod
+    def _key(name: str, kwargs: dict) -> Tuple[str, str]:
+        return name, json.dumps(kwargs, sort_keys=True, default=str)
+
+    def _memo_get(self, spec: ToolSpec, key):
+        if not spec.ttl:
+            return None
+        with self._lock:
+            entry = self._memo.get(key)
+            if entry is not None and time.monotonic() < entry[1]:
+                self.hits += 1
+                return entry[0]
+            self._memo.pop(key, None)
+            self.misses += 1
+            return None
+
+    def _memo_put(self, spec: ToolSpec, key, result):
+        if not spec.ttl or result is None:
+            return
+        if spec.cache_if is not None and not spec.cache_if(result):
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._memo[key] = (result, now + spec.ttl)
+            if len(self._memo) > self._max_memo_entries:
+                for k in [k for k, (_, expires) in self._memo.items() if expires <= now]:
+                    del self._memo[k]
+                while len(self._memo) > self._max_memo_entries:
+                    del self._memo[next(iter(self._memo))]  # Oldest insert first
+
+    def clear_cache(self):
+        with self._lock:
+            self._memo.clear()
+
+    # --- HELPERS ---
+    def _spec(self, name: str) -> ToolSpec:
+        if name not in self._tools:
+            raise ValueError(f"Tool '{name}' not found.")
+        return self._tools[name]
+
+    @staticmethod
+    def _timeout_error(spec: ToolSpec) -> dict:
+        return {"error": f"Tool '{spec.name}' timed out after {spec.timeout}s", "status": "failed"}
+
     def list_tools(self):
         return list(self._tools.keys())
 
+    def stats(self) -> dict:
+        return {"tools": len(self._tools), "memo_hits": self.hits, "memo_misses": self.misses,
+                "memo_entries": len(self._memo)}
+
 # Global instance
-registry = ToolRegistry()
\ No newline at end of file
+registry = ToolRegistry()
@@ -1,16 +1,20 @@
-import yfinance as yf
+import asyncio
 import json
 from ddgs import DDGS
 
 # Proper Modular Imports (These will work after Phase 4)
 from nexus.indicators.sma import calculate_sma, is_uptrend
 from nexus.indicators.rsi import calculate_rsi
+from nexus.cache.history import get_history
+from nexus.cache.fundamentals import get_fundamentals_snapshot
+from nexus.cache.news import news_cache
+from nexus.cache.ratelimit import news_limiter
 
 def get_technical_summary(ticker: str) -> str:
     """Fetches data and calculates technical indicators."""
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period="1y")
+        # Served from the shared history cache; only new bars hit Yahoo
+        hist = get_history(ticker, period="1y")
         
         if hist.empty:
             return "Error: No data found for ticker."
@@ -41,8 +45,7 @@ def get_technical_summary(ticker: str) -> str:
 def get_company_info(ticker: str) -> str:
     """Fetches fundamental data."""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = get_fundamentals_snapshot(ticker)
         
         data = {
             "ticker": ticker,
@@ -55,14 +58,38 @@ def get_company_info(ticker: str) -> str:
     except Exception as e:
         return f"Error fetching fundamentals: {e}"
 
+def _format_news(results) -> str:
+    if not results:
+        return "No news found."
+    formatted = [f"- {r['title']} ({r['href']})" for r in results]
+    return "\n".join(formatted)
+
 def get_market_news(query: str) -> str:
     """Searches for news."""
     try:
-        results = DDGS().text(query, max_results=3)
-        if not results:
-            return "No news found."
-        
-        formatted = [f"- {r['title']} ({r['href']})" for r in results]
-        return "\n".join(formatted)
+        # Repeat risk audits within NEWS_TTL are answered from the cache; misses draw from
+        # the host-wide DuckDuckGo bucket (ratelimit.py) every finance_server.py process shares
+        results = news_cache.search(query, 3, lambda q, n: news_limiter.call(DDGS().text, q, max_results=n))
+        return _format_news(results)
+    except Exception as e:
+        return f"Error searching news: {e}"
+
+def _search_and_cache(query: str) -> list:
+    # Runs once a limiter token is ours: the search is paid for, so always keep its results
+    found = news_limiter.observe(lambda: DDGS().text(query, max_results=3))
+    return news_cache.put(query, 3, found or [])
+
+async def aget_market_news(query: str) -> str:
+    """
+    Async get_market_news: waits for the rate limiter on the loop; the search and the cache file I/O run in threads.
+    Cancelled while still waiting for a token, it hands the token back and never searches. Once the search
+    has started it is shielded, so a cancelled caller stops waiting but the results still reach the cache.
+    """
+    try:
+        results = await asyncio.to_thread(news_cache.get, query, 3)
+        if results is None:
+            await news_limiter.aacquire()
+            results = await asyncio.shield(asyncio.to_thread(_search_and_cache, query))
+        return _format_news(results)
     except Exception as e:
-        return f"Error searching news: {e}"
\ No newline at end of file
+        return f"Error searching news: {e}"
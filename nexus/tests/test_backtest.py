@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path so we can import 'indicators'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from indicators.backtest import (best_thresholds, evaluate, forward_returns, overlay, proxy_confidences,
+                                 signals, threshold_grid, verdict_scores, weight_grid)
+
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.prices = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, size=(6, 300)), axis=1))
+        self.score = rng.uniform(0, 100, size=(6, 300))
+        self.fwd = forward_returns(self.prices, 10)
+
+    def test_forward_returns(self):
+        np.testing.assert_allclose(self.fwd[:, 0], self.prices[:, 10] / self.prices[:, 0] - 1)
+        self.assertTrue(np.isnan(self.fwd[:, -10:]).all())
+        self.assertFalse(np.isnan(self.fwd[:, :-10]).any())
+
+    def test_verdict_scores_match_the_formula(self):
+        weights = {"tech": 0.5, "fund": 0.2, "risk": 0.3}
+        score = verdict_scores(np.array([80.0]), np.array([60.0]), np.array([30.0]), weights)
+        self.assertAlmostEqual(score[0], 80 * 0.5 + 60 * 0.2 + (100 - 30) * 0.3)
+
+    def test_signal_thresholds_are_inclusive(self):
+        self.assertEqual(list(signals([70.0, 69.9, 40.1, 40.0], 70, 40)), [1, 0, 0, -1])
+
+    def test_grid_matches_evaluate(self):
+        grid = threshold_grid(self.score, self.fwd, [60, 70], [30, 40])
+        for i, buy in enumerate([60, 70]):
+            for j, sell in enumerate([30, 40]):
+                stats = evaluate(self.score, self.fwd, buy, sell)
+                self.assertEqual(grid["buy_count"][i], stats["buy"]["count"])
+                self.assertEqual(grid["sell_count"][j], stats["sell"]["count"])
+                self.assertAlmostEqual(grid["spread"][i, j], stats["spread"], delta=1e-4)  # evaluate() rounds
+                self.assertAlmostEqual(grid["strategy"][i, j], stats["strategy_return"], delta=1e-4)
+
+    def test_best_thresholds_needs_both_sides(self):
+        grid = threshold_grid(self.score, self.fwd, [60, 101], [-1, 40])
+        best = best_thresholds(grid, min_count=10)
+        self.assertEqual((best["buy"], best["sell"]), (60.0, 40.0))
+        self.assertIsNone(best_thresholds(grid, min_count=10_000)["buy"])
+
+    def test_mask_limits_samples(self):
+        mask = np.zeros_like(self.score, dtype=bool)
+        mask[0, :50] = True
+        self.assertEqual(evaluate(self.score, self.fwd, 70, 40, mask)["samples"], 50)
+
+    def test_proxies_and_overlay(self):
+        proxy = proxy_confidences(self.prices)
+        self.assertTrue(np.isnan(proxy["tech"][:, :49]).all())
+        self.assertTrue(((proxy["danger"][:, 60:] >= 0) & (proxy["danger"][:, 60:] <= 100)).all())
+
+        council = {k: np.full_like(v, np.nan) for k, v in proxy.items()}
+        council["tech"][2, 100] = council["fund"][2, 100] = council["danger"][2, 100] = 77.0
+        merged = overlay(proxy, council)
+        self.assertEqual(merged["tech"][2, 100], 77.0)
+        self.assertEqual(merged["tech"][2, 101], proxy["tech"][2, 101])
+
+    def test_weight_grid(self):
+        grid = weight_grid(0.1)
+        self.assertEqual(grid.shape, (66, 3))
+        np.testing.assert_allclose(grid.sum(axis=1), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the path so we can import 'indicators'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from indicators.rsi import calculate_rsi
+from indicators.sma import calculate_sma
+from indicators.batch import batch_sma, batch_rsi, batch_uptrend, batch_indicators
+
+
+class TestBatchIndicators(unittest.TestCase):
+
+    def setUp(self):
+        # 5 random-walk tickers x 120 bars
+        rng = np.random.default_rng(7)
+        self.prices = 100 + np.cumsum(rng.normal(0, 1, size=(5, 120)), axis=1)
+
+    def test_sma_matches_single_series(self):
+        last = batch_sma(self.prices, 20, last=True)
+        for i, row in enumerate(self.prices):
+            self.assertAlmostEqual(last[i], calculate_sma(pd.Series(row), 20), places=8)
+
+    def test_rsi_matches_single_series(self):
+        last = batch_rsi(self.prices, 14, last=True)
+        for i, row in enumerate(self.prices):
+            self.assertAlmostEqual(round(last[i], 2), calculate_rsi(pd.Series(row), 14), places=6)
+
+    def test_full_series_shape(self):
+        self.assertEqual(batch_rsi(self.prices).shape, self.prices.shape)
+        self.assertTrue(np.isnan(batch_sma(self.prices, 50)[:, :49]).all())
+
+    def test_short_history_is_padded_not_mixed(self):
+        padded = self.prices.copy()
+        padded[0, :60] = np.nan  # Ticker 0 only has 60 bars
+        rsi = batch_rsi(padded, 14, last=True)
+        expected = calculate_rsi(pd.Series(padded[0, 60:]), 14)
+        self.assertAlmostEqual(round(rsi[0], 2), expected, places=6)
+        self.assertTrue(np.isnan(batch_sma(padded, 100, last=True)[0]))
+        self.assertFalse(batch_uptrend(padded, 100, last=True)[0])
+
+    def test_batch_indicators_keys(self):
+        out = batch_indicators(self.prices)
+        self.assertEqual(set(out), {"price", "rsi", "sma_20", "sma_50", "is_uptrend"})
+        self.assertEqual(out["is_uptrend"].dtype, bool)
+        np.testing.assert_array_equal(out["is_uptrend"], out["price"] > out["sma_50"])
+
+
+if __name__ == '__main__':
+    unittest.main()
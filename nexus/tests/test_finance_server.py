@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import pandas as pd
+
+# finance_server imports the caches as 'nexus.cache', so the repo root must be importable
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(ROOT_DIR)
+
+from nexus.cache import fundamentals, history
+from nexus.cache.fundamentals import FundamentalsCache
+from nexus.cache.history import HistoryCache
+from nexus.servers import finance_server
+
+
+def fake_history(ticker, interval, period=None, start=None):
+    """Daily bars up to today; BAD fails, NANV has no volume on the last bar."""
+    if ticker == "BAD":
+        raise RuntimeError("Yahoo is down")
+    index = pd.date_range(end=pd.Timestamp.now(tz="America/New_York").normalize(), periods=120, freq="D")
+    closes = [50.0 + i * (2 if ticker == "UP" else 1) for i in range(len(index))]
+    volume = [1000.0] * len(index)
+    if ticker == "NANV":
+        volume[-1] = float("nan")
+    return pd.DataFrame({"Open": closes, "High": closes, "Low": closes, "Close": closes,
+                         "Volume": volume}, index=index)
+
+
+def fake_info(ticker):
+    if ticker == "BAD":
+        raise RuntimeError("Yahoo is down")
+    return {"marketCap": 1e9, "trailingPE": 20.0, "sector": "Technology"}
+
+
+class TestFinanceServer(unittest.TestCase):
+
+    def test_failures_are_never_memoized(self):
+        for failure in ["ERROR: News search is currently rate-limited by DuckDuckGo.",
+                        "Error: No data found for ticker ZZZZ",
+                        "Tech Tool Error: boom", "Fund Tool Error: boom", "News Tool Error: boom",
+                        "Batch Tech Tool Error: boom", "No recent news found. Market may be quiet or search blocked."]:
+            self.assertFalse(finance_server._succeeded(failure), failure)
+
+    def test_results_mentioning_errors_are_memoized(self):
+        self.assertTrue(finance_server._succeeded("Price: $10.00\nTrend: Bullish"))
+        self.assertTrue(finance_server._succeeded("- Chipmaker fixes rounding error in guidance (https://x)"))
+
+
+class TestBatchTools(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.caches = history.history_cache, fundamentals.fundamentals_cache
+        # No bulk download: every ticker goes through the per-ticker fetcher
+        history.history_cache = HistoryCache(cache_dir=self.tmp.name, fetcher=fake_history,
+                                             bulk_fetcher=lambda tickers, interval, period: {})
+        fundamentals.fundamentals_cache = FundamentalsCache(cache_dir=self.tmp.name, fetcher=fake_info)
+
+    def tearDown(self):
+        history.history_cache, fundamentals.fundamentals_cache = self.caches
+        self.tmp.cleanup()
+
+    def test_analyze_batch_isolates_failures_and_keeps_order(self):
+        out = json.loads(finance_server.analyze_stocks_batch(["up", "BAD", "NANV", "FLAT"]))
+        self.assertEqual(list(out), ["UP", "BAD", "NANV", "FLAT"])
+        self.assertIn("Yahoo is down", out["BAD"]["error"])
+        self.assertEqual(out["UP"]["volume"], 1000)
+        self.assertIsNone(out["NANV"]["volume"])
+        self.assertEqual(out["NANV"]["price"], out["FLAT"]["price"])
+        self.assertGreater(out["UP"]["price"], out["FLAT"]["price"])
+
+    def test_fundamentals_batch_isolates_failures_and_keeps_order(self):
+        out = json.loads(finance_server.get_fundamentals_batch(["BAD", "msft", "AAPL"]))
+        self.assertEqual(list(out), ["BAD", "MSFT", "AAPL"])
+        self.assertIn("Yahoo is down", out["BAD"]["error"])
+        self.assertEqual(out["MSFT"]["market_cap"], 1e9)
+        self.assertIsNone(out["AAPL"]["margins"])
+
+
+if __name__ == '__main__':
+    unittest.main()
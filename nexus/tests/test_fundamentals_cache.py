@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+
+# Add the parent directory to the path so we can import 'cache'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cache.fundamentals import FundamentalsCache
+
+
+class FakeInfo:
+    """Stands in for Ticker.info; each call can return a different dict."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.done = threading.Event()
+
+    def __call__(self, ticker):
+        resp = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        self.done.set()
+        return resp
+
+
+INFO = {"sector": "Technology", "marketCap": 100, "trailingPE": 30.0,
+        "profitMargins": 0.5, "debtToEquity": 10.0, "longBusinessSummary": "..."}
+
+
+class TestFundamentalsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_snapshot_keeps_only_used_fields(self):
+        cache = FundamentalsCache(cache_dir=self.tmp.name, fetcher=FakeInfo(INFO))
+        snap = cache.get("nvda")
+        self.assertEqual(snap["trailingPE"], 30.0)
+        self.assertNotIn("longBusinessSummary", snap)
+
+    def test_warm_snapshot_is_served_from_disk(self):
+        fetcher = FakeInfo(INFO)
+        FundamentalsCache(cache_dir=self.tmp.name, fetcher=fetcher).get("NVDA")
+        restarted = FundamentalsCache(cache_dir=self.tmp.name, fetcher=fetcher)
+        self.assertEqual(restarted.get("NVDA")["sector"], "Technology")
+        self.assertEqual(fetcher.calls, 1)
+
+    def test_stale_field_is_served_then_revalidated(self):
+        newer = dict(INFO, trailingPE=35.0)
+        del newer["sector"], newer["profitMargins"]  # Yahoo sometimes omits fields
+        fetcher = FakeInfo(INFO, newer)
+        cache = FundamentalsCache(cache_dir=self.tmp.name, fetcher=fetcher,
+                                  field_ttl={"trailingPE": -1, "sector": -1})
+        cache.get("NVDA")
+        fetcher.done.clear()
+
+        stale = cache.get("NVDA")
+        self.assertEqual(stale["trailingPE"], 30.0)  # Old value, no waiting
+        self.assertTrue(fetcher.done.wait(timeout=5))
+        self.wait_for_refresh(cache)
+
+        fresh = cache.get("NVDA")
+        self.wait_for_refresh(cache)
+        self.assertEqual(fresh["trailingPE"], 35.0)
+        self.assertEqual(fresh["profitMargins"], 0.5)  # Omitted, but still within its TTL
+        self.assertNotIn("sector", fresh)               # Omitted past its TTL: expired, not kept forever
+        self.assertIn("sector", cache._snapshots["NVDA"]["missing"])
+
+    def test_dropped_field_expires(self):
+        loss_making = dict(INFO)
+        del loss_making["trailingPE"]  # Yahoo drops trailingPE once earnings turn negative
+        fetcher = FakeInfo(INFO, loss_making)
+        cache = FundamentalsCache(cache_dir=self.tmp.name, fetcher=fetcher, max_age=-1)  # Every read refetches
+        self.assertEqual(cache.get("NVDA")["trailingPE"], 30.0)
+        cache._snapshots["NVDA"]["fetched_at"]["trailingPE"] -= 3600  # Past its 15 minute TTL
+        self.assertNotIn("trailingPE", cache.get("NVDA"))
+
+    def test_field_yahoo_never_supplies_is_not_refetched(self):
+        bank = dict(INFO)
+        del bank["debtToEquity"]  # Yahoo has no D/E for banks
+        fetcher = FakeInfo(bank)
+        cache = FundamentalsCache(cache_dir=self.tmp.name, fetcher=fetcher)
+        self.assertNotIn("debtToEquity", cache.get("JPM"))
+        cache.get("JPM")
+        self.wait_for_refresh(cache)
+        self.assertEqual(fetcher.calls, 1)  # No background refresh for the absent field
+        self.assertEqual(cache._snapshots["JPM"]["missing"], ["debtToEquity"])
+
+    def wait_for_refresh(self, cache):
+        for _ in range(500):
+            if not cache._refreshing:
+                return
+            threading.Event().wait(0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
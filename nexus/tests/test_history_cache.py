@@ -0,0 +1,131 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+# Add the parent directory to the path so we can import 'cache'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cache.history import HistoryCache
+
+
+class FakeFetcher:
+    """Stands in for Yahoo: daily bars up to today, recording every call.
+
+    A bar's close depends only on its date, so a later start returns a suffix of the
+    same series; `adjust` scales every bar, like a split re-basing adjusted history.
+    """
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.adjust = 1.0
+        self.delay = delay
+
+    def __call__(self, ticker, interval, period=None, start=None):
+        self.calls.append({"period": period, "start": start})
+        time.sleep(self.delay)
+        end = pd.Timestamp.now(tz="America/New_York").normalize()
+        begin = pd.Timestamp(start).normalize() if start is not None else end - pd.Timedelta(days=400)
+        index = pd.date_range(begin, end, freq="D", tz="America/New_York")
+        closes = [(100.0 + d.toordinal() % 1000) * self.adjust for d in index]
+        return pd.DataFrame({
+            "Open": closes, "High": closes, "Low": closes, "Close": closes,
+            "Volume": [1000] * len(index)
+        }, index=index)
+
+
+class TestHistoryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fetcher = FakeFetcher()
+        self.cache = HistoryCache(cache_dir=self.tmp.name, fetcher=self.fetcher)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_repeat_call_is_served_from_memory(self):
+        first = self.cache.get("nvda", period="1y")
+        second = self.cache.get("NVDA", period="1y")
+        self.assertEqual(len(self.fetcher.calls), 1)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_shorter_period_is_a_slice_of_cached_history(self):
+        year = self.cache.get("NVDA", period="1y")
+        month = self.cache.get("NVDA", period="1mo")
+        self.assertEqual(len(self.fetcher.calls), 1)
+        self.assertLess(len(month), len(year))
+        self.assertEqual(month["Close"].iloc[-1], year["Close"].iloc[-1])
+
+    def test_disk_store_survives_restart(self):
+        self.cache.get("NVDA", period="1y")
+        restarted = HistoryCache(cache_dir=self.tmp.name, fetcher=self.fetcher)
+        frame = restarted.get("NVDA", period="1y")
+        self.assertEqual(len(self.fetcher.calls), 1)
+        self.assertEqual(frame["Volume"].dtype.kind, "i")
+        self.assertEqual(str(frame.index.tz), "America/New_York")
+
+    def test_stale_entry_tops_up_from_last_bar(self):
+        full = self.cache.get("NVDA", period="1y")
+        stale = self.cache._lru[("NVDA", "1d")]
+        stale.fetched_at = 0  # Force staleness, in memory and on disk
+        self.cache._save(("NVDA", "1d"), stale)
+        topped = self.cache.get("NVDA", period="1y")
+        self.assertEqual(len(self.fetcher.calls), 2)
+        self.assertIsNone(self.fetcher.calls[1]["period"])
+        self.assertIsNotNone(self.fetcher.calls[1]["start"])
+        self.assertEqual(len(topped), len(full))
+
+    def make_stale(self, key=("NVDA", "1d")):
+        stale = self.cache._lru[key]
+        stale.fetched_at = 0  # Force staleness, in memory and on disk
+        self.cache._save(key, stale)
+
+    def test_readjusted_history_is_refetched_whole(self):
+        self.cache.get("NVDA", period="1y")
+        self.make_stale()
+        self.fetcher.adjust = 0.5  # 2:1 split: Yahoo re-bases every adjusted bar
+        frame = self.cache.get("NVDA", period="1y")
+        self.assertIsNotNone(self.fetcher.calls[1]["start"])  # Top-up tried first...
+        self.assertIsNotNone(self.fetcher.calls[2]["period"])  # ...then the full period
+        expected = self.fetcher("NVDA", "1d", period="1y")["Close"]
+        self.assertAlmostEqual(frame["Close"].iloc[0], expected.loc[frame.index[0]])
+
+    def test_concurrent_stale_reads_share_one_refresh(self):
+        self.cache.get("NVDA", period="1y")
+        self.make_stale()
+        self.fetcher.delay = 0.1
+        threads = [threading.Thread(target=self.cache.get, args=("NVDA", "1y")) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(self.fetcher.calls), 2)
+        self.assertEqual((self.cache.misses, self.cache.hits), (2, 7))
+
+    def test_prefetch_is_one_bulk_call(self):
+        bulk_calls = []
+
+        def bulk(tickers, interval, period):
+            bulk_calls.append(list(tickers))
+            frame = self.fetcher("X", interval, period=period)
+            frame.index = frame.index.tz_localize(None)  # yf.download may return naive dates
+            return {t: frame for t in tickers}
+
+        self.cache.bulk_fetcher = bulk
+        self.cache.get("AAPL", period="1y")
+        loaded = self.cache.prefetch(["nvda", "AAPL", "MSFT", "NVDA"], period="1y")
+        self.assertEqual(loaded, ["NVDA", "AAPL", "MSFT"])
+        self.assertEqual(bulk_calls, [["NVDA", "MSFT"]])  # AAPL was already fresh
+
+        fetches = len(self.fetcher.calls)
+        self.cache.get("MSFT", period="1mo")
+        self.assertEqual(len(self.fetcher.calls), fetches)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,8 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from indicators.rsi import calculate_rsi
+from indicators.sma import calculate_sma
+from indicators.incremental import IncrementalSMA, IncrementalRSI
 
 class TestIndicators(unittest.TestCase):
     
@@ -38,5 +40,55 @@ class TestIndicators(unittest.TestCase):
         # Usually implies stability
         self.assertIsNotNone(rsi)
 
+class TestIncrementalIndicators(unittest.TestCase):
+
+    # A choppy series so both gains and losses show up in every window
+    PRICES = [100 + ((i * 7) % 11) - ((i * 3) % 5) + i * 0.25 for i in range(60)]
+
+    def test_sma_matches_batch_at_every_bar(self):
+        sma = IncrementalSMA(20)
+        for i, price in enumerate(self.PRICES):
+            value = sma.update(price)
+            if i + 1 < 20:
+                self.assertIsNone(value)
+            else:
+                self.assertAlmostEqual(value, calculate_sma(self.PRICES[:i + 1], 20), places=9)
+
+    def test_simple_rsi_matches_batch_at_every_bar(self):
+        rsi = IncrementalRSI(14, smoothing="simple")
+        for i, price in enumerate(self.PRICES):
+            value = rsi.update(price)
+            if i + 1 >= 14:
+                self.assertAlmostEqual(round(value, 2), calculate_rsi(self.PRICES[:i + 1], 14), places=6)
+
+    def test_wilder_rsi_extremes(self):
+        up, down = IncrementalRSI(14), IncrementalRSI(14)
+        for i in range(1, 21):
+            up.update(float(i))
+            down.update(float(21 - i))
+        self.assertEqual(up.value, 100.0)
+        self.assertEqual(down.value, 0.0)
+
+    def test_wilder_rsi_smoothing(self):
+        rsi = IncrementalRSI(14)
+        for price in self.PRICES:
+            rsi.update(price)
+        # Reference: seed with the plain mean of the first 14 moves, then Wilder-smooth
+        deltas = [b - a for a, b in zip(self.PRICES, self.PRICES[1:])]
+        avg_gain = sum(max(d, 0) for d in deltas[:14]) / 14
+        avg_loss = sum(max(-d, 0) for d in deltas[:14]) / 14
+        for d in deltas[14:]:
+            avg_gain = (avg_gain * 13 + max(d, 0)) / 14
+            avg_loss = (avg_loss * 13 + max(-d, 0)) / 14
+        self.assertAlmostEqual(rsi.value, 100 - 100 / (1 + avg_gain / avg_loss), places=9)
+
+    def test_state_round_trip_resumes(self):
+        for ind in (IncrementalSMA(20), IncrementalRSI(14), IncrementalRSI(14, smoothing="simple")):
+            for price in self.PRICES[:40]:
+                ind.update(price)
+            resumed = type(ind).from_dict(ind.to_dict())
+            for price in self.PRICES[40:]:
+                self.assertAlmostEqual(resumed.update(price), ind.update(price), places=9)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
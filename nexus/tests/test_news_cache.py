@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the parent directory to the path so we can import 'cache'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cache.news import NewsCache, normalize_query
+
+RESULTS = [
+    {"title": "NVDA probe", "href": "https://a.com/1", "body": "..."},
+    {"title": "NVDA probe (syndicated)", "href": "https://a.com/1", "body": "..."},
+    {"title": "NVDA order", "href": "https://b.com/2", "body": "..."},
+]
+
+
+class TestNewsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.calls = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def search(self, query, max_results):
+        self.calls += 1
+        return RESULTS
+
+    def test_normalized_queries_share_an_entry(self):
+        self.assertEqual(normalize_query("NVDA  stock Risk"), normalize_query("risk nvda stock"))
+        cache = NewsCache(cache_dir=self.tmp.name)
+        cache.search("NVDA stock risk", 3, self.search)
+        cache.search("  risk NVDA   stock ", 3, self.search)
+        self.assertEqual(self.calls, 1)
+
+    def test_results_are_deduplicated_by_url(self):
+        cache = NewsCache(cache_dir=self.tmp.name)
+        results = cache.search("NVDA", 3, self.search)
+        self.assertEqual([r["href"] for r in results], ["https://a.com/1", "https://b.com/2"])
+
+    def test_entries_persist_and_expire(self):
+        NewsCache(cache_dir=self.tmp.name).search("NVDA", 3, self.search)
+        self.assertIsNotNone(NewsCache(cache_dir=self.tmp.name).get("NVDA", 3))
+        self.assertIsNone(NewsCache(cache_dir=self.tmp.name, ttl=-1).get("NVDA", 3))
+
+    def test_processes_sharing_the_file_keep_each_others_entries(self):
+        api = NewsCache(cache_dir=self.tmp.name)
+        worker = NewsCache(cache_dir=self.tmp.name)
+        api.get("NVDA", 3)     # Both loaded the (empty) file before either saved
+        worker.get("AMD", 3)
+        api.put("NVDA", 3, RESULTS)
+        worker.put("AMD", 3, [{"title": "AMD order", "href": "https://c.com/3"}])
+
+        restarted = NewsCache(cache_dir=self.tmp.name)
+        self.assertEqual(len(restarted.get("NVDA", 3)), 2)
+        self.assertEqual(restarted.get("AMD", 3)[0]["title"], "AMD order")
+
+
+if __name__ == '__main__':
+    unittest.main()
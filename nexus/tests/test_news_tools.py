@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+import time
+
+# tools.py imports its dependencies as 'nexus.*', so the repo root must be importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from nexus.cache.news import NewsCache
+from nexus.cache.ratelimit import AdaptiveRateLimiter
+from nexus.servers import tools
+
+
+class FakeDDGS:
+    """Stands in for DuckDuckGo: one slow search per call, recording every query."""
+    queries = []
+
+    def text(self, query, max_results=3):
+        FakeDDGS.queries.append(query)
+        time.sleep(0.1)
+        return [{"title": f"{query} headline", "href": f"https://news.example/{len(FakeDDGS.queries)}"}]
+
+
+class TestAsyncMarketNews(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = tools.DDGS, tools.news_cache, tools.news_limiter
+        FakeDDGS.queries = []
+        tools.DDGS = FakeDDGS
+        tools.news_cache = NewsCache(cache_dir=self.tmp.name)
+        tools.news_limiter = AdaptiveRateLimiter("test", rate=5, burst=1)
+
+    def tearDown(self):
+        tools.DDGS, tools.news_cache, tools.news_limiter = self.saved
+        self.tmp.cleanup()
+
+    def cancel_after(self, query, delay):
+        async def main():
+            task = asyncio.create_task(tools.aget_market_news(query))
+            await asyncio.sleep(delay)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await asyncio.sleep(0.2)  # Room for a shielded search to finish
+        asyncio.run(main())
+
+    def test_cancelled_while_waiting_for_a_token_never_searches(self):
+        tools.news_limiter.acquire()  # Bucket empty: the next call waits ~0.2s
+        self.cancel_after("NVDA risk", 0.05)
+        self.assertEqual(FakeDDGS.queries, [])
+        self.assertGreater(tools.news_limiter.tokens, -0.5)  # The token went back
+        self.assertIsNone(tools.news_cache.get("NVDA risk", 3))
+
+    def test_cancelled_mid_search_still_fills_the_cache(self):
+        self.cancel_after("NVDA risk", 0.05)
+        self.assertEqual(FakeDDGS.queries, ["NVDA risk"])
+        self.assertEqual(tools.news_cache.get("NVDA risk", 3)[0]["title"], "NVDA risk headline")
+
+    def test_cached_query_skips_the_limiter(self):
+        self.assertIn("NVDA risk headline", asyncio.run(tools.aget_market_news("NVDA risk")))
+        self.assertIn("NVDA risk headline", asyncio.run(tools.aget_market_news("risk  nvda")))
+        self.assertEqual(len(FakeDDGS.queries), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+import time
+
+# Add the parent directory to the path so we can import 'cache'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cache.ratelimit import AdaptiveRateLimiter, is_throttled
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+
+    def test_burst_is_free_then_paced(self):
+        limiter = AdaptiveRateLimiter("test", rate=20, burst=3)
+        waits = [limiter.acquire() for _ in range(3)]
+        self.assertEqual(waits, [0.0, 0.0, 0.0])
+
+        start = time.monotonic()
+        self.assertGreater(limiter.acquire(), 0)
+        self.assertGreaterEqual(time.monotonic() - start, 0.03)  # ~1/20s for the next token
+
+    def test_throttle_halves_rate_and_cools_down(self):
+        limiter = AdaptiveRateLimiter("test", rate=10, burst=5, backoff=0.1)
+        limiter.throttled()
+        self.assertEqual(limiter.rate, 5)
+        self.assertGreaterEqual(limiter.acquire(), 0.09)  # Cooldown applies even with tokens left
+        self.assertAlmostEqual(limiter.backoff, 0.2)       # Next throttle waits longer
+
+    def test_recovers_after_successes(self):
+        limiter = AdaptiveRateLimiter("test", rate=8, burst=5, backoff=0.0, recover_after=2)
+        limiter.throttled()
+        limiter.throttled()
+        self.assertEqual(limiter.rate, 2)
+        for _ in range(10):
+            limiter.succeeded()
+        self.assertEqual(limiter.rate, 8)  # Never above the configured rate
+        self.assertEqual(limiter.backoff, 0.0)
+
+    def test_call_feeds_back_throttles(self):
+        limiter = AdaptiveRateLimiter("test", rate=100, burst=5, backoff=0.0)
+
+        def blocked():
+            raise RuntimeError("https://html.duckduckgo.com/html 202 Ratelimit")
+
+        with self.assertRaises(RuntimeError):
+            limiter.call(blocked)
+        self.assertEqual(limiter.throttles, 1)
+
+        with self.assertRaises(ValueError):
+            limiter.call(lambda: (_ for _ in ()).throw(ValueError("bad ticker")))
+        self.assertEqual(limiter.throttles, 1)  # Ordinary errors are not throttles
+
+    def test_async_waits_without_blocking_the_loop(self):
+        limiter = AdaptiveRateLimiter("test", rate=10, burst=1)
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            results = [await limiter.acall(lambda i=i: i) for i in range(3)]
+            task.cancel()
+            return results, ticks
+
+        results, ticks = asyncio.run(main())
+        self.assertEqual(results, [0, 1, 2])
+        self.assertGreater(ticks, 5)  # The loop kept running while we waited ~0.2s
+
+    def test_state_file_shares_one_budget(self):
+        # Two limiters on one state file behave like the API process and an MCP subprocess
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ratelimit", "test.json")
+            api = AdaptiveRateLimiter("test", rate=10, burst=2, backoff=0.5, state_path=path)
+            worker = AdaptiveRateLimiter("test", rate=10, burst=2, backoff=0.5, state_path=path)
+            self.assertEqual([api.acquire(), worker.acquire()], [0.0, 0.0])
+            self.assertGreater(api._reserve(), 0)  # The burst is spent host-wide
+
+            worker.throttled()
+            self.assertGreaterEqual(api._reserve(), 0.4)  # One process's throttle slows the other
+            self.assertEqual(api.rate, 5)
+
+    def test_is_throttled(self):
+        self.assertTrue(is_throttled("Too Many Requests. Rate limited. Try after a while."))
+        self.assertTrue(is_throttled(Exception("DDG returned 202 Ratelimit")))
+        self.assertFalse(is_throttled("No data found for ticker"))
+
+    def test_status_codes_need_an_http_context(self):
+        self.assertTrue(is_throttled("429 Client Error: Too Many Requests for url"))
+        self.assertTrue(is_throttled("HTTP 429"))
+        self.assertTrue(is_throttled("https://html.duckduckgo.com/html status: 202"))
+        self.assertFalse(is_throttled("no price data found (1d 2024-10-17 -> 2025-10-17)"))
+        self.assertFalse(is_throttled("AAPL closed at 202.50"))
+
+        class StatusError(Exception):
+            status_code = 429
+
+        self.assertTrue(is_throttled(StatusError("request failed")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add the parent directory to the path so we can import 'servers'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from servers.registry import ToolRegistry
+
+
+class TestToolRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ToolRegistry()
+        self.calls = 0
+
+    def test_sync_call_and_unknown_tool(self):
+        @self.registry.register("add")
+        def add(a, b):
+            return a + b
+
+        self.assertEqual(self.registry.call("add", a=2, b=3), 5)
+        self.assertEqual(self.registry.list_tools(), ["add"])
+        with self.assertRaises(ValueError):
+            self.registry.call("missing")
+
+    def test_exceptions_become_failures(self):
+        @self.registry.register("boom")
+        def boom():
+            raise RuntimeError("yahoo down")
+
+        self.assertEqual(self.registry.call("boom"), {"error": "yahoo down", "status": "failed"})
+
+    def test_timeout(self):
+        @self.registry.register("slow", timeout=0.05)
+        def slow():
+            time.sleep(0.5)
+            return "late"
+
+        start = time.monotonic()
+        result = self.registry.call("slow")
+        self.assertEqual(result["status"], "failed")
+        self.assertIn("timed out", result["error"])
+        self.assertLess(time.monotonic() - start, 0.4)
+
+    def test_ttl_memoization_respects_cache_if(self):
+        @self.registry.register("quote", ttl=60, cache_if=lambda r: "Error" not in r)
+        def quote(ticker):
+            self.calls += 1
+            return "Error: blocked" if ticker == "BAD" else f"{ticker} 100"
+
+        self.registry.call("quote", ticker="NVDA")
+        self.registry.call("quote", ticker="NVDA")
+        self.assertEqual(self.calls, 1)
+
+        self.registry.call("quote", ticker="BAD")
+        self.registry.call("quote", ticker="BAD")
+        self.assertEqual(self.calls, 3)
+
+    def test_ttl_expiry(self):
+        @self.registry.register("quote", ttl=0.05)
+        def quote():
+            self.calls += 1
+            return self.calls
+
+        self.assertEqual(self.registry.call("quote"), 1)
+        time.sleep(0.06)
+        self.assertEqual(self.registry.call("quote"), 2)
+
+    def test_max_concurrency(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        @self.registry.register("fetch", max_concurrency=2)
+        def fetch(i):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+            return i
+
+        results = self.registry.call_many([("fetch", {"i": i}) for i in range(6)])
+        self.assertEqual(results, list(range(6)))  # In order
+        self.assertEqual(state["peak"], 2)
+
+    def test_async_tool_sync_and_async_paths(self):
+        @self.registry.register("news", timeout=1)
+        async def news(query):
+            await asyncio.sleep(0.01)
+            return f"- {query}"
+
+        self.assertEqual(self.registry.call("news", query="NVDA"), "- NVDA")
+        self.assertEqual(asyncio.run(self.registry.acall("news", query="TSLA")), "- TSLA")
+
+    def test_acall_many_runs_concurrently_in_order(self):
+        @self.registry.register("slow")
+        async def slow(i):
+            await asyncio.sleep(0.1 - i * 0.02)
+            return i
+
+        start = time.monotonic()
+        results = asyncio.run(self.registry.acall_many([("slow", {"i": i}) for i in range(4)]))
+        self.assertEqual(results, [0, 1, 2, 3])
+        self.assertLess(time.monotonic() - start, 0.25)
+
+    def test_concurrent_identical_acalls_share_one_run(self):
+        @self.registry.register("info", ttl=60)
+        def info(ticker):
+            self.calls += 1
+            time.sleep(0.05)
+            return {"sector": "Technology"}
+
+        async def main():
+            return await asyncio.gather(*(self.registry.acall("info", ticker="NVDA") for _ in range(5)))
+
+        results = asyncio.run(main())
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(r == {"sector": "Technology"} for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
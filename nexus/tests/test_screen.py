@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add the parent directory to the path so we can import 'indicators'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from indicators.screen import fundamentals_arrays, load_rules, merge_rules, rank, score_universe
+
+
+class TestScreen(unittest.TestCase):
+
+    def setUp(self):
+        bars = np.arange(120, dtype="float64")
+        wiggle = np.where(bars % 2 == 0, 0.5, -0.5)  # Keeps RSI defined and away from 0/100
+        self.prices = np.vstack([
+            100 + 0.2 * bars + wiggle,   # 0: steady uptrend
+            200 - 0.2 * bars + wiggle,   # 1: steady downtrend
+            3 + 0.01 * bars + wiggle,    # 2: penny stock
+            np.full(120, 50.0) + wiggle, # 3: flat
+        ])
+        self.rows = [
+            {"market_cap": 5e10, "pe_ratio": 15, "margins": 0.25, "debt_equity": 40, "sector": "Technology"},
+            {"market_cap": 5e10, "pe_ratio": 15, "margins": 0.25, "debt_equity": 40, "sector": "Energy"},
+            {"market_cap": 1e8, "pe_ratio": None, "margins": None, "debt_equity": None, "sector": None},
+            {"market_cap": 5e10, "pe_ratio": 150, "margins": 0.05, "debt_equity": 300, "sector": "Technology"},
+        ]
+
+    def test_technical_factors_rank_trend_first(self):
+        scored = score_universe(self.prices, rules=merge_rules({"filters": {"rsi_min": None, "rsi_max": None}}))
+        self.assertGreater(scored["trend_score"][0], scored["trend_score"][3])  # Above the flat one...
+        self.assertLess(scored["trend_score"][1], scored["trend_score"][3])     # ...and the downtrend below
+        self.assertEqual(rank(scored["score"], scored["passed"])[0], 0)
+        self.assertFalse(scored["passed"][2])  # Below min_price
+
+    def test_fundamental_filters_and_neutral_gaps(self):
+        fund = fundamentals_arrays(self.rows)
+        rules = merge_rules({"filters": {"rsi_min": None, "rsi_max": None}})
+        scored = score_universe(self.prices, fund, rules)
+        self.assertTrue(np.isnan(fund["pe_ratio"][2]))
+        self.assertEqual(scored["margins_score"][2], 50.0)  # Missing: neutral
+        self.assertEqual(scored["value_score"][2], 0.0)     # No P/E: no value support
+        self.assertFalse(scored["passed"][3])               # P/E above max_pe
+
+        rules["filters"]["sectors"] = ["Energy"]
+        self.assertEqual(list(np.flatnonzero(score_universe(self.prices, fund, rules)["passed"])), [1])
+
+    def test_short_history_passes_price_filters_but_not_uptrend(self):
+        prices = self.prices.copy()
+        prices[0, :100] = np.nan  # Only 20 bars: no SMA 50
+        scored = score_universe(prices, rules=merge_rules({"filters": {"rsi_min": None, "rsi_max": None}}))
+        self.assertEqual(scored["trend_score"][0], 0.0)
+        self.assertTrue(scored["passed"][0])  # Price filters still apply...
+        with_trend = merge_rules({"filters": {"require_uptrend": True, "rsi_min": None, "rsi_max": None}})
+        self.assertFalse(score_universe(prices, rules=with_trend)["passed"][0])  # ...uptrend needs the SMA
+
+    def test_weights_renormalize(self):
+        only_trend = merge_rules({"weights": {"trend": 2, "momentum": 0, "rsi": 0}})
+        scored = score_universe(self.prices, rules=only_trend)
+        np.testing.assert_allclose(scored["score"], scored["trend_score"])
+
+    def test_rank_top_n(self):
+        score = np.array([10.0, 90.0, 50.0, 90.0])
+        passed = np.array([True, True, False, True])
+        self.assertEqual(list(rank(score, passed)), [1, 3, 0])
+        self.assertEqual(list(rank(score, passed, top_n=1)), [1])
+
+    def test_rules_validation(self):
+        with self.assertRaises(ValueError):
+            merge_rules({"weights": {"dividends": 1}})
+        with self.assertRaises(ValueError):
+            merge_rules({"filters": 5})
+        for bad in [{"weights": {"trend": "x"}}, {"weights": {"rsi": True}}, {"weights": {"value": -1}},
+                    {"filters": {"min_price": "5"}}, {"filters": {"sectors": "Energy"}},
+                    {"filters": {"sectors": [1]}}, {"filters": {"require_uptrend": 1}}, {"rsi_target": None}]:
+            with self.assertRaises(ValueError, msg=bad):
+                merge_rules(bad)
+        rules = load_rules('{"rsi_target": 60, "filters": {"max_pe": null}}')
+        self.assertEqual(rules["rsi_target"], 60)
+        self.assertIsNone(rules["filters"]["max_pe"])
+        self.assertEqual(rules["filters"]["min_price"], 5.0)  # Defaults kept
+        # Request overrides stack on top of configured rules
+        stacked = merge_rules({"filters": {"min_price": 1.0}}, base=rules)
+        self.assertEqual((stacked["rsi_target"], stacked["filters"]["min_price"]), (60, 1.0))
+        self.assertIsNone(stacked["filters"]["max_pe"])
+
+
+if __name__ == '__main__':
+    unittest.main()
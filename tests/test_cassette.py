@@ -0,0 +1,124 @@
+import unittest
+import sys
+import os
+import asyncio
+import gzip
+import json
+import shutil
+import tempfile
+
+# Add the repo root to the path so we can import 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.messages import AIMessage
+
+from agent.cassette import Cassette, CassetteMiss, decode_message, encode_message, is_error_response
+
+
+class TestCassette(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "cassette.json.gz")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_record_then_replay_without_calling_out(self):
+        recorder = Cassette(self.path, mode="record")
+        signature = ["get_technical_summary", {"ticker": "NVDA"}]
+        self.assertEqual(recorder.call("mcp", signature, lambda: "RSI 61"), "RSI 61")
+        reply = AIMessage(content='{"signal": "BUY"}', usage_metadata={"input_tokens": 5, "output_tokens": 3, "total_tokens": 8})
+
+        async def record_llm():
+            return reply
+
+        asyncio.run(recorder.acall("llm", ["prompt"], record_llm, encode=encode_message, decode=decode_message))
+        self.assertEqual(recorder.stats()["recorded"], 2)
+
+        def network():
+            raise AssertionError("replay went to the network")
+
+        async def anetwork():
+            network()
+
+        player = Cassette(self.path, mode="replay")
+        self.assertEqual(player.call("mcp", signature, network), "RSI 61")
+        message = asyncio.run(player.acall("llm", ["prompt"], anetwork, encode=encode_message, decode=decode_message))
+        self.assertEqual(message.content, reply.content)
+        self.assertEqual(message.usage_metadata["total_tokens"], 8)
+        self.assertEqual(player.tickers(), ["NVDA"])
+        self.assertEqual(player.hits, 2)
+
+    def test_unrecorded_call_misses(self):
+        Cassette(self.path, mode="record").call("news", ["NVDA stock news"], lambda: "headline")
+        player = Cassette(self.path, mode="replay")
+        with self.assertRaises(CassetteMiss):
+            player.call("news", ["AAPL stock news"], lambda: "live")
+
+    def test_signatures_ignore_dates(self):
+        Cassette(self.path, mode="record").call("news", ["NVDA news 2026-10-12 2026"], lambda: "headline")
+        player = Cassette(self.path, mode="replay")
+        self.assertEqual(player.call("news", ["NVDA news 2026-10-16 2027"], lambda: "live"), "headline")
+
+    def test_later_recording_of_a_call_wins(self):
+        Cassette(self.path, mode="record").call("mcp", ["t", {}], lambda: "old")
+        Cassette(self.path, mode="record").call("mcp", ["t", {}], lambda: "new")
+        self.assertEqual(Cassette(self.path, mode="replay").call("mcp", ["t", {}], lambda: "live"), "new")
+
+    def test_version_one_file_still_loads(self):
+        cassette = Cassette(self.path, mode="record")
+        key = cassette.key("mcp", ["t", {}])
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": {key: {"kind": "mcp", "ms": 1.0, "value": "v1"}}}, f)
+        Cassette(self.path, mode="record").call("mcp", ["u", {}], lambda: "v2")
+        player = Cassette(self.path, mode="replay")
+        self.assertEqual(player.call("mcp", ["t", {}], lambda: "live"), "v1")
+        self.assertEqual(player.call("mcp", ["u", {}], lambda: "live"), "v2")
+
+    def test_error_responses_are_not_recorded(self):
+        errors = [
+            "Error: MCP Server timed out.",
+            "ERROR: News search is currently rate-limited by DuckDuckGo.",
+            "Error in technical analysis: boom",
+            "Error fetching fundamentals: boom",
+            "Error searching news: boom",
+            "Tech Tool Error: boom",
+            "Batch Fund Tool Error: boom",
+            "News Tool Error: boom",
+            "MCP Tool Error: boom",
+            "Execution Failed: boom",
+            "Data Fetch Failed. Raw: ",
+        ]
+        recorder = Cassette(self.path, mode="record")
+        for i, text in enumerate(errors):
+            self.assertTrue(is_error_response(text), text)
+            recorder.call("mcp", ["t", {"i": i}], lambda: text)
+        self.assertEqual(recorder.stats()["recorded"], 0)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_data_mentioning_errors_is_recorded(self):
+        kept = [
+            "No error in filings; margins expanded.",
+            "Headline: Fed error sparks rally",
+            "Errors and omissions insurer beats estimates",
+            "Execution failed to dent the rally",
+        ]
+        recorder = Cassette(self.path, mode="record")
+        for i, text in enumerate(kept):
+            self.assertFalse(is_error_response(text), text)
+            recorder.call("news", [f"query {i}"], lambda: text)
+        self.assertEqual(recorder.stats()["recorded"], len(kept))
+        player = Cassette(self.path, mode="replay")
+        self.assertEqual(player.call("news", ["query 0"], lambda: "live"), kept[0])
+
+    def test_off_mode_passes_through(self):
+        cassette = Cassette(self.path, mode="off")
+        self.assertEqual(cassette.call("mcp", ["t", {}], lambda: "live"), "live")
+        self.assertFalse(os.path.exists(self.path))
+        with self.assertRaises(ValueError):
+            Cassette(self.path, mode="rewind")
+
+
+if __name__ == '__main__':
+    unittest.main()
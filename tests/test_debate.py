@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Add the repo root to the path so we can import 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent.debate import (DebateStore, debate_key, extract_debate, score_all_profiles, score_profile)
+from agent.final_verdict import calculate_verdict
+from nexus.cache.market import MARKET_TZ, trading_date
+
+DEBATE = {
+    "tech_thesis_final": "Uptrend holds", "tech_confidence_final": 80,
+    "fund_thesis_final": "Fairly valued", "fund_confidence_final": 55,
+    "risk_critique_tech": "Extended", "risk_danger_score": 35,
+}
+
+
+class TestDebate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = DebateStore(cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_is_ticker_and_trading_date(self):
+        friday_evening = datetime(2026, 10, 16, 18, 0, tzinfo=MARKET_TZ)
+        saturday = datetime(2026, 10, 17, 12, 0, tzinfo=MARKET_TZ)
+        monday_premarket = datetime(2026, 10, 19, 8, 0, tzinfo=MARKET_TZ)
+        self.assertEqual(debate_key(" nvda "), debate_key("NVDA"))
+        # Friday after the close, the weekend and Monday before the open all reuse Friday's debate
+        self.assertEqual({trading_date(t) for t in (friday_evening, saturday, monday_premarket)}, {"2026-10-16"})
+        self.assertEqual(debate_key("NVDA", "2026-10-16"), ("NVDA", "2026-10-16"))
+
+    def test_round_trip_and_expiry(self):
+        key = ("NVDA", "2026-10-16")
+        self.store.save(key, extract_debate({**DEBATE, "user_style": "trader", "messages": []}))
+        loaded = self.store.load(key)
+        self.assertEqual(loaded, DEBATE)  # Profile fields and messages are not part of the debate
+        self.assertIsNone(self.store.load(key, max_age=-1))
+        self.assertIsNone(self.store.load(("NVDA", "2026-10-15")))
+
+    def test_history_is_keyed_by_date(self):
+        self.store.save(("NVDA", "2026-10-15"), dict(DEBATE, tech_confidence_final=60))
+        self.store.save(("NVDA", "2026-10-16"), DEBATE)
+        self.store.save(("AMD", "2026-10-16"), DEBATE)
+        history = DebateStore(cache_dir=self.tmp.name, ttl=-1).history("nvda")  # Age does not matter here
+        self.assertEqual(list(history), ["2026-10-15", "2026-10-16"])
+        self.assertEqual(history["2026-10-15"]["tech_confidence_final"], 60)
+
+    def test_one_debate_scores_every_profile(self):
+        profiles = score_all_profiles(DEBATE)
+        self.assertEqual(len(profiles), 6)
+        for name, verdict in profiles.items():
+            style, risk = name.split("/")
+            expected = calculate_verdict({**DEBATE, "user_style": style, "risk_profile": risk})
+            self.assertEqual(verdict["confidence"], expected["final_confidence"])
+        result = score_profile(DEBATE, "trader", "aggressive")
+        self.assertEqual(result["final_signal"], profiles["trader/aggressive"]["signal"])
+        self.assertEqual(result["tech_thesis_final"], "Uptrend holds")
+
+
+if __name__ == '__main__':
+    unittest.main()
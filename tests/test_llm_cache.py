@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+
+# Add the repo root to the path so we can import 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from agent.llm_cache import MemoryTier, SQLiteTier, TieredLLMCache
+
+LLM = "groq|llama-3.3-70b-versatile|temperature=0.0"
+
+
+def reply(text):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+class TestLLMCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "llm_cache.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def table_bytes(self, tier):
+        return tier._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        tier = MemoryTier(max_bytes=10)
+        tier.put("a", "xxxx")
+        tier.put("b", "xxxx")
+        tier.get("a")
+        tier.put("c", "xxxx")
+        self.assertIsNone(tier.get("b"))
+        self.assertEqual((tier.get("a"), tier.bytes), ("xxxx", 8))
+
+    def test_disk_tier_evicts_oldest_and_tracks_bytes(self):
+        tier = SQLiteTier(self.path, max_bytes=100)
+        for key in ("a", "b", "c"):
+            tier.put(key, "x" * 40)
+        self.assertIsNone(tier.get("a"))  # Oldest row went first
+        self.assertEqual(tier.get("c"), "x" * 40)
+        self.assertEqual(tier.bytes, 80)
+
+        tier.put("b", "x" * 10)  # Replacing a row counts only its new size
+        self.assertEqual(tier.bytes, self.table_bytes(tier))
+        self.assertEqual(SQLiteTier(self.path, max_bytes=100).bytes, 50)  # Recounted on open
+
+    def test_hit_and_miss_counters(self):
+        cache = TieredLLMCache(self.path)
+        self.assertIsNone(cache.lookup("prompt", LLM))
+        cache.update("prompt", LLM, reply("BUY"))
+        self.assertEqual(cache.lookup("prompt", LLM)[0].message.content, "BUY")
+
+        restarted = TieredLLMCache(self.path)
+        restarted.lookup("prompt", LLM)  # Disk hit, promoted...
+        restarted.lookup("prompt", LLM)  # ...so the next one is a memory hit
+        self.assertIsNone(restarted.lookup("prompt", "another model"))
+        stats = restarted.stats()
+        self.assertEqual((stats["memory_hits"], stats["disk_hits"], stats["misses"]), (1, 1, 1))
+        self.assertEqual(cache.stats()["hit_rate"], 0.5)
+
+    def test_async_hooks(self):
+        cache = TieredLLMCache(self.path)
+
+        async def main():
+            missed = await cache.alookup("prompt", LLM)
+            await cache.aupdate("prompt", LLM, reply("SELL"))
+            return missed, await cache.alookup("prompt", LLM)
+
+        missed, hit = asyncio.run(main())
+        self.assertIsNone(missed)
+        self.assertEqual(hit[0].message.content, "SELL")
+        self.assertEqual(TieredLLMCache(self.path).lookup("prompt", LLM)[0].message.content, "SELL")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import sys
+import os
+import asyncio
+
+# Add the repo root to the path so we can import 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("GROQ_API_KEY", "test-key")  # ChatGroq validates that a key exists; nothing is sent
+
+from agent import llm_client, nodes
+from agent.llm_client import LLMClientManager
+
+
+class TestLLMClientManager(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = LLMClientManager()
+
+    def tearDown(self):
+        self.manager.close()
+
+    def test_sync_callers_share_one_model_without_an_async_pool(self):
+        llm = self.manager.get("test-model")
+        self.assertIs(self.manager.get("test-model"), llm)
+        self.assertIsNone(llm.http_async_client)
+        self.assertIs(llm.http_client, self.manager.http_client)
+
+    def test_each_loop_gets_its_own_async_pool(self):
+        async def get():
+            return self.manager.get("test-model")
+
+        first, second = asyncio.run(get()), asyncio.run(get())
+        self.assertIsNotNone(first.http_async_client)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first, self.manager.get("test-model"))
+
+    def test_nodes_use_the_configured_model(self):
+        self.assertEqual(nodes.get_llm().model_name, llm_client.DEFAULT_MODEL)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import asyncio
+
+# Add the repo root to the path so we can import 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.messages import HumanMessage
+
+from agent.llm_scheduler import (
+    PRIORITY_INITIAL, PRIORITY_REBUTTAL, PRIORITY_RISK,
+    LLMScheduler, TokenBucket, _call, estimate_tokens,
+)
+
+
+async def admit(scheduler, name, priority, tokens, order):
+    token = _call.set({"tokens": tokens, "priority": priority, "admitted": False})
+    try:
+        await scheduler.aacquire()
+        order.append(name)
+    finally:
+        _call.reset(token)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_refills_at_rate_up_to_capacity(self):
+        bucket = TokenBucket(60)  # One per second
+        now = bucket.last
+        bucket.consume(60)
+        self.assertAlmostEqual(bucket.wait_time(2, now), 2.0)
+        self.assertEqual(bucket.wait_time(2, now + 2), 0.0)
+        bucket._refill(now + 1000)
+        self.assertEqual(bucket.tokens, 60)
+
+    def test_oversized_call_waits_for_a_full_bucket(self):
+        bucket = TokenBucket(60)
+        now = bucket.last
+        self.assertEqual(bucket.wait_time(500, now), 0.0)
+        bucket.consume(500)
+        self.assertEqual(bucket.tokens, 0)
+        self.assertAlmostEqual(bucket.wait_time(500, now), 60.0)
+
+    def test_settling_can_leave_the_bucket_in_debt(self):
+        bucket = TokenBucket(60)
+        bucket.adjust(100)
+        self.assertEqual(bucket.tokens, -40)
+        bucket.adjust(-1000)
+        self.assertEqual(bucket.tokens, 60)
+
+    def test_zero_means_unlimited(self):
+        bucket = TokenBucket(0)
+        bucket.consume(10 ** 6)
+        self.assertEqual(bucket.wait_time(10 ** 6, bucket.last), 0.0)
+
+    def test_estimate_counts_prompt_and_completion(self):
+        messages = [HumanMessage(content="x" * 400), HumanMessage(content="y" * 40)]
+        self.assertEqual(estimate_tokens(messages, completion_tokens=100), 110 + 8 + 100)
+
+
+class TestLLMScheduler(unittest.TestCase):
+
+    def test_queued_calls_run_in_priority_order(self):
+        # Ten requests a second: the first call drains the burst, the rest queue
+        scheduler, order = LLMScheduler(rpm=600, tpm=0), []
+        scheduler.requests.tokens = 1
+
+        async def main():
+            calls = [
+                admit(scheduler, "first", PRIORITY_INITIAL, 10, order),
+                admit(scheduler, "initial", PRIORITY_INITIAL, 10, order),
+                admit(scheduler, "risk", PRIORITY_RISK, 10, order),
+                admit(scheduler, "rebuttal", PRIORITY_REBUTTAL, 10, order),
+                admit(scheduler, "initial-2", PRIORITY_INITIAL, 10, order),
+            ]
+            await asyncio.wait_for(asyncio.gather(*calls), timeout=5)
+
+        asyncio.run(main())
+        self.assertEqual(order, ["first", "rebuttal", "risk", "initial", "initial-2"])
+        self.assertEqual(scheduler.admitted, 5)
+        self.assertEqual(scheduler.stats()["queued"], 0)
+
+    def test_token_bucket_holds_back_a_call_that_does_not_fit(self):
+        # TPM of 6000 refills 100 tokens a second
+        scheduler, order = LLMScheduler(rpm=0, tpm=6000), []
+        scheduler.tokens.tokens = 50
+
+        async def main():
+            await asyncio.wait_for(asyncio.gather(
+                admit(scheduler, "big", PRIORITY_INITIAL, 80, order),
+                admit(scheduler, "small", PRIORITY_REBUTTAL, 10, order),
+            ), timeout=5)
+
+        asyncio.run(main())
+        # "big" queued first; "small" outranks it once the queue is non-empty
+        self.assertEqual(order, ["small", "big"])
+
+    def test_cancelled_waiter_is_skipped(self):
+        scheduler, order = LLMScheduler(rpm=120, tpm=0), []
+        scheduler.requests.tokens = 0
+
+        async def main():
+            gone = asyncio.ensure_future(admit(scheduler, "gone", PRIORITY_REBUTTAL, 10, order))
+            await asyncio.sleep(0)
+            gone.cancel()
+            await admit(scheduler, "kept", PRIORITY_INITIAL, 10, order)
+
+        asyncio.run(main())
+        self.assertEqual(order, ["kept"])
+        self.assertEqual(scheduler.admitted, 1)
+
+    def test_pause_drains_the_buckets(self):
+        scheduler = LLMScheduler(rpm=60, tpm=6000)
+        scheduler.pause(0.2)
+        self.assertEqual(scheduler.rate_limited, 1)
+        self.assertFalse(scheduler.acquire(blocking=False))
+
+    def test_settle_charges_real_usage(self):
+        scheduler = LLMScheduler(rpm=0, tpm=6000)
+        scheduler.settle(estimated=100, actual=400)
+        self.assertLessEqual(scheduler.tokens.tokens, 5700)
+
+
+if __name__ == '__main__':
+    unittest.main()
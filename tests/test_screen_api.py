@@ -0,0 +1,39 @@
+import unittest
+import sys
+import os
+
+# Add the repo root to the path so we can import 'main' and 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+class TestScreenApi(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(main.app)
+
+    def post(self, **body):
+        # escalate=False: validation only, no council and no API key needed
+        return self.client.post("/screen", json={"tickers": ["AAPL"], "escalate": False, **body})
+
+    def test_malformed_weights_are_a_bad_request(self):
+        for weights in [{"trend": "x"}, {"momentum": True}, {"rsi": -1}]:
+            response = self.post(rules={"weights": weights})
+            self.assertEqual(response.status_code, 400, weights)
+            self.assertIn("weights", response.json()["detail"])
+
+    def test_malformed_filters_are_a_bad_request(self):
+        for filters in [{"min_price": "5"}, {"sectors": "Energy"}, 5]:
+            response = self.post(rules={"filters": filters})
+            self.assertEqual(response.status_code, 400, filters)
+            self.assertIn("filters", response.json()["detail"])
+
+    def test_top_n_must_be_positive(self):
+        self.assertEqual(self.post(top_n=0).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import asyncio
+import argparse
+import tempfile
+
+# Add the repo root to the path so we can import 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent import council, screener, verdict_cache
+from agent.debate import DebateStore
+
+DEBATE = {
+    "tech_thesis_final": "Uptrend", "tech_confidence_final": 70,
+    "fund_thesis_final": "Cheap", "fund_confidence_final": 60,
+    "risk_danger_score": 20, "risk_critique_tech": "Fine",
+}
+
+
+class FakeGraph:
+    def __init__(self):
+        self.tickers = []
+
+    async def ainvoke(self, state):
+        self.tickers.append(state["ticker"])
+        return {**state, **DEBATE}
+
+
+class TestScreenerCLI(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (council.graph, council.debate_store, screener.ascreen,
+                      verdict_cache.verdict_cache, verdict_cache.singleflight)
+        council.graph = self.graph = FakeGraph()
+        council.debate_store = DebateStore(cache_dir=self.tmp.name)
+        verdict_cache.verdict_cache = verdict_cache.VerdictCache()
+        verdict_cache.singleflight = verdict_cache.SingleFlight()
+
+        async def ascreen(tickers, rules=None, top_n=10):
+            return {"top": tickers[:top_n], "ranking": []}
+        screener.ascreen = ascreen
+
+    def tearDown(self):
+        (council.graph, council.debate_store, screener.ascreen,
+         verdict_cache.verdict_cache, verdict_cache.singleflight) = self.saved
+        self.tmp.cleanup()
+
+    def args(self, **overrides):
+        values = dict(tickers=["nvda", "amd", "intc"], file=None, top=2, rules=None, council=True,
+                      style="investor", risk="moderate", concurrency=2)
+        values.update(overrides)
+        return argparse.Namespace(**values)
+
+    def test_council_escalates_the_top_tickers(self):
+        result = asyncio.run(screener.run_cli(self.args()))
+        self.assertEqual(self.graph.tickers, ["NVDA", "AMD"])
+        self.assertEqual([item["ticker"] for item in result["council"]], ["NVDA", "AMD"])
+        verdict = result["council"][0]["final_verdict"]
+        self.assertIn(verdict["signal"], ("BUY", "SELL", "HOLD"))
+        self.assertEqual(result["council"][0]["technical_analysis"]["confidence"], 70)
+
+    def test_screen_only_runs_no_council(self):
+        result = asyncio.run(screener.run_cli(self.args(council=False)))
+        self.assertNotIn("council", result)
+        self.assertEqual(self.graph.tickers, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+
+# Add the repo root to the path so we can import 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent import council, verdict_cache
+from agent.debate import DebateStore
+
+UPDATES = [
+    {"technical_analyst": {"tech_thesis_initial": "Uptrend", "tech_confidence_initial": 70}},
+    {"fundamental_analyst": {"fund_thesis_initial": "Cheap", "fund_confidence_initial": 60}},
+    {"risk_manager": {"risk_critique_tech": "Extended", "risk_critique_fund": "Fine",
+                      "risk_danger_score": 30, "risk_news_summary": "- Probe headline"}},
+    {"technical_rebuttal": {"tech_thesis_final": "Still up", "tech_confidence_final": 65}},
+    {"fundamental_rebuttal": {"fund_thesis_final": "Still cheap", "fund_confidence_final": 60}},
+]
+
+
+class FakeGraph:
+    """Stands in for the compiled council: node updates with a pause, counting full runs."""
+
+    def __init__(self):
+        self.runs = 0
+
+    async def astream(self, state, stream_mode="updates"):
+        self.runs += 1
+        for update in UPDATES:
+            await asyncio.sleep(0.01)
+            yield update
+
+    async def ainvoke(self, state):
+        self.runs += 1
+        await asyncio.sleep(0.05)
+        for update in UPDATES:
+            for values in update.values():
+                state.update(values)
+        return state
+
+
+class TestStreamCouncil(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = council.graph, council.debate_store, verdict_cache.verdict_cache, verdict_cache.singleflight
+        council.graph = self.graph = FakeGraph()
+        council.debate_store = DebateStore(cache_dir=self.tmp.name)
+        verdict_cache.verdict_cache = verdict_cache.VerdictCache()
+        verdict_cache.singleflight = verdict_cache.SingleFlight()
+
+    def tearDown(self):
+        council.graph, council.debate_store, verdict_cache.verdict_cache, verdict_cache.singleflight = self.saved
+        self.tmp.cleanup()
+
+    async def collect(self):
+        return [event async for event in council.stream_council("NVDA")]
+
+    def test_stream_and_analyze_share_one_council(self):
+        async def both():
+            return await asyncio.gather(self.collect(), council.run_debate("NVDA"))
+
+        events, debate = asyncio.run(both())
+        self.assertEqual(self.graph.runs, 1)
+        self.assertEqual([node for node, _ in events][:2], ["technical_analyst", "fundamental_analyst"])
+        self.assertEqual(debate["tech_confidence_final"], 65)
+
+    def test_replayed_risk_event_matches_the_live_one(self):
+        live = dict(asyncio.run(self.collect()))
+        replayed = dict(asyncio.run(self.collect()))  # Second stream: cached debate, no new run
+        self.assertEqual(self.graph.runs, 1)
+        self.assertEqual(replayed["risk_manager"], live["risk_manager"])
+        self.assertIn("final_node", replayed)
+
+
+if __name__ == '__main__':
+    unittest.main()
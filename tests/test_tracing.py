@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import asyncio
+
+# Add the repo root to the path so we can import 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent import tracing
+from agent.tracing import Counter, Histogram, render_metrics, span, start_trace, summarize, traced_node
+
+
+class TestMetricsFormat(unittest.TestCase):
+
+    def test_histogram_renders_cumulative_buckets(self):
+        hist = Histogram("t_seconds", "Test durations", ("kind", "name"), buckets=(0.1, 1.0))
+        hist.observe(("node", "bull"), 0.05)
+        hist.observe(("node", "bull"), 0.5)
+        hist.observe(("node", "bull"), 5.0)
+        self.assertEqual(hist.render(), [
+            "# HELP t_seconds Test durations",
+            "# TYPE t_seconds histogram",
+            't_seconds_bucket{kind="node",name="bull",le="0.1"} 1',
+            't_seconds_bucket{kind="node",name="bull",le="1.0"} 2',
+            't_seconds_bucket{kind="node",name="bull",le="+Inf"} 3',
+            't_seconds_sum{kind="node",name="bull"} 5.55',
+            't_seconds_count{kind="node",name="bull"} 3',
+        ])
+
+    def test_counter_renders_sorted_series(self):
+        counter = Counter("t_total", "Test calls", ("model", "cache"))
+        counter.inc(("m", "miss"))
+        counter.inc(("m", "hit"), 2)
+        counter.inc(("m", "hit"))
+        self.assertEqual(counter.render(), [
+            "# HELP t_total Test calls",
+            "# TYPE t_total counter",
+            't_total{model="m",cache="hit"} 3',
+            't_total{model="m",cache="miss"} 1',
+        ])
+
+    def test_render_metrics_exposes_every_metric(self):
+        with span("mcp", "test_render_metrics"):
+            pass
+        text = render_metrics()
+        self.assertTrue(text.endswith("\n"))
+        for metric in tracing.METRICS:
+            self.assertIn(f"# TYPE {metric.name} ", text)
+        self.assertIn('council_span_seconds_count{kind="mcp",name="test_render_metrics"} 1', text)
+        for line in text.splitlines():
+            # Every sample line is "<name>{labels} <number>"
+            if not line.startswith("#"):
+                float(line.rsplit(" ", 1)[1])
+
+
+class TestSpans(unittest.TestCase):
+
+    def test_spans_nest_and_collect_attributes(self):
+        async def main():
+            trace = start_trace()
+
+            def fetch():
+                with span("mcp", "get_stock_price"):
+                    pass
+
+            async def bull(state):
+                with span("llm", "model-x") as attrs:
+                    attrs["cache_hit"] = True
+                await asyncio.to_thread(fetch)  # Worker threads land in the same trace
+                return state
+
+            await traced_node("bull", bull)({})
+            return trace
+
+        trace = asyncio.run(main())
+        llm, mcp, node = trace
+        self.assertEqual((llm["kind"], llm["parent"], llm["cache_hit"]), ("llm", "bull", True))
+        self.assertEqual((mcp["kind"], mcp["parent"]), ("mcp", "bull"))
+        self.assertEqual((node["kind"], node["name"], node["parent"]), ("node", "bull", None))
+
+    def test_summarize_sums_by_kind(self):
+        trace = [
+            {"kind": "llm", "name": "a", "parent": None, "ms": 1.5},
+            {"kind": "llm", "name": "b", "parent": None, "ms": 2.25},
+            {"kind": "node", "name": "bull", "parent": None, "ms": 4.0},
+        ]
+        summary = summarize(trace)
+        self.assertEqual(summary["by_kind_ms"], {"llm": 3.75, "node": 4.0})
+        self.assertIs(summary["spans"], trace)
+
+    def test_no_trace_outside_a_request(self):
+        async def main():
+            with span("node", "outside"):
+                pass
+            return tracing._trace.get()
+
+        self.assertIsNone(asyncio.run(main()))
+
+
+if __name__ == '__main__':
+    unittest.main()
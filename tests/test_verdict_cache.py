@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import asyncio
+import time
+
+# Add the repo root to the path so we can import 'agent'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent import verdict_cache
+from agent.verdict_cache import SingleFlight, VerdictCache
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_callers_join_one_run(self):
+        flight, runs = SingleFlight(), []
+
+        async def council():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return {"signal": "BUY"}
+
+        async def main():
+            results = await asyncio.gather(*(flight.do("NVDA", council) for _ in range(5)))
+            return results, flight.in_flight
+
+        results, in_flight = asyncio.run(main())
+        self.assertEqual(len(runs), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(in_flight, 0)  # Forgotten once finished: the next call runs again
+
+    def test_cancelled_caller_does_not_cancel_the_shared_run(self):
+        flight = SingleFlight()
+
+        async def council():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main():
+            leaver = asyncio.create_task(flight.do("NVDA", council))
+            stayer = asyncio.create_task(flight.do("NVDA", council))
+            await asyncio.sleep(0.01)
+            leaver.cancel()
+            return await stayer
+
+        self.assertEqual(asyncio.run(main()), "done")
+
+    def test_failure_reaches_every_caller_and_is_not_kept(self):
+        flight = SingleFlight()
+
+        async def broken():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("Groq down")
+
+        async def main():
+            return await asyncio.gather(flight.do("NVDA", broken), flight.do("NVDA", broken),
+                                        return_exceptions=True)
+
+        errors = asyncio.run(main())
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in errors))
+        self.assertEqual(flight.in_flight, 0)
+
+
+class TestVerdictCache(unittest.TestCase):
+
+    def test_entries_expire_after_ttl(self):
+        cache = VerdictCache(ttl=0.05)
+        cache.put("NVDA", {"signal": "BUY"})
+        self.assertEqual(cache.get("NVDA"), {"signal": "BUY"})
+        time.sleep(0.06)
+        self.assertIsNone(cache.get("NVDA"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = VerdictCache(max_entries=2)
+        cache.put("A", 1)
+        cache.put("B", 2)
+        cache.get("A")
+        cache.put("C", 3)
+        self.assertIsNone(cache.get("B"))
+        self.assertEqual((cache.get("A"), cache.get("C")), (1, 3))
+
+    def test_cached_run_serves_finished_results(self):
+        saved = verdict_cache.verdict_cache, verdict_cache.singleflight
+        verdict_cache.verdict_cache, verdict_cache.singleflight = VerdictCache(), SingleFlight()
+        runs = []
+
+        async def council():
+            runs.append(1)
+            return {"signal": "HOLD"}
+
+        try:
+            first = asyncio.run(verdict_cache.cached_run(("NVDA", "2026-10-16"), council))
+            again = asyncio.run(verdict_cache.cached_run(("NVDA", "2026-10-16"), council))
+            asyncio.run(verdict_cache.cached_run(("NVDA", "2026-10-17"), council))  # Next trading day
+        finally:
+            verdict_cache.verdict_cache, verdict_cache.singleflight = saved
+        self.assertIs(again, first)
+        self.assertEqual(len(runs), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()